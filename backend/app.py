@@ -2,40 +2,92 @@
 
 # backend/app.py
 
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, current_app, request, jsonify
 from sqlalchemy import text
 from db_connection import get_session
 from models import CandidateProfilesJoined
 from crud_operations import insert_candidate, search_candidates, update_candidate, delete_candidate, record_exists
-from audit_log import log_audit
+from audit_log import log_audit, query_audit_log
 from uuid import uuid4
 from datetime import datetime
 from models import JobPostingsRaw
 from flask_cors import CORS
 import traceback
 from matching.evaluation import evaluate_recommendations
-from matching.recommendations import recommend_candidates_for_job  
 import uuid
-from matching.matcher_pipeline import match_entities_with_bert
 from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from matching.evaluation import store_prediction  # Move import here
-from sentence_transformers import SentenceTransformer, util
 from pydantic import ValidationError  
 from matching.evaluation import evaluate_matches
-
-# ✨ FIX: Create Flask app
-app = Flask(__name__)
-CORS(app)
-executor = ThreadPoolExecutor(max_workers=4)
-tasks = {}
-bert_model = SentenceTransformer("all-MiniLM-L6-v2")
+from search_index import SEARCH_JOIN, build_match_query
+from pagination import (
+    CANDIDATE_SORT_KEYS, CANDIDATE_TIEBREAKER, JOB_POSTING_SORT_KEYS, JOB_POSTING_TIEBREAKER,
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page, fetch_page, order_by_sql, parse_page_args
+)
+from projection import (
+    CANDIDATE_COLUMNS, CANDIDATE_LIST_FIELDS, JOB_POSTING_COLUMNS, JOB_POSTING_LIST_FIELDS,
+    parse_fields, select_sql
+)
+from conditional import etag_from_tables
+from table_versions import bump_table_version
+from responses import init_response_layer
+from metrics import gauge, init_metrics, time_inference
+from task_store import complete_task, create_task, delete_task, fail_task, get_task
+from db_connection import get_engine
+import config
+
+# Routes live on a blueprint; create_app() builds the Flask app around it
+api = Blueprint("api", __name__)
+
+def preload_models():
+    """Load the spaCy pipelines and SentenceTransformer weights into this process.
+
+    The matching modules load their models on first import. Running this in
+    the gunicorn master (preload_app, see gunicorn.conf.py) means workers are
+    forked with the weights already in memory and share them copy-on-write.
+    """
+    from matching import matcher_pipeline
+    return matcher_pipeline
+
+def create_app(preload=True):
+    """Build the Flask app with its own recommendation executor and task map.
+
+    preload=False skips loading the models here; they are then loaded by the
+    first recommendation job instead.
+    """
+    if preload:
+        preload_models()
+
+    app = Flask(__name__)
+    CORS(app)
+    init_response_layer(app)
+    init_metrics(app, get_engine())
+
+    # No threads start until the first submit, so forking after this is safe
+    executor = ThreadPoolExecutor(max_workers=config.RECOMMENDATION_WORKERS)
+    tasks = {}
+    app.extensions["recommendation_executor"] = executor
+    app.extensions["recommendation_tasks"] = tasks
+
+    gauge("recommendation_executor_queue_depth", "Recommendation jobs waiting for a worker.",
+          lambda: executor._work_queue.qsize())
+    gauge("recommendation_executor_active_tasks", "Recommendation jobs currently running.",
+          lambda: sum(1 for future in list(tasks.values()) if future.running()))
+    gauge("recommendation_executor_max_workers", "Size of the recommendation executor.",
+          lambda: executor._max_workers)
+    gauge("recommendation_tasks", "Recommendation jobs submitted in this process and not finished yet.",
+          lambda: len(tasks))
+
+    app.register_blueprint(api)
+    return app
 
 # --- ROUTES ---
 
 
 
-@app.route("/api/candidates", methods=["GET"])
+@api.route("/api/candidates", methods=["GET"])
+@etag_from_tables("candidate_profiles_joined")
 def list_candidates():
     """List all candidates, with optional search, filter, and sort."""
     session = get_session()
@@ -43,49 +95,65 @@ def list_candidates():
         search_term = request.args.get("search")
         filter_field = request.args.get("filter_field")
         min_experience_years = request.args.get("min_experience_years", type=int)
-        sort_by = request.args.get("sort_by", "experience")
+        sort_by = request.args.get("sort_by") or ("relevance" if search_term else "experience")
 
         where_clauses = []
         params = {}
+        search_join = ""
 
-        if search_term and filter_field:
-            search_term = f"%{search_term.lower()}%"
-            allowed_fields = ["name", "city", "position", "experiences"]
-            if filter_field in allowed_fields:
-                where_clauses.append(f"LOWER({filter_field}) LIKE :search_term")
-                params["search_term"] = search_term
-            else:
+        if search_term:
+            allowed_fields = ["name", "city", "position", "experiences", "about"]
+            if filter_field and filter_field not in allowed_fields:
                 return jsonify({"error": "Invalid filter_field"}), 400
-        elif search_term:
-            search_term = f"%{search_term.lower()}%"
-            where_clauses.append("""(
-                LOWER(name) LIKE :search_term
-             OR LOWER(city) LIKE :search_term
-             OR LOWER(position) LIKE :search_term
-             OR LOWER(experiences) LIKE :search_term
-            )""")
-            params["search_term"] = search_term
+            fts_query = build_match_query(search_term, filter_field)
+            if fts_query:
+                search_join = SEARCH_JOIN
+                params["fts_query"] = fts_query
+            elif search_term.strip():
+                # Only punctuation/operators (e.g. "++"): nothing can match
+                where_clauses.append("0")
 
         if min_experience_years is not None:
             where_clauses.append("total_experience_years >= :min_experience_years")
             params["min_experience_years"] = min_experience_years
 
+        # ?ids=a,b,c restricts the list to those record_ids, e.g. the top-scored recommendations
+        ids = [record_id for record_id in request.args.get("ids", "").split(",") if record_id]
+        if len(ids) > MAX_PAGE_SIZE:
+            return jsonify({"error": f"At most {MAX_PAGE_SIZE} ids per request"}), 400
+        if ids:
+            where_clauses.append(f"record_id IN ({', '.join(f':id_{i}' for i in range(len(ids)))})")
+            params.update({f"id_{i}": record_id for i, record_id in enumerate(ids)})
+
+        if sort_by not in CANDIDATE_SORT_KEYS or (sort_by == "relevance" and not search_join):
+            sort_by = "experience"
+        sort_key = CANDIDATE_SORT_KEYS[sort_by]
+        from_sql = f"candidate_profiles_joined{search_join}"
+        # ?fields=a,b or fields=all; defaults to the compact list shape
+        fields = parse_fields(request.args, CANDIDATE_COLUMNS, CANDIDATE_LIST_FIELDS, ["record_id"])
+        columns_sql = select_sql(CANDIDATE_COLUMNS, fields)
+
+        # ?limit= / ?cursor= switch to keyset pages: {"items", "next_cursor", "total"}
+        page = parse_page_args(request.args)
+        if page:
+            return jsonify(fetch_page(
+                session, columns_sql, from_sql, where_clauses, params,
+                sort_by, sort_key, CANDIDATE_TIEBREAKER, page
+            ))
+
         where_sql = " AND ".join(where_clauses)
-        query = "SELECT * FROM candidate_profiles_joined"
+        query = f"{columns_sql} FROM {from_sql}"
         if where_sql:
             query += f" WHERE {where_sql}"
-
-        sort_map = {
-            "experience": "total_experience_years DESC",
-            "name": "name ASC",
-            "city": "city ASC"
-        }
-        query += f" ORDER BY {sort_map.get(sort_by, 'total_experience_years DESC')}"
+        query += f" ORDER BY {order_by_sql(sort_key, CANDIDATE_TIEBREAKER)}"
 
         results = session.execute(text(query), params).mappings().all()
         candidates = [dict(row) for row in results]
         return jsonify(candidates)
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     except Exception as e:
         print("❌ Exception occurred in /api/candidates:")
         traceback.print_exc()
@@ -95,7 +163,8 @@ def list_candidates():
         session.close()
 
 
-@app.route("/api/candidates/<record_id>", methods=["GET"])
+@api.route("/api/candidates/<record_id>", methods=["GET"])
+@etag_from_tables("candidate_profiles_joined")
 def get_candidate(record_id):
     """Get a single candidate by record_id."""
     session = get_session()
@@ -127,14 +196,14 @@ def get_candidate(record_id):
     finally:
         session.close()
 
-@app.route("/api/candidates", methods=["POST"])
+@api.route("/api/candidates", methods=["POST"])
 def create_candidate():
     """Insert a new candidate."""
     session = get_session()
     try:
         data = request.get_json()
 
-        insert_candidate(
+        record_id = insert_candidate(
             session=session,
             person_id=data.get("person_id", str(uuid4())),
             name=data["name"],
@@ -150,7 +219,9 @@ def create_candidate():
             languages=data.get("languages"),
             courses=data.get("courses")
         )
-        return jsonify({"message": "Candidate created successfully."}), 201
+        if record_id is None:
+            return jsonify({"error": "Candidate could not be created."}), 500
+        return jsonify({"message": "Candidate created successfully.", "record_id": record_id}), 201
 
     except Exception as e:
         session.rollback()
@@ -158,7 +229,7 @@ def create_candidate():
     finally:
         session.close()
 
-@app.route("/api/candidates/<record_id>", methods=["PUT"])
+@api.route("/api/candidates/<record_id>", methods=["PUT"])
 def update_candidate_api(record_id):
     """Update an existing candidate."""
     session = get_session()
@@ -184,7 +255,7 @@ def update_candidate_api(record_id):
     finally:
         session.close()
 
-@app.route("/api/candidates/<record_id>", methods=["DELETE"])
+@api.route("/api/candidates/<record_id>", methods=["DELETE"])
 def delete_candidate_api(record_id):
     """Delete a candidate."""
     session = get_session()
@@ -202,7 +273,7 @@ def delete_candidate_api(record_id):
         session.close()
 
 
-@app.route("/job_postings", methods=["POST"])
+@api.route("/job_postings", methods=["POST"])
 def create_job_posting():
     session = get_session()
     try:
@@ -228,6 +299,7 @@ def create_job_posting():
         )
 
         session.add(new_job)
+        bump_table_version(session, "job_postings_raw")
         session.commit()
         return jsonify({"message": "✅ Job posting created successfully!"}), 201
     except Exception as e:
@@ -240,27 +312,34 @@ def create_job_posting():
 
 
 # Read (Get All Job Postings)
-@app.route("/api/job_postings", methods=["GET"])
+@api.route("/api/job_postings", methods=["GET"])
+@etag_from_tables("job_postings_raw")
 def get_job_postings():
     session = get_session()
-    jobs = session.query(JobPostingsRaw).all()
-    result = []
-    for job in jobs:
-        result.append({
-            "id": job.job_id,
-            "title": job.title,
-            "department": job.department,
-            "locations": job.locations,
-            "work_type": job.work_type,
-            "experience_required": job.experience_required,
-            "total_experience_years": job.total_experience_years,
-            "job_description": job.job_description
-        })
-    session.close()
-    return jsonify(result)
+    try:
+        fields = parse_fields(request.args, JOB_POSTING_COLUMNS, JOB_POSTING_LIST_FIELDS, ["id"])
+        columns_sql = select_sql(JOB_POSTING_COLUMNS, fields)
+        sort_key = JOB_POSTING_SORT_KEYS["load_date"]
+
+        page = parse_page_args(request.args)
+        if page:
+            return jsonify(fetch_page(
+                session, columns_sql, "job_postings_raw", [], {},
+                "load_date", sort_key, JOB_POSTING_TIEBREAKER, page, id_key="id"
+            ))
+
+        jobs = session.execute(text(
+            f"{columns_sql} FROM job_postings_raw ORDER BY {order_by_sql(sort_key, JOB_POSTING_TIEBREAKER)}"
+        )).mappings().all()
+        return jsonify([dict(job) for job in jobs])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    finally:
+        session.close()
 
 # Read (Get Single Job Posting by job_id)
-@app.route("/job_postings/<string:job_id>", methods=["GET"])
+@api.route("/job_postings/<string:job_id>", methods=["GET"])
+@etag_from_tables("job_postings_raw")
 def get_job_posting(job_id):
     session = get_session()
     try:
@@ -275,61 +354,71 @@ def get_job_posting(job_id):
         return jsonify({"error": str(e)}), 500
     finally:
         session.close()
-@app.route("/api/candidates/filter", methods=["GET"])
+@api.route("/api/candidates/filter", methods=["GET"])
+@etag_from_tables("candidate_profiles_joined")
 def filter_candidates():
     """Filter candidates dynamically by name, city, or experience."""
     session = get_session()
     try:
-        search_term = request.args.get("search", "").lower()
+        search_term = request.args.get("search", "")
         filter_field = request.args.get("filter_field")
         sort_by = request.args.get("sort_by")  # ✅ NEW
         min_experience_years = request.args.get("min_experience_years", type=int)
 
         where_clauses = []
         params = {}
+        search_join = ""
 
-        if search_term and filter_field in ["name", "city", "position", "experiences"]:
-            where_clauses.append(f"LOWER({filter_field}) LIKE :search_term")
-            params["search_term"] = f"%{search_term}%"
-
-        elif search_term:
-            where_clauses.append("""(
-                LOWER(name) LIKE :search_term
-                OR LOWER(city) LIKE :search_term
-                OR LOWER(position) LIKE :search_term
-                OR LOWER(experiences) LIKE :search_term
-            )""")
-            params["search_term"] = f"%{search_term}%"
+        if search_term:
+            search_field = filter_field if filter_field in ["name", "city", "position", "experiences", "about"] else None
+            fts_query = build_match_query(search_term, search_field)
+            if fts_query:
+                search_join = SEARCH_JOIN
+                params["fts_query"] = fts_query
+            elif search_term.strip():
+                where_clauses.append("0")
 
         if min_experience_years is not None:
             where_clauses.append("total_experience_years >= :min_experience_years")
             params["min_experience_years"] = min_experience_years
 
-        where_sql = " AND ".join(where_clauses)
-        query = "SELECT * FROM candidate_profiles_joined"
-        if where_sql:
-            query += f" WHERE {where_sql}"
-
         # ✅ Handle sorting consistently
-        sort_map = {
-            "experience": "total_experience_years DESC",
-            "name": "name ASC",
-            "city": "city ASC"
-        }
-
-        if sort_by in sort_map:
-            query += f" ORDER BY {sort_map[sort_by]}"
+        if sort_by in CANDIDATE_SORT_KEYS and (sort_by != "relevance" or search_join):
+            pass
+        elif search_join:
+            sort_by = "relevance"
         elif filter_field in ["name", "city"]:
-            query += f" ORDER BY {filter_field} ASC"
+            sort_by = filter_field
         elif filter_field == "experience" or min_experience_years is not None:
-            query += " ORDER BY total_experience_years DESC"
+            sort_by = "experience"
         else:
-            query += " ORDER BY load_date DESC"
+            sort_by = "load_date"
+        sort_key = CANDIDATE_SORT_KEYS[sort_by]
+        from_sql = f"candidate_profiles_joined{search_join}"
+        # ?fields=a,b or fields=all; defaults to the compact list shape
+        fields = parse_fields(request.args, CANDIDATE_COLUMNS, CANDIDATE_LIST_FIELDS, ["record_id"])
+        columns_sql = select_sql(CANDIDATE_COLUMNS, fields)
+
+        page = parse_page_args(request.args)
+        if page:
+            return jsonify(fetch_page(
+                session, columns_sql, from_sql, where_clauses, params,
+                sort_by, sort_key, CANDIDATE_TIEBREAKER, page
+            ))
+
+        where_sql = " AND ".join(where_clauses)
+        query = f"{columns_sql} FROM {from_sql}"
+        if where_sql:
+            query += f" WHERE {where_sql}"
+        query += f" ORDER BY {order_by_sql(sort_key, CANDIDATE_TIEBREAKER)}"
 
         results = session.execute(text(query), params).mappings().all()
         candidates = [dict(row) for row in results]
         return jsonify(candidates)
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     except Exception as e:
         print("❌ Exception in /api/candidates/filter:")
         traceback.print_exc()
@@ -339,7 +428,7 @@ def filter_candidates():
 
 
 # Update (Modify a Job Posting)
-@app.route("/job_postings/<string:job_id>", methods=["PUT"])
+@api.route("/job_postings/<string:job_id>", methods=["PUT"])
 def update_job_posting(job_id):
     session = get_session()
 
@@ -354,6 +443,7 @@ def update_job_posting(job_id):
                 setattr(job, key, value)
 
         job.load_date = datetime.utcnow()
+        bump_table_version(session, "job_postings_raw")
         session.commit()
         return jsonify({"message": "✅ Job posting updated successfully."})
     except Exception as e:
@@ -363,7 +453,7 @@ def update_job_posting(job_id):
         session.close()
 
 # Delete (Remove a Job Posting)
-@app.route("/job_postings/<string:job_id>", methods=["DELETE"])
+@api.route("/job_postings/<string:job_id>", methods=["DELETE"])
 def delete_job_posting(job_id):
     session = get_session()
     try:
@@ -372,6 +462,7 @@ def delete_job_posting(job_id):
             return jsonify({"error": "Job posting not found."}), 404
 
         session.delete(job)
+        bump_table_version(session, "job_postings_raw")
         session.commit()
         return jsonify({"message": "✅ Job posting deleted successfully."})
     except Exception as e:
@@ -379,22 +470,43 @@ def delete_job_posting(job_id):
         return jsonify({"error": str(e)}), 500
     finally:
         session.close()
-@app.errorhandler(500)
+@api.app_errorhandler(500)
 def internal_error(error):
     return jsonify({"error": "Internal server error"}), 500
 
-@app.errorhandler(404)
+@api.app_errorhandler(404)
 def not_found(error):
     return jsonify({"error": "Resource not found"}), 404
 
-@app.errorhandler(400)
+@api.app_errorhandler(400)
 def bad_request(error):
     return jsonify({"error": "Bad request"}), 400
 
 
 
 
-@app.route("/api/evaluate", methods=["POST"])
+@api.route("/api/audit", methods=["GET"])
+def list_audit_entries():
+    """Audit entries, newest first, filtered by record_id/operation/status/since/until."""
+    session = get_session()
+    try:
+        page = parse_page_args(request.args) or Page(DEFAULT_PAGE_SIZE, None, True)
+        return jsonify(query_audit_log(
+            session,
+            record_id=request.args.get("record_id"),
+            operation=request.args.get("operation"),
+            status=request.args.get("status"),
+            since=request.args.get("since"),
+            until=request.args.get("until"),
+            page=page
+        ))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    finally:
+        session.close()
+
+
+@api.route("/api/evaluate", methods=["POST"])
 def evaluate():
     try:
         data = request.get_json()
@@ -409,7 +521,7 @@ def evaluate():
 
 
 
-# @app.route("/api/recommendations/<job_id>", methods=["GET"])
+# @api.route("/api/recommendations/<job_id>", methods=["GET"])
 # def recommend_candidates(job_id):
 #     session = get_session()
 #     try:
@@ -436,7 +548,7 @@ def evaluate():
 #     finally:
 #         session.close()
 
-@app.route("/api/hire", methods=["POST"])
+@api.route("/api/hire", methods=["POST"])
 def api_store_hire():
     data = request.get_json()
     job_id = data.get("job_id")
@@ -450,13 +562,14 @@ def api_store_hire():
     return jsonify({"message": "Hired candidate stored successfully"})
 
 
-@app.route("/api/evaluate/<job_id>", methods=["GET"])
+@api.route("/api/evaluate/<job_id>", methods=["GET"])
 def api_evaluate_recommendations(job_id):
     from matching.evaluation import evaluate_recommendations
     metrics = evaluate_recommendations(job_id)
     return jsonify(metrics)
 
-@app.route("/api/job_titles", methods=["GET"])
+@api.route("/api/job_titles", methods=["GET"])
+@etag_from_tables("job_postings_raw")
 def get_job_titles():
     session = get_session()
     try:
@@ -467,7 +580,8 @@ def get_job_titles():
 # Add these imports at the top of app.py
 
 def process_recommendations(job_id, job_description_fallback):
-    from matching.evaluation import store_prediction
+    from matching.evaluation import store_predictions
+    from matching.recommendations import recommend_candidates_for_job
     session = get_session()
     try:
         # Fetch structured job object from DB
@@ -487,28 +601,20 @@ def process_recommendations(job_id, job_description_fallback):
             "job_description": job.job_description or job_description_fallback
         }
 
-        # Load all candidates
+        # Load only what the matcher reads
         candidates = session.execute(
-            text("SELECT * FROM candidate_profiles_joined")
+            text("""
+            SELECT record_id, city, total_experience_years, match_text, match_text_hash
+            FROM candidate_profiles_joined
+            """)
         ).mappings().all()
         candidate_list = [dict(r) for r in candidates]
 
         print(f"🔧 Processing {len(candidate_list)} candidates for job ID: {job_id}")
         result = recommend_candidates_for_job(job_payload, candidate_list)
 
-        # Persist predictions
-        for cand in result["candidates"]:
-            cid = cand.get("id") or cand.get("record_id")
-            store_prediction(
-                job_id,
-                cid,
-                {
-                    "score":     cand["score"],
-                    "precision": cand["precision"],
-                    "recall":    cand["recall"],
-                    "f1_score":  cand["f1_score"]
-                }
-            )
+        # Persist predictions in one transaction
+        store_predictions(job_id, result["candidates"])
 
         return result
 
@@ -518,8 +624,20 @@ def process_recommendations(job_id, job_description_fallback):
 
 
 
+def run_recommendation_task(task_id, job_id, job_description_fallback):
+    """Executor entry point: run the job and record its outcome in the task store."""
+    try:
+        result = process_recommendations(job_id, job_description_fallback)
+        complete_task(task_id, result)
+        return result
+    except Exception as e:
+        print(f"\n❌ Exception in recommendation task {task_id}:")
+        traceback.print_exc()  # ← This will show the real error!
+        fail_task(task_id, str(e))
+        raise
+
 # Modified recommendation endpoint
-@app.route("/api/recommendations/<job_id>", methods=["GET"])
+@api.route("/api/recommendations/<job_id>", methods=["GET"])
 def recommend_candidates(job_id):
     session = get_session()
     try:
@@ -531,13 +649,17 @@ def recommend_candidates(job_id):
         # Generate unique task ID
         task_id = str(uuid.uuid4())
         
-        # Store future reference
-        future = executor.submit(
-            process_recommendations,
+        # Status goes to the database so any worker can answer the polls
+        create_task(task_id, job_id)
+        future = current_app.extensions["recommendation_executor"].submit(
+            run_recommendation_task,
+            task_id,
             job_id,
             job.job_description
         )
+        tasks = current_app.extensions["recommendation_tasks"]
         tasks[task_id] = future
+        future.add_done_callback(lambda _: tasks.pop(task_id, None))
         
         return jsonify({
             "message": "Recommendation processing started",
@@ -551,35 +673,32 @@ def recommend_candidates(job_id):
         session.close()
 
 # Status checking endpoint
-@app.route("/api/recommendations/status/<task_id>", methods=["GET"])
+@api.route("/api/recommendations/status/<task_id>", methods=["GET"])
 def recommendation_status(task_id):
-    future = tasks.get(task_id)
+    task = get_task(task_id)
 
-    if not future:
+    if not task:
         return jsonify({"error": "Invalid task ID"}), 404
 
-    if not future.done():
+    if task["status"] == "processing":
         return jsonify({
             "status": "processing",
             "progress": "0"
         }), 200
 
-    try:
-        results = future.result()
-        del tasks[task_id]
+    if task["status"] == "complete":
+        delete_task(task_id)
         return jsonify({
             "status": "complete",
-            "results": results
+            "results": task["result"]
         })
 
-    except Exception as e:
-        import traceback
-        print("\n❌ Exception in recommendation task:")
-        traceback.print_exc()  # ← This will show the real error!
-        return jsonify({
-            "status": "error",
-            "error": str(e)
-        }), 500
+    # Reported once, like a result
+    delete_task(task_id)
+    return jsonify({
+        "status": "error",
+        "error": task["error"]
+    }), 500
 
 
 # def process_recommendations(job_id, job_description):
@@ -700,16 +819,22 @@ def recommendation_status(task_id):
 
 
 def batch_similarity(job_text, candidate_texts):
+    # Same SentenceTransformer instance as the matcher, not a second copy
+    from matching.matcher_pipeline import bert_model, util
+
     if not job_text or not candidate_texts:
         return [0.0 for _ in candidate_texts]
 
-    job_embedding = bert_model.encode(job_text, convert_to_tensor=True)
-    candidate_embeddings = bert_model.encode(candidate_texts, convert_to_tensor=True)
+    with time_inference("sentence_transformer"):
+        job_embedding = bert_model.encode(job_text, convert_to_tensor=True)
+    with time_inference("sentence_transformer", len(candidate_texts)):
+        candidate_embeddings = bert_model.encode(candidate_texts, convert_to_tensor=True)
     cosine_scores = util.cos_sim(job_embedding, candidate_embeddings)[0]
     return cosine_scores.cpu().tolist()
 
 # app.py
-@app.route("/api/recommendations/details/<job_id>", methods=["GET"])
+@api.route("/api/recommendations/details/<job_id>", methods=["GET"])
+@etag_from_tables("recommendation_results")
 def get_recommendation_details(job_id):
     session = get_session()
     try:
@@ -724,14 +849,15 @@ def get_recommendation_details(job_id):
         session.close()
 
 
-@app.errorhandler(404)
+@api.app_errorhandler(404)
 def not_found(error):
     return jsonify({"error": "Resource not found"}), 404
 
-@app.errorhandler(500)
+@api.app_errorhandler(500)
 def internal_error(error):
     return jsonify({"error": "Internal server error"}), 500
 # --- MAIN ---
 
 if __name__ == "__main__":
-    app.run(debug=True, port=5000)
+    # Development server only; production runs gunicorn -c gunicorn.conf.py wsgi:app
+    create_app().run(debug=True, port=5000)
@@ -1,39 +1,238 @@
 # backend/audit_log.py
 
+import argparse
+import atexit
+import json
+import os
+import queue
+import threading
+import time
 from uuid import uuid4
 from datetime import datetime, timedelta
-from db_connection import get_session
-from models import AuditLog
+
+from sqlalchemy import text
+
+import config
+from db_connection import get_engine, get_session
+from pagination import AUDIT_LOG_SORT_KEYS, AUDIT_LOG_TIEBREAKER, DEFAULT_PAGE_SIZE, Page, fetch_page
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"  # What the ORM TIMESTAMP columns store
+
+INSERT_AUDIT_SQL = text("""
+INSERT INTO candidate_profiles_audit_log
+(audit_id, record_id, operation, status, error_message, utc_timestamp, swedish_timestamp)
+VALUES (:audit_id, :record_id, :operation, :status, :error_message, :utc_timestamp, :swedish_timestamp)
+""")
 
 def get_current_timestamps():
     utc_now = datetime.utcnow()
     swedish_now = utc_now + timedelta(hours=2)
     return utc_now, swedish_now
 
+def write_audit_entries(entries):
+    """Insert a batch of audit rows in one transaction."""
+    with get_engine().begin() as conn:
+        conn.execute(INSERT_AUDIT_SQL, entries)
+
+class AuditWriter:
+    """Buffers audit entries and writes them from a background thread.
+
+    Batches are flushed when batch_size entries are waiting or
+    flush_interval seconds have passed. When the queue is full the caller
+    writes its entry itself, so nothing is dropped. In sync mode every entry
+    is written inline (tests, one-off scripts).
+    """
+
+    def __init__(self, batch_size=100, flush_interval=1.0, max_queue=10000, sync=False):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sync = sync
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def submit(self, entry):
+        if self.sync:
+            self._write([entry])
+            return
+
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._write([entry])
+
+    def flush(self):
+        """Block until everything submitted so far is written."""
+        if self._thread is not None and self._pid == os.getpid():
+            self._queue.join()
+
+    def close(self):
+        if self._thread is None or self._pid != os.getpid():
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _ensure_thread(self):
+        # Threads do not survive fork, so each process starts its own
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self._queue.maxsize)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        stopping = False
+
+        while not stopping:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                entry = self._queue.get(timeout=timeout)
+                if entry is None:
+                    stopping = True
+                    self._queue.task_done()
+                else:
+                    batch.append(entry)
+            except queue.Empty:
+                pass
+
+            if batch and (stopping or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write(batch)
+                for _ in batch:
+                    self._queue.task_done()
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+    def _write(self, entries):
+        try:
+            write_audit_entries(entries)
+        except Exception as e:
+            print(f"❌ Audit log failed ({len(entries)} entries): {e}")
+
+audit_writer = AuditWriter(
+    batch_size=config.AUDIT_BATCH_SIZE,
+    flush_interval=config.AUDIT_FLUSH_INTERVAL,
+    max_queue=config.AUDIT_MAX_QUEUE,
+    sync=config.AUDIT_LOG_SYNC
+)
+atexit.register(audit_writer.close)
+
+def configure_audit_writer(sync=None):
+    """Switch between buffered and synchronous audit writes (tests use sync=True)."""
+    if sync is not None:
+        audit_writer.flush()
+        audit_writer.sync = sync
+
+def flush_audit_log():
+    audit_writer.flush()
+
 def log_audit(record_id, operation, status, error_message=None):
-    session = get_session()
-
-    try:
-        audit_id = str(uuid4())
-        utc_timestamp, swedish_timestamp = get_current_timestamps()
-
-        audit_entry = AuditLog(
-            audit_id=audit_id,
-            record_id=record_id,
-            operation=operation,
-            status=status,
-            error_message=error_message if error_message else "",
-            utc_timestamp=utc_timestamp,
-            swedish_timestamp=swedish_timestamp
-        )
-
-        session.add(audit_entry)
-        session.commit()
-        print(f"📝 Audit log: {operation} - {status}")
-
-    except Exception as e:
-        session.rollback()
-        print(f"❌ Audit log failed: {e}")
-
-    finally:
-        session.close()
+    utc_now, swedish_now = get_current_timestamps()
+    audit_writer.submit({
+        "audit_id": str(uuid4()),
+        "record_id": record_id,
+        "operation": operation,
+        "status": status,
+        "error_message": error_message if error_message else "",
+        "utc_timestamp": utc_now.strftime(TIMESTAMP_FORMAT),
+        "swedish_timestamp": swedish_now.strftime(TIMESTAMP_FORMAT)
+    })
+    print(f"📝 Audit log: {operation} - {status}")
+
+# --- QUERIES ---
+
+def query_audit_log(session, record_id=None, operation=None, status=None, since=None, until=None, page=None):
+    """Audit entries newest first, filtered, as a keyset page envelope.
+
+    since/until are inclusive/exclusive UTC bounds ('YYYY-MM-DD[ HH:MM:SS]').
+    """
+    where_clauses = []
+    params = {}
+    for column, value in [("record_id", record_id), ("operation", operation), ("status", status)]:
+        if value:
+            where_clauses.append(f"{column} = :{column}")
+            params[column] = value
+    if since:
+        where_clauses.append("utc_timestamp >= :since")
+        params["since"] = since
+    if until:
+        where_clauses.append("utc_timestamp < :until")
+        params["until"] = until
+
+    return fetch_page(
+        session,
+        "SELECT audit_id, record_id, operation, status, error_message, utc_timestamp, swedish_timestamp",
+        "candidate_profiles_audit_log", where_clauses, params,
+        "utc_timestamp", AUDIT_LOG_SORT_KEYS["utc_timestamp"], AUDIT_LOG_TIEBREAKER,
+        page or Page(DEFAULT_PAGE_SIZE, None, False)
+    )
+
+# --- RETENTION ---
+
+def compact_audit_log(older_than_days=config.AUDIT_RETENTION_DAYS):
+    """Fold entries older than the cutoff into monthly summary rows and delete them."""
+    flush_audit_log()
+    cutoff = (datetime.utcnow() - timedelta(days=older_than_days)).strftime(TIMESTAMP_FORMAT)
+
+    with get_engine().begin() as conn:
+        conn.execute(text("""
+        INSERT INTO candidate_profiles_audit_summary
+        (month, operation, status, entry_count, first_utc_timestamp, last_utc_timestamp)
+        SELECT strftime('%Y-%m', utc_timestamp), operation, status, COUNT(*), MIN(utc_timestamp), MAX(utc_timestamp)
+        FROM candidate_profiles_audit_log
+        WHERE utc_timestamp < :cutoff
+        GROUP BY strftime('%Y-%m', utc_timestamp), operation, status
+        ON CONFLICT(month, operation, status) DO UPDATE SET
+            entry_count = entry_count + excluded.entry_count,
+            first_utc_timestamp = MIN(first_utc_timestamp, excluded.first_utc_timestamp),
+            last_utc_timestamp = MAX(last_utc_timestamp, excluded.last_utc_timestamp)
+        """), {"cutoff": cutoff})
+        deleted = conn.execute(
+            text("DELETE FROM candidate_profiles_audit_log WHERE utc_timestamp < :cutoff"),
+            {"cutoff": cutoff}
+        ).rowcount
+
+    print(f"🗜️ Compacted {deleted} audit entries older than {cutoff}")
+    return deleted
+
+def main():
+    parser = argparse.ArgumentParser(description="Query and compact the audit log")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    query = subparsers.add_parser("query", help="Print matching audit entries as JSON")
+    query.add_argument("--record-id")
+    query.add_argument("--operation")
+    query.add_argument("--status")
+    query.add_argument("--since")
+    query.add_argument("--until")
+    query.add_argument("--limit", type=int, default=DEFAULT_PAGE_SIZE)
+    query.add_argument("--cursor")
+
+    compact = subparsers.add_parser("compact", help="Summarize and delete old entries")
+    compact.add_argument("--older-than-days", type=int, default=config.AUDIT_RETENTION_DAYS)
+    args = parser.parse_args()
+
+    if args.command == "query":
+        session = get_session()
+        try:
+            result = query_audit_log(
+                session, args.record_id, args.operation, args.status, args.since, args.until,
+                Page(args.limit, args.cursor, False)
+            )
+        finally:
+            session.close()
+        print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+    elif args.command == "compact":
+        compact_audit_log(args.older_than_days)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+# backend/benchmarks/__init__.py
+"""Repeatable benchmarks on seeded synthetic data.
+
+Run from backend/:
+
+    python -m benchmarks run --persons 2000 --jobs 50 --save-baseline local
+    python -m benchmarks compare benchmark_results.json benchmarks/baselines/local.json
+    python -m benchmarks load --persons 500 --concurrency 1 4 16 --duration 20
+
+Every run uses its own temporary SQLite database, never recruitment.db.
+The load test serves the app on 127.0.0.1 only.
+"""
@@ -0,0 +1,126 @@
+# backend/benchmarks/__main__.py
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+def _use_scratch_database(args):
+    scratch = tempfile.TemporaryDirectory(prefix="recruitment-bench-")
+    # Must be set before anything imports db_connection
+    os.environ["DATABASE_URL"] = args.database or f"sqlite:///{scratch.name}/bench.db"
+    os.environ.setdefault("AUDIT_LOG_SYNC", "0")
+    return scratch
+
+def _run(args):
+    scratch = _use_scratch_database(args)
+
+    from benchmarks.suite import run_suite
+
+    results = run_suite(args.persons, args.jobs, args.seed, args.repeat, args.only, args.verbose)
+    args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"✅ Results written to {args.out}")
+
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save_baseline}.json"
+        path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"✅ Baseline saved to {path}")
+    scratch.cleanup()
+
+def _load(args):
+    if args.executor_workers:
+        os.environ["RECOMMENDATION_WORKERS"] = str(args.executor_workers)
+    scratch = _use_scratch_database(args)
+
+    from benchmarks.loadtest import parse_mix, run_load_test
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    results = run_load_test(
+        args.persons, args.jobs, args.seed, args.concurrency, args.duration, mix,
+        args.poll_interval, args.task_timeout, args.verbose
+    )
+    args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"✅ Results written to {args.out}")
+    scratch.cleanup()
+
+def _compare(args):
+    from benchmarks.suite import compare_results
+
+    current = json.loads(args.current.read_text(encoding="utf-8"))
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    for key in ["persons", "jobs", "seed"]:
+        if current["meta"].get(key) != baseline["meta"].get(key):
+            print(f"⚠️ {key} differs: baseline {baseline['meta'].get(key)}, current {current['meta'].get(key)}")
+
+    rows = compare_results(current, baseline, args.threshold)
+    regressions = 0
+    print(f"{'benchmark':<42} {'baseline':>10} {'current':>10} {'ratio':>7}  status")
+    for name, base, cur, ratio, status in rows:
+        fmt = lambda value: f"{value:.4f}" if value is not None else "-"
+        print(f"{name:<42} {fmt(base):>10} {fmt(cur):>10} {fmt(ratio) if ratio is not None else '-':>7}  {status}")
+        regressions += status == "REGRESSION"
+
+    if regressions:
+        print(f"❌ {regressions} regression(s) over {args.threshold:.0%}")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Synthetic-data benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks on a scratch database")
+    run.add_argument("--persons", type=int, default=2000, help="Synthetic persons in the feed")
+    run.add_argument("--jobs", type=int, default=50, help="Synthetic job postings")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    run.add_argument("--only", nargs="*", help="Benchmark name prefixes, e.g. join ingest.initial")
+    run.add_argument("--out", type=Path, default=Path("benchmark_results.json"))
+    run.add_argument("--save-baseline", metavar="NAME", help="Also store the results as baselines/NAME.json")
+    run.add_argument("--database", help="SQLAlchemy URL to use instead of a temporary SQLite file")
+    run.add_argument("--verbose", action="store_true", help="Show the output of the code under test")
+
+    load = commands.add_parser("load", help="Load-test the HTTP API on 127.0.0.1 with mixed concurrent traffic")
+    load.add_argument("--persons", type=int, default=500, help="Synthetic candidates in the scratch database")
+    load.add_argument("--jobs", type=int, default=20, help="Synthetic job postings")
+    load.add_argument("--seed", type=int, default=42)
+    load.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16],
+                      help="Concurrent clients per stage; one stage per value")
+    load.add_argument("--duration", type=float, default=20.0, help="Seconds per stage")
+    load.add_argument("--mix", help="Operation weights, e.g. list=30,search=30,detail=20,recommend=5 "
+                                    "(operations: list, search, detail, create, update, delete, recommend)")
+    load.add_argument("--executor-workers", type=int,
+                      help="Recommendation executor size (default: RECOMMENDATION_WORKERS)")
+    load.add_argument("--poll-interval", type=float, default=0.25, help="Seconds between status polls")
+    load.add_argument("--task-timeout", type=float, default=120.0,
+                      help="Seconds before a recommendation job counts as failed")
+    load.add_argument("--out", type=Path, default=Path("loadtest_results.json"))
+    load.add_argument("--database", help="SQLAlchemy URL to use instead of a temporary SQLite file")
+    load.add_argument("--verbose", action="store_true", help="Show the app's own output")
+
+    compare = commands.add_parser("compare", help="Compare results against a baseline")
+    compare.add_argument("current", type=Path)
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("--threshold", type=float, default=0.2,
+                         help="Relative slowdown of the median counted as a regression")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        _run(args)
+        return 0
+    if args.command == "load":
+        _load(args)
+        return 0
+    return _compare(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
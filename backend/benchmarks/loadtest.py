@@ -0,0 +1,346 @@
+# backend/benchmarks/loadtest.py
+#
+# Drives the real Flask app over HTTP on 127.0.0.1 with mixed concurrent
+# traffic. Like suite.py, backend modules are imported only after
+# DATABASE_URL points at the scratch database.
+
+import contextlib
+import io
+import json
+import logging
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.suite import Context, load_joined, seed_database
+from benchmarks.synthetic import CITIES, load_vocabulary
+
+# Relative weight of each operation in the traffic mix
+DEFAULT_MIX = {
+    "list": 25,
+    "search": 25,
+    "detail": 20,
+    "create": 8,
+    "update": 8,
+    "delete": 4,
+    "recommend": 10,
+}
+
+PERCENTILES = [50, 90, 95, 99]
+
+def parse_mix(value):
+    """"list=30,search=30,recommend=5" -> weights; unnamed operations get 0."""
+    if not value:
+        return dict(DEFAULT_MIX)
+    mix = dict.fromkeys(DEFAULT_MIX, 0)
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown operation: {name} (choose from {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight)
+    if not any(mix.values()):
+        raise ValueError("The traffic mix needs at least one positive weight")
+    return mix
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+class Recorder:
+    """Latencies and failures per endpoint, shared by all client threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, name, seconds, ok=True):
+        with self.lock:
+            self.latencies[name].append(seconds)
+            if not ok:
+                self.errors[name] += 1
+
+    def summary(self, elapsed):
+        endpoints = {}
+        for name in sorted(self.latencies):
+            values = sorted(self.latencies[name])
+            entry = {
+                "count": len(values),
+                "errors": self.errors[name],
+                "rps": len(values) / elapsed,
+                "max_ms": values[-1] * 1000,
+            }
+            for pct in PERCENTILES:
+                entry[f"p{pct}_ms"] = percentile(values, pct) * 1000
+            endpoints[name] = entry
+        return endpoints
+
+class ExecutorSampler(threading.Thread):
+    """Samples the recommendation executor while a stage runs."""
+
+    def __init__(self, app, interval=0.05):
+        super().__init__(daemon=True)
+        self.executor = app.extensions["recommendation_executor"]
+        self.tasks = app.extensions["recommendation_tasks"]
+        self.interval = interval
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            futures = list(self.tasks.values())
+            self.samples.append((
+                self.executor._work_queue.qsize(),  # Submitted but not yet picked up by a worker
+                sum(1 for future in futures if future.running()),
+                len(futures),
+            ))
+
+    def summary(self):
+        queue = [sample[0] for sample in self.samples] or [0]
+        return {
+            "workers": self.executor._max_workers,
+            "max_queue_depth": max(queue),
+            "mean_queue_depth": sum(queue) / len(queue),
+            "max_active": max((sample[1] for sample in self.samples), default=0),
+            "max_tasks": max((sample[2] for sample in self.samples), default=0),
+        }
+
+class Traffic:
+    """The operations a simulated client can perform against base_url."""
+
+    def __init__(self, base_url, recorder, record_ids, job_ids, search_terms, poll_interval, task_timeout):
+        self.base_url = base_url
+        self.recorder = recorder
+        self.record_ids = record_ids
+        self.job_ids = job_ids
+        self.search_terms = search_terms
+        self.poll_interval = poll_interval
+        self.task_timeout = task_timeout
+        self.created = []
+        self.created_lock = threading.Lock()
+
+    def request(self, name, method, path, body=None):
+        """Timed request; returns (status, parsed JSON body) or (None, None) on connection errors."""
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        if data is not None:
+            req.add_header("Content-Type", "application/json")
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=60) as response:
+                status, payload = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, payload = e.code, e.read()
+        except (urllib.error.URLError, OSError):
+            self.recorder.record(name, time.perf_counter() - started, ok=False)
+            return None, None
+        self.recorder.record(name, time.perf_counter() - started, ok=status < 400)
+        try:
+            return status, json.loads(payload) if payload else None
+        except ValueError:
+            return status, None
+
+    def list(self, rng):
+        # First page, sometimes followed by the next one like a scrolling client
+        status, body = self.request("list", "GET", "/api/candidates?limit=50")
+        if status == 200 and body and body.get("next_cursor") and rng.random() < 0.5:
+            cursor = urllib.request.quote(body["next_cursor"])
+            self.request("list", "GET", f"/api/candidates?limit=50&include_total=false&cursor={cursor}")
+
+    def search(self, rng):
+        term = urllib.request.quote(rng.choice(self.search_terms))
+        self.request("search", "GET", f"/api/candidates?search={term}&limit=50")
+
+    def detail(self, rng):
+        self.request("detail", "GET", f"/api/candidates/{rng.choice(self.record_ids)}")
+
+    def create(self, rng):
+        status, body = self.request("create", "POST", "/api/candidates", {
+            "name": f"Load Test {rng.randrange(10**9)}",
+            "city": rng.choice(CITIES),
+            "position": rng.choice(self.search_terms).title(),
+            "about": f"Load test candidate working with {rng.choice(self.search_terms)}.",
+            "total_experience_years": rng.randint(0, 30),
+        })
+        if status == 201 and body and body.get("record_id"):
+            with self.created_lock:
+                self.created.append(body["record_id"])
+
+    def _own_record(self, rng, remove=False):
+        # Writes only touch candidates this run created, never the seeded set
+        with self.created_lock:
+            if not self.created:
+                return None
+            index = rng.randrange(len(self.created))
+            return self.created.pop(index) if remove else self.created[index]
+
+    def update(self, rng):
+        record_id = self._own_record(rng)
+        if record_id is None:
+            return self.create(rng)
+        self.request("update", "PUT", f"/api/candidates/{record_id}", {
+            "city": rng.choice(CITIES),
+            "total_experience_years": rng.randint(0, 30),
+        })
+
+    def delete(self, rng):
+        record_id = self._own_record(rng, remove=True)
+        if record_id is None:
+            return self.create(rng)
+        self.request("delete", "DELETE", f"/api/candidates/{record_id}")
+
+    def recommend(self, rng):
+        """Start a recommendation job and poll it like the frontend does."""
+        started = time.perf_counter()
+        status, body = self.request("recommend.start", "GET", f"/api/recommendations/{rng.choice(self.job_ids)}")
+        if status != 202 or not body:
+            return
+        task_id = body["task_id"]
+        deadline = started + self.task_timeout
+        while time.perf_counter() < deadline:
+            time.sleep(self.poll_interval)
+            status, body = self.request("recommend.status", "GET", f"/api/recommendations/status/{task_id}")
+            if status is None or status >= 400:
+                self.recorder.record("recommend.complete", time.perf_counter() - started, ok=False)
+                return
+            if body.get("status") != "processing":
+                self.recorder.record("recommend.complete", time.perf_counter() - started)
+                return
+        self.recorder.record("recommend.complete", time.perf_counter() - started, ok=False)
+
+def _client_loop(traffic, mix, deadline, seed):
+    rng = random.Random(seed)
+    operations, weights = zip(*[(name, weight) for name, weight in mix.items() if weight > 0])
+    while time.perf_counter() < deadline:
+        getattr(traffic, rng.choices(operations, weights)[0])(rng)
+
+def _drain_executor(app, timeout):
+    """Wait for recommendation jobs left over from a stage."""
+    deadline = time.perf_counter() + timeout
+    for future in list(app.extensions["recommendation_tasks"].values()):
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        with contextlib.suppress(Exception):
+            future.result(timeout=remaining)
+
+def run_stage(app, traffic, mix, concurrency, duration, seed):
+    recorder = Recorder()
+    traffic.recorder = recorder
+    sampler = ExecutorSampler(app)
+    sampler.start()
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        for client in range(concurrency):
+            clients.submit(_client_loop, traffic, mix, deadline, seed + client)
+    elapsed = time.perf_counter() - started
+    sampler.stopped.set()
+    sampler.join()
+
+    endpoints = recorder.summary(elapsed)
+    requests = sum(entry["count"] for name, entry in endpoints.items() if name != "recommend.complete")
+    return {
+        "concurrency": concurrency,
+        "duration_s": elapsed,
+        "requests": requests,
+        "throughput_rps": requests / elapsed,
+        "endpoints": endpoints,
+        "executor": sampler.summary(),
+    }
+
+def find_saturation(stages):
+    """First concurrency at which recommendation jobs queue behind busy workers, or None."""
+    for stage in stages:
+        if stage["executor"]["mean_queue_depth"] >= 1:
+            return stage["concurrency"]
+    return None
+
+def run_load_test(persons=500, jobs=20, seed=42, concurrency=(1, 4, 16), duration=20.0, mix=None,
+                  poll_interval=0.25, task_timeout=120.0, verbose=False):
+    """Seed a scratch database, serve the app on 127.0.0.1 and run one stage per concurrency level."""
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    quiet = contextlib.nullcontext if verbose else lambda: contextlib.redirect_stdout(io.StringIO())
+
+    mix = mix or dict(DEFAULT_MIX)
+    ctx = Context(persons, jobs, seed)
+    with quiet():
+        seed_database(ctx)
+        load_joined(ctx)
+        from app import create_app
+        # Loading spaCy and BERT takes a while; only recommendation jobs use them
+        app = create_app(preload=mix.get("recommend", 0) > 0)
+
+    from db_connection import get_engine
+    from sqlalchemy import text
+    with get_engine().connect() as conn:
+        record_ids = [row[0] for row in conn.execute(text("SELECT record_id FROM candidate_profiles_joined"))]
+    roles, tech = load_vocabulary()
+    search_terms = roles[:20] + tech[:40]
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    print(f"🚀 Serving scratch app at {base_url} ({persons} candidates, {jobs} jobs)")
+
+    traffic = Traffic(
+        base_url, None, record_ids, [job["job_id"] for job in ctx.job_postings], search_terms,
+        poll_interval, task_timeout
+    )
+    stages = []
+    try:
+        for level in concurrency:
+            print(f"⏳ {level} concurrent client(s) for {duration:g}s...")
+            with quiet():
+                stage = run_stage(app, traffic, mix, level, duration, seed)
+                _drain_executor(app, task_timeout)
+            stages.append(stage)
+            print_stage(stage)
+    finally:
+        server.shutdown()
+        server_thread.join()
+
+    saturation = find_saturation(stages)
+    if saturation is None:
+        print("✅ Recommendation executor never queued work")
+    else:
+        print(f"⚠️ Recommendation executor saturated from {saturation} concurrent client(s)")
+
+    return {
+        "meta": {
+            "persons": persons,
+            "jobs": jobs,
+            "seed": seed,
+            "duration_s": duration,
+            "mix": mix,
+            "executor_workers": app.extensions["recommendation_executor"]._max_workers,
+        },
+        "stages": stages,
+        "executor_saturated_at": saturation,
+    }
+
+def print_stage(stage):
+    executor = stage["executor"]
+    print(
+        f"📊 concurrency {stage['concurrency']}: {stage['requests']} requests, "
+        f"{stage['throughput_rps']:.1f} req/s; executor queue max {executor['max_queue_depth']} "
+        f"(mean {executor['mean_queue_depth']:.2f}), active max {executor['max_active']}/{executor['workers']}, "
+        f"tasks max {executor['max_tasks']}"
+    )
+    print(f"   {'endpoint':<20} {'count':>6} {'err':>4} {'req/s':>7} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for name, entry in stage["endpoints"].items():
+        print(
+            f"   {name:<20} {entry['count']:>6} {entry['errors']:>4} {entry['rps']:>7.1f} "
+            + " ".join(f"{entry[key]:>8.1f}" for key in ["p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms"])
+        )
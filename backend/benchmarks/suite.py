@@ -0,0 +1,258 @@
+# backend/benchmarks/suite.py
+#
+# Imports of backend modules happen inside the benchmarks: DATABASE_URL must
+# point at the scratch database before db_connection is first imported.
+
+import contextlib
+import io
+import platform
+import statistics
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from benchmarks.synthetic import generate_feed, generate_job_postings
+
+# prepare(ctx) -> (setup or None, run); setup runs untimed before every run
+Benchmark = namedtuple("Benchmark", ["name", "prepare"])
+
+RAW_TABLES = ["person_raw", "experience_raw", "education_raw", "certifications_raw", "languages_raw", "courses_raw"]
+
+SEARCH_REQUESTS = {
+    "api.search_fts": "/api/candidates?search=python&limit=50",
+    "api.search_field": "/api/candidates/filter?search=developer&filter_field=position&limit=50",
+    "api.sorted_page": "/api/candidates?sort_by=name&limit=50",
+}
+
+class BenchmarkSkipped(Exception):
+    """The benchmark cannot run here (e.g. the spaCy/BERT models are not installed)."""
+
+class Context:
+    def __init__(self, persons, jobs, seed):
+        self.persons = persons
+        self.jobs = jobs
+        self.seed = seed
+        self.feed = generate_feed(persons, seed)
+        self.job_postings = generate_job_postings(jobs, seed)
+
+def _clear_raw_tables():
+    from db_connection import get_engine
+
+    with get_engine().begin() as conn:
+        for table in RAW_TABLES:
+            conn.execute(text(f"DELETE FROM {table}"))
+
+def _load_feed(ctx):
+    from data_fetching import normalize_and_insert
+
+    _clear_raw_tables()
+    normalize_and_insert(ctx.feed)
+
+def load_joined(ctx):
+    from join_profiles import create_joined_profiles
+
+    _load_feed(ctx)
+    create_joined_profiles(backend="sql")
+
+def _candidates(limit=None):
+    from db_connection import get_engine
+
+    query = (
+        "SELECT record_id, city, total_experience_years, match_text, match_text_hash "
+        "FROM candidate_profiles_joined ORDER BY record_id"
+    )
+    if limit:
+        query += f" LIMIT {int(limit)}"
+    with get_engine().connect() as conn:
+        return [dict(row) for row in conn.execute(text(query)).mappings()]
+
+def _matcher():
+    try:
+        from matching import matcher_pipeline
+    except (ImportError, OSError) as e:  # Package or spaCy model missing
+        raise BenchmarkSkipped(f"matcher pipeline unavailable: {e}")
+    return matcher_pipeline
+
+def _app():
+    try:
+        from app import create_app
+    except (ImportError, OSError) as e:
+        raise BenchmarkSkipped(f"app unavailable: {e}")
+    # The search endpoints don't touch the models
+    return create_app(preload=False)
+
+def ingest_initial(ctx):
+    from data_fetching import normalize_and_insert
+
+    return _clear_raw_tables, lambda: normalize_and_insert(ctx.feed)
+
+def ingest_unchanged(ctx):
+    from data_fetching import normalize_and_insert
+
+    _load_feed(ctx)
+    return None, lambda: normalize_and_insert(ctx.feed)
+
+def join_pandas(ctx):
+    from join_profiles import create_joined_profiles
+
+    _load_feed(ctx)
+    return None, lambda: create_joined_profiles(backend="pandas")
+
+def join_sql(ctx):
+    from join_profiles import create_joined_profiles
+
+    _load_feed(ctx)
+    return None, lambda: create_joined_profiles(backend="sql")
+
+def join_incremental(ctx):
+    from data_fetching import normalize_and_insert
+    from join_profiles import update_joined_profiles
+
+    load_joined(ctx)
+    records = [dict(record) for record in ctx.feed[::100]]
+    abouts = [record["about"] or "" for record in records]
+    revision = [0]
+
+    def setup():
+        # A new about text per run, so every timed run rewrites these joined
+        # rows instead of skipping them on an unchanged content_hash
+        revision[0] += 1
+        for record, about in zip(records, abouts):
+            record["about"] = f"{about} (revision {revision[0]})"
+        normalize_and_insert(records)
+
+    def run():
+        written = update_joined_profiles([record["linkedin_num_id"] for record in records])
+        if written != len(records):
+            raise RuntimeError(f"expected {len(records)} joined rows rewritten, got {written}")
+
+    return setup, run
+
+def extract_entities(ctx):
+    matcher = _matcher()
+    texts = [record["about"] or "" for record in ctx.feed[:200]]
+    return None, lambda: [matcher.extract_entities(value) for value in texts]
+
+def match_entities_with_bert(ctx):
+    matcher = _matcher()
+    load_joined(ctx)
+    job = ctx.job_postings[0]
+    candidates = [
+        {"match_text": c["match_text"], "match_text_hash": c["match_text_hash"], "city": c["city"],
+         "total_experience": c["total_experience_years"] or 0}
+        for c in _candidates(limit=100)
+    ]
+    # Cold embeddings each run; a warm cache would only time the spaCy half
+    return matcher.embeddings.clear, lambda: [matcher.match_entities_with_bert(job, c) for c in candidates]
+
+def recommend_candidates_for_job(ctx):
+    _matcher()
+    from matching.recommendations import recommend_candidates_for_job as recommend
+
+    load_joined(ctx)
+    job = dict(ctx.job_postings[0], id=ctx.job_postings[0]["job_id"])
+    candidates = _candidates(limit=200)
+    return _matcher().embeddings.clear, lambda: recommend(job, candidates)
+
+def _api_benchmark(path, requests_per_run=50):
+    def prepare(ctx):
+        app = _app()
+        load_joined(ctx)
+        client = app.test_client()
+
+        def run():
+            for _ in range(requests_per_run):
+                response = client.get(path)
+                if response.status_code != 200:
+                    raise RuntimeError(f"GET {path} returned {response.status_code}")
+
+        return None, run
+    return prepare
+
+BENCHMARKS = [
+    Benchmark("ingest.initial", ingest_initial),
+    Benchmark("ingest.unchanged", ingest_unchanged),
+    Benchmark("join.pandas", join_pandas),
+    Benchmark("join.sql", join_sql),
+    Benchmark("join.incremental", join_incremental),
+    Benchmark("matching.extract_entities", extract_entities),
+    Benchmark("matching.match_entities_with_bert", match_entities_with_bert),
+    Benchmark("matching.recommend_candidates_for_job", recommend_candidates_for_job),
+] + [Benchmark(name, _api_benchmark(path)) for name, path in SEARCH_REQUESTS.items()]
+
+def seed_database(ctx):
+    from db_connection import get_engine
+    from migrations import upgrade
+
+    upgrade()
+    columns = list(ctx.job_postings[0])
+    with get_engine().begin() as conn:
+        conn.execute(text("DELETE FROM job_postings_raw"))
+        conn.execute(
+            text(f"INSERT INTO job_postings_raw ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)})"),
+            ctx.job_postings
+        )
+
+def run_suite(persons=2000, jobs=50, seed=42, repeat=5, only=None, verbose=False):
+    """Run the benchmarks (or those whose name starts with one of only) and return a results dict."""
+    ctx = Context(persons, jobs, seed)
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        seed_database(ctx)
+
+    results = {}
+    for benchmark in BENCHMARKS:
+        if only and not any(benchmark.name.startswith(prefix) for prefix in only):
+            continue
+        try:
+            timings = []
+            with contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO()):
+                setup, run = benchmark.prepare(ctx)
+                for _ in range(repeat):
+                    if setup:
+                        setup()
+                    started = time.perf_counter()
+                    run()
+                    timings.append(time.perf_counter() - started)
+            results[benchmark.name] = {
+                "median_s": statistics.median(timings),
+                "min_s": min(timings),
+                "runs": timings,
+            }
+            print(f"⏱️ {benchmark.name}: median {results[benchmark.name]['median_s']:.4f}s")
+        except BenchmarkSkipped as e:
+            results[benchmark.name] = {"skipped": str(e)}
+            print(f"⏭️ {benchmark.name}: skipped ({e})")
+
+    return {
+        "meta": {
+            "persons": persons,
+            "jobs": jobs,
+            "seed": seed,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+def compare_results(current, baseline, threshold=0.2):
+    """Rows of (name, baseline_s, current_s, ratio, status); status is ok, REGRESSION, faster or n/a."""
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name, {})
+        if "median_s" not in result or "median_s" not in base:
+            rows.append((name, base.get("median_s"), result.get("median_s"), None, "n/a"))
+            continue
+        ratio = result["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        if ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1 - threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, base["median_s"], result["median_s"], ratio, status))
+    return rows
@@ -0,0 +1,120 @@
+# backend/benchmarks/synthetic.py
+
+import json
+import random
+
+from matching.tech_patterns import TECH_TERMS_PATH
+
+CITIES = [
+    "Stockholm, Stockholm County, Sweden", "Göteborg, Västra Götaland County, Sweden",
+    "Malmö, Skåne County, Sweden", "Uppsala, Uppsala County, Sweden",
+    "Linköping, Östergötland County, Sweden", "Västerås, Västmanland County, Sweden",
+    "Örebro, Örebro County, Sweden", "Lund, Skåne County, Sweden",
+]
+COMPANIES = ["Ericsson", "Spotify", "Klarna", "Volvo Cars", "Sectra", "Saab", "H&M", "Scania", "King", "IKEA"]
+DEGREES = [
+    "Master of Science - MS, Computer Science", "Bachelor of Science - BS, Software Engineering",
+    "Master's degree, Data Science", "Bachelor's degree, Information Technology",
+    "Civilingenjör, Datateknik", "Högskoleingenjör, Elektroteknik",
+]
+CERTIFICATIONS = [
+    "AWS Certified Solutions Architect", "Certified ScrumMaster", "ISTQB Foundation Level",
+    "Microsoft Certified: Azure Fundamentals", "Google Professional Data Engineer", "PMP",
+]
+LANGUAGES = ["English", "Swedish", "German", "Spanish", "French", "Arabic", "Somali", "Finnish"]
+COURSES = ["Algorithms", "Machine Learning", "Distributed Systems", "Databases", "Agile Methods", "Cloud Computing"]
+DEPARTMENTS = ["Engineering", "Data", "Product", "IT Operations", "Quality Assurance"]
+WORK_TYPES = ["Full-time", "Part-time", "Contract", "Hybrid", "Remote"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+def load_vocabulary():
+    with open(TECH_TERMS_PATH, "r", encoding="utf-8") as f:
+        terms = json.load(f)
+    return terms["roles"], terms["tech"]
+
+def _feed_date(rng, year):
+    # Same shapes as the real feed: mostly "Aug 2024", sometimes just "2010"
+    if rng.random() < 0.1:
+        return str(year)
+    return f"{rng.choice(MONTHS)} {year}"
+
+def _about(rng, roles, tech):
+    return (
+        f"{rng.choice(roles).title()} with experience in {', '.join(rng.sample(tech, 4))}. "
+        f"Previously worked as {rng.choice(roles)} and {rng.choice(roles)}, "
+        f"mostly with {rng.choice(tech)} and {rng.choice(tech)}."
+    )
+
+def _experience(rng, roles):
+    entries = []
+    year = rng.randint(1995, 2022)
+    for _ in range(rng.randint(1, 6)):
+        end_year = min(year + rng.randint(0, 5), 2025)
+        ongoing = end_year == 2025 and rng.random() < 0.5
+        position = {
+            "title": rng.choice(roles).title(),
+            "start_date": _feed_date(rng, year),
+            "end_date": "Present" if ongoing else _feed_date(rng, end_year),
+        }
+        if rng.random() < 0.15:
+            # Grouped positions at one company, like the feed's "positions" lists
+            entries.append({"company": rng.choice(COMPANIES), "positions": [position, dict(position, title=rng.choice(roles).title())]})
+        else:
+            entries.append(dict(position, company=rng.choice(COMPANIES)))
+        year = end_year
+    return entries
+
+def generate_feed(persons, seed=42):
+    """Feed records shaped like the remote Recruitment_system.json."""
+    rng = random.Random(seed)
+    roles, tech = load_vocabulary()
+    records = []
+    for i in range(persons):
+        role = rng.choice(roles).title()
+        company = rng.choice(COMPANIES)
+        records.append({
+            "linkedin_num_id": str(100000000 + i),
+            "name": f"Person {i}",
+            "country_code": "SE",
+            "city": rng.choice(CITIES),
+            "url": f"https://www.linkedin.com/in/person-{i}",
+            "position": f"{role} at {company}",
+            "current_company_name": company,
+            "about": _about(rng, roles, tech) if rng.random() < 0.85 else None,
+            "experience": _experience(rng, roles),
+            "education": [{"degree": rng.choice(DEGREES)} for _ in range(rng.randint(0, 2))],
+            "certifications": [{"title": title} for title in rng.sample(CERTIFICATIONS, rng.randint(0, 3))],
+            "languages": [{"title": title} for title in rng.sample(LANGUAGES, rng.randint(1, 3))],
+            "courses": [{"title": title} for title in rng.sample(COURSES, rng.randint(0, 3))],
+        })
+    return records
+
+def generate_job_postings(jobs, seed=42):
+    """Rows for job_postings_raw using the tech_terms.json vocabulary."""
+    rng = random.Random(seed + 1)
+    roles, tech = load_vocabulary()
+    postings = []
+    for i in range(jobs):
+        role = rng.choice(roles).title()
+        years = rng.randint(0, 10)
+        required = rng.sample(tech, 5)
+        postings.append({
+            "job_id": f"bench-job-{i:05d}",
+            "title": role,
+            "department": rng.choice(DEPARTMENTS),
+            "locations": rng.choice(CITIES).split(",")[0],
+            "work_type": rng.choice(WORK_TYPES),
+            "required_skills": ", ".join(required),
+            "preferred_skills": ", ".join(rng.sample(tech, 3)),
+            "education_level": rng.choice(["Bachelor", "Master", "None"]),
+            "languages_required": ", ".join(rng.sample(LANGUAGES[:3], rng.randint(1, 2))),
+            "experience_required": f"{years}+ years in {role}",
+            "total_experience_years": years,
+            "responsibilities": f"Own {rng.choice(tech)} services and work with {rng.choice(roles)}s.",
+            "qualifications": f"Solid {', '.join(required[:3])} skills.",
+            "job_description": (
+                f"We are looking for a {role} to join our {rng.choice(DEPARTMENTS)} team. "
+                f"You will work with {', '.join(required)} and collaborate with {rng.choice(roles)}s."
+            ),
+        })
+    return postings
@@ -0,0 +1,55 @@
+# backend/conditional.py
+
+import hashlib
+from functools import wraps
+
+from flask import make_response, request
+
+from db_connection import get_session
+from metrics import CONDITIONAL_REQUESTS
+from responses import negotiated_encoding, negotiated_mimetype
+from table_versions import get_table_versions
+
+def compute_etag(tables):
+    """ETag for the current URL given the versions of the tables it reads.
+
+    The negotiated body format and encoding are part of the key: the same URL
+    answers with JSON or MessagePack, plain or compressed.
+    """
+    session = get_session()
+    try:
+        versions = get_table_versions(session, tables)
+    finally:
+        session.close()
+
+    key = "|".join([
+        request.full_path, negotiated_mimetype(), negotiated_encoding() or "identity",
+        *(f"{t}:{versions[t]}" for t in tables)
+    ])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+def etag_from_tables(*tables):
+    """Serve the view with an ETag and answer If-None-Match with 304.
+
+    The versions are read before the view runs, so a concurrent write can
+    only make the tag older than the body, never newer.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = compute_etag(tables)
+            if request.if_none_match.contains_weak(etag):
+                CONDITIONAL_REQUESTS.inc(result="hit")
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                CONDITIONAL_REQUESTS.inc(result="miss")
+            # Weak: bodies under COMPRESSION_MIN_BYTES go out unencoded
+            response.set_etag(etag, weak=True)
+            response.vary.update(["Accept", "Accept-Encoding"])
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,64 @@
+# backend/config.py
+
+import os
+
+# Database — override with DATABASE_URL=sqlite:////path/to/recruitment.db
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///recruitment.db")
+DB_ECHO = os.environ.get("DB_ECHO", "0") == "1"
+
+# Connection pool: every server/executor thread checks out its own connection
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "8"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "8"))
+
+# SQLite tuning applied to every new connection
+SQLITE_JOURNAL_MODE = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.environ.get("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Response layer (responses.py)
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", "4"))
+
+# Background recommendation jobs (app.py executor)
+RECOMMENDATION_WORKERS = int(os.environ.get("RECOMMENDATION_WORKERS", "4"))
+# Task rows never polled to completion are purged this long after their last update
+RECOMMENDATION_TASK_TTL_HOURS = int(os.environ.get("RECOMMENDATION_TASK_TTL_HOURS", "24"))
+# Embeddings kept per worker, keyed by match_text_hash (matching/embedding_cache.py)
+EMBEDDING_CACHE_SIZE = int(os.environ.get("EMBEDDING_CACHE_SIZE", "10000"))
+
+# gunicorn (gunicorn.conf.py); every worker also runs RECOMMENDATION_WORKERS jobs
+WEB_BIND = os.environ.get("WEB_BIND", "127.0.0.1:5000")
+WEB_WORKERS = int(os.environ.get("WEB_WORKERS", "2"))
+WEB_THREADS = int(os.environ.get("WEB_THREADS", "4"))  # Request threads per worker
+WEB_TIMEOUT = int(os.environ.get("WEB_TIMEOUT", "120"))
+
+# Audit log writer (audit_log.py)
+AUDIT_LOG_SYNC = os.environ.get("AUDIT_LOG_SYNC", "0") == "1"
+AUDIT_BATCH_SIZE = int(os.environ.get("AUDIT_BATCH_SIZE", "100"))
+AUDIT_FLUSH_INTERVAL = float(os.environ.get("AUDIT_FLUSH_INTERVAL", "1.0"))
+AUDIT_MAX_QUEUE = int(os.environ.get("AUDIT_MAX_QUEUE", "10000"))
+AUDIT_RETENTION_DAYS = int(os.environ.get("AUDIT_RETENTION_DAYS", "90"))
+
+# Joined profile build (join_profiles.py): "pandas" or "sql" (aggregates inside SQLite)
+JOIN_BACKEND = os.environ.get("JOIN_BACKEND", "pandas")
+# Rows per multi-row INSERT when the pandas backend loads the shadow table; capped so
+# rows x joined columns stays within SQLITE_MAX_VARIABLES (32766 since SQLite 3.32)
+JOIN_INSERT_CHUNK_SIZE = int(os.environ.get("JOIN_INSERT_CHUNK_SIZE", "500"))
+SQLITE_MAX_VARIABLES = int(os.environ.get("SQLITE_MAX_VARIABLES", "32766"))
+
+# Profile export (export_profiles.py): rows fetched per round trip
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "2000"))
+
+# NER corpus (ner_training_data.py)
+NER_INSERT_CHUNK_SIZE = int(os.environ.get("NER_INSERT_CHUNK_SIZE", "1000"))
+NER_DOCBIN_SHARD_SIZE = int(os.environ.get("NER_DOCBIN_SHARD_SIZE", "1000"))  # Docs per .spacy file
+
+# Feed ingestion (data_fetching.py)
+INGEST_CHUNK_SIZE = int(os.environ.get("INGEST_CHUNK_SIZE", "1000"))
+FEED_URL = os.environ.get(
+    "FEED_URL", "https://ahmednurmahamud.github.io/Recruitment_System/Recruitment_system.json"
+)
+FEED_READ_BYTES = int(os.environ.get("FEED_READ_BYTES", "65536"))  # Read size when streaming a feed
@@ -1,14 +1,13 @@
 from flask import Flask, request, jsonify
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
+from db_connection import Session
+from table_versions import bump_table_version
 from models import JobPostingsRaw
 from uuid import uuid4
 from datetime import datetime
 
 # Setup
 app = Flask(__name__)
-engine = create_engine("sqlite:///candidate_profiles.db")
-Session = sessionmaker(bind=engine)
 
 # Create (Insert) a Job Posting
 @app.route("/job_postings", methods=["POST"])
@@ -38,6 +37,7 @@ def create_job_posting():
         )
 
         session.add(new_job)
+        bump_table_version(session, "job_postings_raw")
         session.commit()
         return jsonify({"message": "✅ Job posting created successfully!"}), 201
     except Exception as e:
@@ -93,6 +93,7 @@ def update_job_posting(job_id):
                 setattr(job, key, value)
 
         job.load_date = datetime.utcnow()
+        bump_table_version(session, "job_postings_raw")
         session.commit()
         return jsonify({"message": "✅ Job posting updated successfully."})
     except Exception as e:
@@ -111,6 +112,7 @@ def delete_job_posting(job_id):
             return jsonify({"error": "Job posting not found."}), 404
 
         session.delete(job)
+        bump_table_version(session, "job_postings_raw")
         session.commit()
         return jsonify({"message": "✅ Job posting deleted successfully."})
     except Exception as e:
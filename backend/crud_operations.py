@@ -9,18 +9,45 @@ from sqlalchemy.orm import Session
 from db_connection import get_engine, get_session
 from models import CandidateProfilesJoined
 from audit_log import log_audit
+from profile_text import MATCH_TEXT_FIELDS, build_match_text, hash_match_text
+from search_index import SEARCH_JOIN, build_match_query
+from table_versions import bump_table_version
 
 def record_exists(session, record_id):
     """Check if a record with record_id exists."""
     result = session.query(CandidateProfilesJoined).filter_by(record_id=record_id).first()
     return result is not None
 
+def refresh_match_text(session, record_id):
+    """Recompute the stored match_text and its hash for one record."""
+    row = session.execute(
+        text(f"SELECT {', '.join(MATCH_TEXT_FIELDS)} FROM candidate_profiles_joined WHERE record_id = :record_id"),
+        {"record_id": record_id}
+    ).mappings().first()
+    if row is None:
+        return
+    match_text = build_match_text(row)
+    session.execute(text("""
+    UPDATE candidate_profiles_joined
+    SET match_text = :match_text, match_text_hash = :match_text_hash
+    WHERE record_id = :record_id
+    """), {"match_text": match_text, "match_text_hash": hash_match_text(match_text), "record_id": record_id})
+
 def insert_candidate(session, person_id, name, country_code, city, url, position, about,
                      total_experience_years, experiences, degrees, certifications, languages, courses):
-    """Insert a new candidate."""
+    """Insert a new candidate; returns its record_id, or None if the insert failed."""
     try:
         new_record_id = str(uuid4())
         load_date = datetime.now()
+        match_text = build_match_text({
+            "about": about,
+            "experiences": experiences,
+            "degrees": degrees,
+            "certifications": certifications,
+            "languages": languages,
+            "courses": courses,
+            "city": city
+        })
 
         new_candidate = CandidateProfilesJoined(
             record_id=new_record_id,
@@ -37,13 +64,17 @@ def insert_candidate(session, person_id, name, country_code, city, url, position
             certifications=certifications,
             languages=languages,
             courses=courses,
-            load_date=load_date
+            load_date=load_date,
+            match_text=match_text,
+            match_text_hash=hash_match_text(match_text)
         )
 
         session.add(new_candidate)
+        bump_table_version(session, "candidate_profiles_joined")
         session.commit()
         log_audit(new_record_id, "INSERT", "SUCCESS")
         print(f"✅ Inserted new candidate: {name}")
+        return new_record_id
 
     except Exception as e:
         session.rollback()
@@ -51,21 +82,20 @@ def insert_candidate(session, person_id, name, country_code, city, url, position
         print(f"❌ Error inserting candidate: {e}")
 
 def search_candidates(session, search_term=None, min_experience_years=None):
-    """Search candidates by name, city, position, experiences, and/or minimum experience years."""
+    """Search candidates by name, city, position, experiences, about, and/or minimum experience years."""
     try:
         where_clauses = []
         params = {}
+        search_join = ""
 
-        # Add search by text
-        if search_term:
-            search_term = f"%{search_term.lower()}%"
-            where_clauses.append("""(
-                LOWER(name) LIKE :search_term
-             OR LOWER(city) LIKE :search_term
-             OR LOWER(position) LIKE :search_term
-             OR LOWER(experiences) LIKE :search_term
-            )""")
-            params['search_term'] = search_term
+        # Add full-text search (prefix words, "quoted phrases")
+        fts_query = build_match_query(search_term) if search_term else None
+        if fts_query:
+            search_join = SEARCH_JOIN
+            params['fts_query'] = fts_query
+        elif search_term and search_term.strip():
+            # Only punctuation/operators (e.g. "++"): nothing can match
+            where_clauses.append("0")
 
         # Add filter by minimum experience years
         if min_experience_years is not None:
@@ -74,10 +104,10 @@ def search_candidates(session, search_term=None, min_experience_years=None):
 
         # Build the final WHERE clause
         where_sql = " AND ".join(where_clauses)
-        final_query = f"SELECT * FROM candidate_profiles_joined"
+        final_query = f"SELECT candidate_profiles_joined.* FROM candidate_profiles_joined{search_join}"
         if where_sql:
             final_query += f" WHERE {where_sql}"
-        final_query += " ORDER BY load_date DESC"
+        final_query += " ORDER BY search.search_rank ASC" if search_join else " ORDER BY load_date DESC"
 
         result = session.execute(text(final_query), params)
         rows = result.fetchall()
@@ -130,6 +160,8 @@ def update_candidate(session, record_id, new_name=None, new_city=None, new_posit
         """
 
         session.execute(text(update_query), {"record_id": record_id})
+        refresh_match_text(session, record_id)
+        bump_table_version(session, "candidate_profiles_joined")
         session.commit()
         log_audit(record_id, "UPDATE", "SUCCESS")
         print("✅ Candidate updated successfully.")
@@ -152,6 +184,7 @@ def delete_candidate(session, record_id):
         WHERE record_id = :record_id
         """)
         session.execute(delete_query, {"record_id": record_id})
+        bump_table_version(session, "candidate_profiles_joined")
         session.commit()
         log_audit(record_id, "DELETE", "SUCCESS")
         print("✅ Candidate deleted successfully.")
@@ -1,22 +1,41 @@
 # backend/data_fetching.py
 
+import argparse
+import hashlib
+import json
+from itertools import islice
+
 import requests
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from db_connection import get_engine, get_session
+
+import config
+from db_connection import begin_immediate, get_engine, get_session
 from models import Base, PersonRaw, ExperienceRaw, EducationRaw, CertificationsRaw, LanguagesRaw, CoursesRaw
 from audit_log import log_audit
+from migrations import upgrade
+from feed_stream import FeedNotModified, conditional_headers, response_validators, stream_feed
 
 def create_tables():
-    engine = get_engine()
-    Base.metadata.create_all(bind=engine)
+    # Migrations rather than create_all so older databases get new columns too
+    upgrade(get_engine())
     print("✅ Tables created.")
 
-def fetch_api_data():
-    url = "https://ahmednurmahamud.github.io/Recruitment_System/Recruitment_system.json"
+def fetch_api_data(url=None, validators=None):
+    """Fetch the whole feed. With saved validators the request is conditional
+    and None is returned when the feed is unchanged (304); validators is then
+    updated in place from the response."""
+    url = url or config.FEED_URL
     try:
-        response = requests.get(url, timeout=10)
+        response = requests.get(url, timeout=10, headers=conditional_headers(validators))
+        if response.status_code == 304:
+            log_audit("N/A", "API_FETCH", "NOT_MODIFIED")
+            print("✅ Feed not modified since last ingest.")
+            return None
         response.raise_for_status()
         data = response.json()
+        if validators is not None:
+            validators.update(response_validators(response))
         log_audit("N/A", "API_FETCH", "SUCCESS")
         print(f"✅ Fetched {len(data)} candidates from API.")
         return data
@@ -24,98 +43,300 @@ def fetch_api_data():
         log_audit("N/A", "API_FETCH", "FAILED", str(e))
         raise Exception(f"API fetch failed: {str(e)}")
 
-def normalize_and_insert(data):
-    session = get_session()
+PERSON_COLUMNS = ["person_id", "name", "country_code", "city", "url", "position", "current_company_name", "about", "content_hash"]
+
+# child table -> columns written per row (besides person_id)
+CHILD_COLUMNS = {
+    "experience_raw": ["title", "start_date", "end_date"],
+    "education_raw": ["degree"],
+    "certifications_raw": ["title"],
+    "languages_raw": ["title"],
+    "courses_raw": ["title"],
+}
+
+UPSERT_PERSON_SQL = text(f"""
+INSERT INTO person_raw ({', '.join(PERSON_COLUMNS)})
+VALUES ({', '.join(':' + c for c in PERSON_COLUMNS)})
+ON CONFLICT(person_id) DO UPDATE SET
+    {', '.join(f'{c} = excluded.{c}' for c in PERSON_COLUMNS[1:])}
+""")
+
+def normalize_person(person):
+    """Flatten one feed record into its person_raw row and child rows."""
+    person_id = person.get("linkedin_num_id")
+    person_row = {"person_id": person_id}
+    for column in PERSON_COLUMNS[1:-1]:
+        person_row[column] = person.get(column)
+
+    experiences = []
+    for exp in person.get("experience") or []:
+        for sub in exp.get("positions") or [exp]:
+            experiences.append({
+                "person_id": person_id,
+                "title": sub.get("title"),
+                "start_date": sub.get("start_date"),
+                "end_date": sub.get("end_date")
+            })
+
+    children = {
+        "experience_raw": experiences,
+        "education_raw": [
+            {"person_id": person_id, "degree": edu.get("degree")}
+            for edu in person.get("education") or []
+        ],
+        "certifications_raw": [
+            {"person_id": person_id, "title": cert.get("title")}
+            for cert in person.get("certifications") or []
+        ],
+        "languages_raw": [
+            {"person_id": person_id, "title": lang.get("title")}
+            for lang in person.get("languages") or []
+        ],
+        "courses_raw": [
+            {"person_id": person_id, "title": course.get("title")}
+            for course in person.get("courses") or []
+        ],
+    }
+    person_row["content_hash"] = hash_person(person_row, children)
+    return person_row, children
+
+def hash_person(person_row, children):
+    payload = json.dumps([person_row, children], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _stage_person_ids(conn, person_ids):
+    conn.execute(text("CREATE TEMP TABLE IF NOT EXISTS ingest_person_ids (person_id TEXT PRIMARY KEY)"))
+    conn.execute(text("DELETE FROM ingest_person_ids"))
+    if person_ids:
+        conn.execute(
+            text("INSERT INTO ingest_person_ids (person_id) VALUES (:person_id)"),
+            [{"person_id": person_id} for person_id in person_ids]
+        )
+
+def upsert_people(conn, people):
+    """Set-based upsert of normalized (person_row, children) pairs.
+
+    conn must already hold the write lock (begin_immediate), since the stored
+    hashes are read before anything is written.
+
+    Persons whose content_hash matches the stored one are left alone. The
+    rest go through INSERT ... ON CONFLICT DO UPDATE; their child tables are
+    replaced with one DELETE against a staged id list and one executemany.
+    A person repeated in the batch keeps its last occurrence.
+    Returns the person_ids that were written.
+    """
+    latest = {}
+    for person_row, children in people:
+        latest[person_row["person_id"]] = (person_row, children)
+    if not latest:
+        return []
+
+    _stage_person_ids(conn, list(latest))
+    stored_hashes = dict(conn.execute(text("""
+        SELECT p.person_id, p.content_hash
+        FROM person_raw p JOIN ingest_person_ids s ON s.person_id = p.person_id
+    """)).fetchall())
+    changed = {
+        person_id: entry for person_id, entry in latest.items()
+        if stored_hashes.get(person_id) != entry[0]["content_hash"]
+    }
+    if not changed:
+        return []
+    if len(changed) < len(latest):
+        _stage_person_ids(conn, list(changed))
+    latest = changed
+
+    conn.execute(UPSERT_PERSON_SQL, [person_row for person_row, _ in latest.values()])
+
+    for table, columns in CHILD_COLUMNS.items():
+        conn.execute(text(
+            f"DELETE FROM {table} WHERE person_id IN (SELECT person_id FROM ingest_person_ids)"
+        ))
+        rows = [row for _, children in latest.values() for row in children[table]]
+        if rows:
+            conn.execute(
+                text(f"INSERT INTO {table} (person_id, {', '.join(columns)}) "
+                     f"VALUES (:person_id, {', '.join(':' + c for c in columns)})"),
+                rows
+            )
+
+    return list(latest)
+
+def normalize_and_insert(data, chunk_size=config.INGEST_CHUNK_SIZE):
+    """Upsert a whole feed in one transaction; returns the changed person_ids."""
+    engine = get_engine()
+    changed = []
+    total = 0
+    skipped = 0
 
     try:
-        for person in data:
-            person_id = person.get("linkedin_num_id")
-
-            existing_person = session.query(PersonRaw).filter_by(person_id=person_id).first()
-
-            if existing_person:
-                existing_person.name = person.get("name")
-                existing_person.country_code = person.get("country_code")
-                existing_person.city = person.get("city")
-                existing_person.url = person.get("url")
-                existing_person.position = person.get("position")
-                existing_person.current_company_name = person.get("current_company_name")
-                existing_person.about = person.get("about")
-                print(f"🔄 Updated existing person: {person_id}")
-            else:
-                new_person = PersonRaw(
-                    person_id=person_id,
-                    name=person.get("name"),
-                    country_code=person.get("country_code"),
-                    city=person.get("city"),
-                    url=person.get("url"),
-                    position=person.get("position"),
-                    current_company_name=person.get("current_company_name"),
-                    about=person.get("about")
-                )
-                session.add(new_person)
-                print(f"➕ Inserted new person: {person_id}")
-
-            session.query(ExperienceRaw).filter_by(person_id=person_id).delete()
-            session.query(EducationRaw).filter_by(person_id=person_id).delete()
-            session.query(CertificationsRaw).filter_by(person_id=person_id).delete()
-            session.query(LanguagesRaw).filter_by(person_id=person_id).delete()
-            session.query(CoursesRaw).filter_by(person_id=person_id).delete()
-
-            for exp in person.get("experience") or []:
-                if exp.get("positions"):
-                    for sub in exp.get("positions"):
-                        session.add(ExperienceRaw(
-                            person_id=person_id,
-                            title=sub.get("title"),
-                            start_date=sub.get("start_date"),
-                            end_date=sub.get("end_date")
-                        ))
-                else:
-                    session.add(ExperienceRaw(
-                        person_id=person_id,
-                        title=exp.get("title"),
-                        start_date=exp.get("start_date"),
-                        end_date=exp.get("end_date")
-                    ))
-
-            for edu in person.get("education") or []:
-                session.add(EducationRaw(
-                    person_id=person_id,
-                    degree=edu.get("degree")
-                ))
-
-            for cert in person.get("certifications") or []:
-                session.add(CertificationsRaw(
-                    person_id=person_id,
-                    title=cert.get("title")
-                ))
-
-            for lang in person.get("languages") or []:
-                session.add(LanguagesRaw(
-                    person_id=person_id,
-                    title=lang.get("title")
-                ))
-
-            for course in person.get("courses") or []:
-                session.add(CoursesRaw(
-                    person_id=person_id,
-                    title=course.get("title")
-                ))
-
-        session.commit()
+        with engine.begin() as conn:
+            # Write lock up front: the hash SELECT precedes the UPSERT, and a
+            # deferred transaction would fail with SQLITE_BUSY_SNAPSHOT if
+            # another connection (e.g. the audit writer) commits in between
+            begin_immediate(conn)
+            for chunk in _chunks(data, chunk_size):
+                people = []
+                for person in chunk:
+                    if not person.get("linkedin_num_id"):
+                        skipped += 1
+                        continue
+                    people.append(normalize_person(person))
+                total += len(people)
+                changed += upsert_people(conn, people)
+
         log_audit("N/A", "DATA_UPSERT", "SUCCESS")
-        print("✅ Data upsert (insert/update) completed.")
+        if skipped:
+            print(f"⚠️ Skipped {skipped} records without linkedin_num_id")
+        print(f"✅ Data upsert (insert/update) completed: {len(changed)} of {total} persons changed.")
+        return changed
 
     except Exception as e:
-        session.rollback()
         log_audit("N/A", "DATA_UPSERT", "FAILED", str(e))
         raise Exception(f"Data upsert failed: {str(e)}")
 
-    finally:
-        session.close()
+def _get_records_done(conn, source):
+    row = conn.execute(
+        text("SELECT records_done FROM feed_ingest_state WHERE source = :source"),
+        {"source": source}
+    ).fetchone()
+    return row[0] if row else 0
+
+def _save_records_done(conn, source, records_done):
+    conn.execute(text("""
+        INSERT INTO feed_ingest_state (source, records_done, updated_at)
+        VALUES (:source, :records_done, CURRENT_TIMESTAMP)
+        ON CONFLICT(source) DO UPDATE SET
+            records_done = excluded.records_done,
+            updated_at = excluded.updated_at
+    """), {"source": source, "records_done": records_done})
+
+def get_feed_validators(conn, source):
+    row = conn.execute(
+        text("SELECT etag, last_modified FROM feed_state WHERE source = :source"),
+        {"source": source}
+    ).mappings().fetchone()
+    return dict(row) if row else {}
+
+def save_feed_validators(conn, source, validators):
+    conn.execute(text("""
+        INSERT INTO feed_state (source, etag, last_modified, updated_at)
+        VALUES (:source, :etag, :last_modified, CURRENT_TIMESTAMP)
+        ON CONFLICT(source) DO UPDATE SET
+            etag = excluded.etag,
+            last_modified = excluded.last_modified,
+            updated_at = excluded.updated_at
+    """), {"source": source, "etag": validators.get("etag"), "last_modified": validators.get("last_modified")})
+
+def ingest_feed(url=None, force=False):
+    """Conditionally fetch the whole feed and upsert the persons that changed.
+
+    Returns the changed person_ids, empty when the feed answered 304.
+    """
+    url = url or config.FEED_URL
+    engine = get_engine()
+    with engine.connect() as conn:
+        validators = {} if force else get_feed_validators(conn, url)
+
+    data = fetch_api_data(url, validators)
+    if data is None:
+        return []
+    changed = normalize_and_insert(data)
+    with engine.begin() as conn:
+        begin_immediate(conn)
+        save_feed_validators(conn, url, validators)
+    return changed
+
+def ingest_stream(source=None, chunk_size=config.INGEST_CHUNK_SIZE, resume=True, force=False):
+    """Stream the feed into the raw tables with bounded memory.
+
+    Records are parsed one at a time and committed every chunk_size records
+    together with the position reached, so an interrupted run picks up where
+    it stopped. Progress is cleared once the whole feed is in. A fresh run
+    against a URL is conditional on the validators of the last complete one.
+    Returns the person_ids changed by this run.
+    """
+    source = source or config.FEED_URL
+    engine = get_engine()
+    changed = []
+    skipped = 0
+
+    try:
+        with engine.connect() as conn:
+            records_done = _get_records_done(conn, source) if resume else 0
+            # A resumed run needs the body even if the feed has not changed
+            validators = {} if force or records_done else get_feed_validators(conn, source)
+        if records_done:
+            print(f"↪️ Resuming {source} after {records_done} records")
+
+        records = stream_feed(source, validators=validators)
+        for chunk in _chunks(islice(records, records_done, None), chunk_size):
+            people = []
+            for person in chunk:
+                if not person.get("linkedin_num_id"):
+                    skipped += 1
+                    continue
+                people.append(normalize_person(person))
+
+            with engine.begin() as conn:
+                begin_immediate(conn)  # See normalize_and_insert
+                changed += upsert_people(conn, people)
+                records_done += len(chunk)
+                _save_records_done(conn, source, records_done)
+            print(f"📦 Committed {records_done} records")
+
+        with engine.begin() as conn:
+            begin_immediate(conn)
+            conn.execute(text("DELETE FROM feed_ingest_state WHERE source = :source"), {"source": source})
+            if validators:
+                save_feed_validators(conn, source, validators)
+
+        log_audit("N/A", "DATA_STREAM_UPSERT", "SUCCESS")
+        if skipped:
+            print(f"⚠️ Skipped {skipped} records without linkedin_num_id")
+        print(f"✅ Streaming ingest completed: {len(changed)} persons changed in {records_done} records.")
+        return changed
+
+    except FeedNotModified:
+        log_audit("N/A", "DATA_STREAM_UPSERT", "NOT_MODIFIED")
+        print("✅ Feed not modified since last ingest.")
+        return []
+    except Exception as e:
+        log_audit("N/A", "DATA_STREAM_UPSERT", "FAILED", str(e))
+        raise Exception(f"Streaming ingest failed: {str(e)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the candidate feed into the raw tables")
+    parser.add_argument("--source", help="Feed URL, or a local JSON file with --stream (default: FEED_URL)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Parse and commit the feed incrementally instead of loading it whole")
+    parser.add_argument("--restart", action="store_true",
+                        help="With --stream, ignore progress saved by an interrupted run")
+    parser.add_argument("--force", action="store_true",
+                        help="Fetch the feed even if it reports no change since the last ingest")
+    parser.add_argument("--join", action="store_true",
+                        help="Afterwards update candidate_profiles_joined for the changed persons")
+    args = parser.parse_args()
 
-if __name__ == "__main__":
     create_tables()
-    data = fetch_api_data()
-    normalize_and_insert(data)
+    if args.stream:
+        changed = ingest_stream(args.source, resume=not args.restart, force=args.force)
+    else:
+        changed = ingest_feed(args.source, force=args.force)
+
+    if args.join:
+        from join_profiles import create_joined_profiles
+        create_joined_profiles(changed)
+
+if __name__ == "__main__":
+    main()
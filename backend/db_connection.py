@@ -1,9 +1,57 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
 
-DATABASE_URL = "sqlite:///recruitment.db"
+import config
 
-engine = create_engine(DATABASE_URL, echo=False)
+DATABASE_URL = config.DATABASE_URL
+
+def _is_memory_sqlite(url):
+    return url in ("sqlite://", "sqlite:///:memory:")
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {config.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA journal_mode = {config.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous = {config.SQLITE_SYNCHRONOUS}")
+    # Negative cache_size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size = -{config.SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size = {config.SQLITE_MMAP_SIZE}")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.close()
+
+def create_db_engine(url=None):
+    """Build an engine for url (default: config.DATABASE_URL) with the SQLite profile applied."""
+    url = url or config.DATABASE_URL
+
+    if not url.startswith("sqlite"):
+        return create_engine(url, echo=config.DB_ECHO, pool_pre_ping=True)
+
+    if _is_memory_sqlite(url):
+        # One shared connection, otherwise every checkout sees an empty database
+        return create_engine(
+            url,
+            echo=config.DB_ECHO,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool
+        )
+
+    engine = create_engine(
+        url,
+        echo=config.DB_ECHO,
+        # Connections are handed between the Flask threads and the executor
+        connect_args={
+            "check_same_thread": False,
+            "timeout": config.SQLITE_BUSY_TIMEOUT_MS / 1000
+        },
+        poolclass=QueuePool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW
+    )
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+engine = create_db_engine()
 Session = sessionmaker(bind=engine)
 
 def get_session():
@@ -11,3 +59,15 @@ def get_session():
 
 def get_engine():
     return engine
+
+def begin_immediate(conn):
+    """Open a real write transaction on a SQLite connection right away.
+
+    pysqlite only starts a transaction before INSERT/UPDATE/DELETE, so DDL
+    such as DROP TABLE or ALTER TABLE would otherwise autocommit one
+    statement at a time. Call first thing inside engine.begin().
+    """
+    if conn.dialect.name != "sqlite":
+        return
+    if not conn.connection.driver_connection.in_transaction:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
@@ -14,11 +14,11 @@
 
 # create_job_postings_table.py
 
-from sqlalchemy import create_engine
+from db_connection import get_engine
 from models import Base, JobPostingsRaw  # Import your Base and the specific model
 
 # Connect to the database
-engine = create_engine("sqlite:///candidate_profiles.db")
+engine = get_engine()
 
 # Create only the 'job_postings_raw' table
 Base.metadata.create_all(engine, tables=[JobPostingsRaw.__table__])
@@ -2,12 +2,22 @@
 # backend/export_profiles.py
 
 import argparse
+import gzip
 import json
 from pathlib import Path
 
+from sqlalchemy import Float, Integer, TIMESTAMP, select
+
+import config
 from db_connection import get_session
 from models import CandidateProfilesJoined
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
 FIELDS_TO_EXPORT = [
     "about",
     "experiences",
@@ -15,46 +25,129 @@ FIELDS_TO_EXPORT = [
     "certifications",
     "languages",
     "courses",
-    "skills",
 ]
 
+FORMATS = ["json", "jsonl", "jsonl.gz", "parquet"]
+
+EXPORT_COLUMNS = CandidateProfilesJoined.__table__.columns
+
+def parse_export_fields(value):
+    """--fields value -> column names, always led by record_id."""
+    fields = [field.strip() for field in value.split(",") if field.strip()] if value else FIELDS_TO_EXPORT
+    unknown = [field for field in fields if field not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return ["record_id"] + [field for field in fields if field != "record_id"]
+
+def iter_profile_batches(session, fields, batch_size=None):
+    """Yield lists of row dicts, fetched batch_size rows at a time."""
+    statement = select(*[EXPORT_COLUMNS[field] for field in fields]).execution_options(
+        yield_per=batch_size or config.EXPORT_BATCH_SIZE
+    )
+    for partition in session.execute(statement).partitions():
+        yield [dict(row._mapping) for row in partition]
+
+def _json_entry(row):
+    # None is exported as "" like the original JSON export
+    return {field: "" if value is None else value for field, value in row.items()}
+
+def _write_json(batches, out):
+    count = 0
+    with open(out, "w", encoding="utf-8") as handle:
+        handle.write("[")
+        for batch in batches:
+            for row in batch:
+                handle.write(",\n" if count else "\n")
+                handle.write(json.dumps(_json_entry(row), ensure_ascii=False, default=str))
+                count += 1
+        handle.write("\n]\n")
+    return count
+
+def _write_jsonl(batches, out, compress=False):
+    count = 0
+    opener = gzip.open if compress else open
+    with opener(out, "wt", encoding="utf-8") as handle:
+        for batch in batches:
+            handle.writelines(
+                json.dumps(_json_entry(row), ensure_ascii=False, default=str) + "\n" for row in batch
+            )
+            count += len(batch)
+    return count
+
+def _arrow_type(column):
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, TIMESTAMP):
+        return pa.timestamp("us")
+    return pa.string()
+
+def _write_parquet(batches, out, fields):
+    if pa is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    schema = pa.schema([(field, _arrow_type(EXPORT_COLUMNS[field])) for field in fields])
+    count = 0
+    with pq.ParquetWriter(out, schema, compression="zstd") as writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
+
+def export_profiles(out, fmt="json", fields=None, batch_size=None):
+    """Stream candidate_profiles_joined to out; returns the number of profiles written."""
+    fields = fields or parse_export_fields(None)
+    session = get_session()
+    try:
+        batches = iter_profile_batches(session, fields, batch_size)
+        if fmt == "json":
+            return _write_json(batches, out)
+        if fmt in ("jsonl", "jsonl.gz"):
+            return _write_jsonl(batches, out, compress=fmt == "jsonl.gz")
+        if fmt == "parquet":
+            return _write_parquet(batches, out, fields)
+        raise ValueError(f"Unknown format: {fmt}")
+    finally:
+        session.close()
+
 def main():
     parser = argparse.ArgumentParser(
-        description="Export select candidate profile fields as JSON"
+        description="Export candidate profile fields as JSON, JSON Lines, gzip JSON Lines or Parquet"
     )
     parser.add_argument(
         "--out", type=Path,
-        default=Path("candidate_profiles_export.json"),
-        help="Output JSON file path"
+        help="Output file path (default: candidate_profiles_export.<format>)"
+    )
+    parser.add_argument(
+        "--format", choices=FORMATS, default="json",
+        help="Output format; parquet needs pyarrow"
+    )
+    parser.add_argument(
+        "--fields",
+        help=f"Comma-separated columns to export besides record_id (default: {','.join(FIELDS_TO_EXPORT)})"
+    )
+    parser.add_argument(
+        "--batch-size", type=int,
+        help=f"Rows fetched per round trip (default: {config.EXPORT_BATCH_SIZE})"
     )
     args = parser.parse_args()
 
-    session = get_session()
     try:
-        profiles = session.query(CandidateProfilesJoined).all()
-        if not profiles:
+        fields = parse_export_fields(args.fields)
+    except ValueError as e:
+        parser.error(str(e))
+    out = args.out or Path(f"candidate_profiles_export.{args.format}")
+
+    try:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        count = export_profiles(out, args.format, fields, args.batch_size)
+        if not count:
             print("⚠️ No candidate profiles found.")
             return
-
-        result = []
-        for p in profiles:
-            entry = {"record_id": p.record_id}
-            for field in FIELDS_TO_EXPORT:
-                # if the attribute exists and is not None/empty, else empty string
-                entry[field] = getattr(p, field) or ""
-            result.append(entry)
-
-        args.out.parent.mkdir(parents=True, exist_ok=True)
-        args.out.write_text(
-            json.dumps(result, ensure_ascii=False, indent=2),
-            encoding="utf-8"
-        )
-        print(f"✅ Exported {len(result)} profiles to {args.out}")
+        print(f"✅ Exported {count} profiles to {out}")
 
     except Exception as e:
         print(f"❌ Error during export: {e}")
-    finally:
-        session.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,143 @@
+# backend/feed_stream.py
+
+import codecs
+import json
+
+import requests
+
+import config
+
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = set("0123456789+-.eE")
+
+class FeedNotModified(Exception):
+    """The feed answered a conditional request with 304 Not Modified."""
+
+def conditional_headers(validators):
+    """If-None-Match / If-Modified-Since headers from saved feed validators."""
+    headers = {}
+    if validators and validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators and validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+def response_validators(response):
+    return {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+def iter_json_array(chunks):
+    """Yield the elements of a top-level JSON array read from text chunks.
+
+    Only the unread tail of the buffer is kept, so memory depends on the
+    largest record rather than on the size of the feed.
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+
+    def read_more():
+        nonlocal buffer, pos
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_token():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not read_more():
+                return ""
+
+    if next_token() != "[":
+        raise ValueError("Feed must be a JSON array")
+    pos += 1
+    if next_token() == "]":
+        return
+
+    while True:
+        if not next_token():
+            raise ValueError("Feed ended before the closing ']'")
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not read_more():
+                    raise
+                continue
+            # A number may continue in the next chunk: "1500" then "." then "0"
+            if _number_may_continue(item, buffer, end) and read_more():
+                continue
+            break
+
+        yield item
+        pos = end
+
+        token = next_token()
+        if not token:
+            raise ValueError("Feed ended before the closing ']'")
+        if token == "]":
+            return
+        if token != ",":
+            raise ValueError(f"Expected ',' or ']' in feed, got {token[:1]!r}")
+        pos += 1
+
+def _number_may_continue(item, buffer, end):
+    """True if the decoded value could be the prefix of a longer number."""
+    if end == len(buffer):
+        return True
+    if isinstance(item, bool) or not isinstance(item, (int, float)):
+        return False
+    return set(buffer[end:]) <= _NUMBER_CHARS
+
+def _decode_chunks(byte_chunks):
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    for chunk in byte_chunks:
+        text_chunk = decoder.decode(chunk)
+        if text_chunk:
+            yield text_chunk
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+def _file_chunks(path, read_bytes):
+    with open(path, "rb") as handle:
+        while True:
+            chunk = handle.read(read_bytes)
+            if not chunk:
+                return
+            yield chunk
+
+def _http_chunks(url, read_bytes, validators):
+    headers = conditional_headers(validators)
+    with requests.get(url, stream=True, timeout=10, headers=headers) as response:
+        if response.status_code == 304:
+            raise FeedNotModified(url)
+        response.raise_for_status()
+        if validators is not None:
+            validators.update(response_validators(response))
+        yield from response.iter_content(chunk_size=read_bytes)
+
+def stream_feed(source=None, read_bytes=None, validators=None):
+    """Yield feed records one at a time from an http(s) URL or a local file.
+
+    For URLs, validators (etag/last_modified from a previous run) make the
+    request conditional: FeedNotModified is raised on 304, otherwise the dict
+    is updated in place with the new response's validators.
+    """
+    source = source or config.FEED_URL
+    read_bytes = read_bytes or config.FEED_READ_BYTES
+    if source.startswith(("http://", "https://")):
+        byte_chunks = _http_chunks(source, read_bytes, validators)
+    else:
+        byte_chunks = _file_chunks(source, read_bytes)
+    return iter_json_array(_decode_chunks(byte_chunks))
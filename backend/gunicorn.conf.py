@@ -0,0 +1,33 @@
+# backend/gunicorn.conf.py
+#
+# gunicorn -c gunicorn.conf.py wsgi:app
+#
+# preload_app imports wsgi.py in the master, so the spaCy pipelines and the
+# SentenceTransformer are loaded once and every worker is forked with them
+# already in memory. The pages stay shared copy-on-write until a worker
+# writes to them, so N workers cost roughly one copy of the weights.
+# Sizing: WEB_WORKERS, WEB_THREADS, WEB_TIMEOUT, WEB_BIND and
+# RECOMMENDATION_WORKERS in config.py.
+
+import gc
+
+# Not "config": gunicorn reads module-level names here as its own settings
+import config as backend_config
+
+bind = backend_config.WEB_BIND
+workers = backend_config.WEB_WORKERS
+worker_class = "gthread"
+threads = backend_config.WEB_THREADS
+timeout = backend_config.WEB_TIMEOUT
+preload_app = True
+
+def when_ready(server):
+    # Runs in the master after the preload. Frozen objects are skipped by the
+    # cyclic GC, which would otherwise touch (and so copy) their pages in
+    # every worker.
+    gc.freeze()
+
+def post_fork(server, worker):
+    # Pooled connections opened in the master must not be shared with workers
+    from db_connection import get_engine
+    get_engine().dispose(close=False)
@@ -1,95 +1,265 @@
 # backend/join_profiles.py
 
+import argparse
 import pandas as pd
-import hashlib
 from datetime import datetime
-from sqlalchemy import create_engine
-from db_connection import get_engine, get_session
-from models import PersonRaw, ExperienceRaw, EducationRaw, CertificationsRaw, LanguagesRaw, CoursesRaw
+from sqlalchemy import Column, MetaData, Table, create_engine, text
+import config
+from db_connection import begin_immediate, get_engine, get_session
+from models import CandidateProfilesJoined, PersonRaw, ExperienceRaw, EducationRaw, CertificationsRaw, LanguagesRaw, CoursesRaw
 from audit_log import log_audit
+from migrations import create_joined_profile_indexes, table_exists
+from search_index import create_search_index
+from table_versions import bump_table_version
+from profile_text import (
+    MATCH_TEXT_FIELDS, PROFILE_CONTENT_FIELDS, build_match_texts, clean_text, hash_match_text,
+    hash_profile_content, hash_profile_contents, stable_record_id
+)
 
-def sha256_hash(row):
-    """Generate SHA256 hash of concatenated row values."""
-    concat_string = "||".join(str(v) if v is not None else "" for v in row)
-    return hashlib.sha256(concat_string.encode('utf-8')).hexdigest()
+RAW_TABLES = ['person_raw', 'experience_raw', 'education_raw', 'certifications_raw', 'languages_raw', 'courses_raw']
+
+JOINED_COLUMNS = [
+    'record_id', 'person_id', 'name', 'country_code', 'city', 'url', 'position', 'about',
+    'total_experience_years', 'experiences', 'degrees', 'certifications', 'languages', 'courses',
+    'load_date', 'match_text', 'match_text_hash', 'content_hash'
+]
+
+# The feed writes "Aug 2024" or "2010"; "Present" and blanks stay NaT (ongoing)
+FEED_DATE_FORMATS = ["%b %Y", "%Y"]
+
+def parse_feed_dates(values):
+    """Parse feed date strings with explicit formats, vectorized per format."""
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    for date_format in FEED_DATE_FORMATS:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(values[missing], format=date_format, errors='coerce')
+
+    # Anything else (rare) goes through the slow per-element parser
+    leftover = parsed.isna() & values.notna() & (values != 'Present')
+    if leftover.any():
+        parsed[leftover] = pd.to_datetime(values[leftover], format='mixed', errors='coerce')
+    return parsed
+
+def aggregate_titles(df, column, alias):
+    """Comma-join a child column per person, keeping row order.
+
+    Persons whose values are all null get ''. Summing the values with the
+    separator appended stays in pandas; agg(", ".join) and groupby().apply
+    call back into Python for every person.
+    """
+    values = df.dropna(subset=[column])
+    joined = (values[column] + ", ").groupby(values['person_id'], sort=False).sum().str[:-2]
+    person_ids = df['person_id'].dropna().drop_duplicates()
+    return pd.DataFrame({
+        'person_id': person_ids.to_numpy(),
+        alias: joined.reindex(person_ids).fillna('').to_numpy(dtype=object),
+    }).astype({'person_id': df['person_id'].dtype})
+
+def _stage_join_person_ids(conn, person_ids):
+    conn.execute(text("CREATE TEMP TABLE IF NOT EXISTS join_person_ids (person_id TEXT PRIMARY KEY)"))
+    conn.execute(text("DELETE FROM join_person_ids"))
+    conn.execute(
+        text("INSERT OR IGNORE INTO join_person_ids (person_id) VALUES (:person_id)"),
+        [{"person_id": person_id} for person_id in person_ids]
+    )
+
+def _upsert_clause():
+    """ON CONFLICT clause that only rewrites rows whose content changed (load_date included)."""
+    updates = ", ".join(f"{column} = excluded.{column}" for column in JOINED_COLUMNS if column != 'record_id')
+    return f"""ON CONFLICT(record_id) DO UPDATE SET {updates}
+    WHERE candidate_profiles_joined.content_hash IS NOT excluded.content_hash"""
+
+UPSERT_JOINED_SQL = f"""
+INSERT INTO candidate_profiles_joined ({', '.join(JOINED_COLUMNS)})
+VALUES ({', '.join(':' + column for column in JOINED_COLUMNS)})
+{_upsert_clause()}
+"""
+
+# Feed-derived joined rows of staged persons that have left person_raw. Rows
+# created through the API have a random record_id and no raw rows; keep them.
+# Needs register_sql_functions for record_id().
+DELETE_GONE_PERSONS_SQL = """
+DELETE FROM candidate_profiles_joined
+WHERE person_id IN (SELECT person_id FROM join_person_ids)
+  AND person_id NOT IN (SELECT person_id FROM person_raw)
+  AND record_id = record_id(person_id)
+"""
+
+def load_raw_tables(conn, person_ids=None):
+    """Read the raw tables, or only the rows of the given persons."""
+    if person_ids is None:
+        return {table: pd.read_sql_table(table, conn) for table in RAW_TABLES}
+
+    _stage_join_person_ids(conn, person_ids)
+    return {
+        table: pd.read_sql(
+            text(f"SELECT * FROM {table} WHERE person_id IN (SELECT person_id FROM join_person_ids)"), conn
+        )
+        for table in RAW_TABLES
+    }
+
+def build_profiles(raw):
+    """Aggregate the raw tables into candidate_profiles_joined rows."""
+    person_df = raw['person_raw']
+    experience_df = raw['experience_raw']
+    education_df = raw['education_raw']
+    certifications_df = raw['certifications_raw']
+    languages_df = raw['languages_raw']
+    courses_df = raw['courses_raw']
+
+    # 1. Calculate total experience years
+    experience_df['start_date'] = parse_feed_dates(experience_df['start_date'])
+    experience_df['end_date'] = parse_feed_dates(experience_df['end_date'])
+    experience_df['end_date'] = experience_df['end_date'].fillna(pd.Timestamp.today())
+
+    experience_df = experience_df.dropna(subset=['start_date', 'end_date'])
+    experience_df['months'] = (experience_df['end_date'] - experience_df['start_date']).dt.days / 30
+    exp_sum = experience_df.groupby('person_id')['months'].sum().reset_index()
+    exp_sum['total_experience_years'] = (exp_sum['months'] / 12).astype(int)
+    exp_sum = exp_sum[['person_id', 'total_experience_years']]
+
+    # 2. Aggregate experience titles, degrees, certifications, languages, courses
+    agg_exp = aggregate_titles(experience_df, 'title', 'experiences')
+    agg_edu = aggregate_titles(education_df, 'degree', 'degrees')
+    agg_cert = aggregate_titles(certifications_df, 'title', 'certifications')
+    agg_lang = aggregate_titles(languages_df, 'title', 'languages')
+    agg_course = aggregate_titles(courses_df, 'title', 'courses')
+
+    # 3. Join all information
+    profile = person_df.merge(exp_sum, on='person_id', how='left') \
+                       .merge(agg_exp, on='person_id', how='left') \
+                       .merge(agg_edu, on='person_id', how='left') \
+                       .merge(agg_cert, on='person_id', how='left') \
+                       .merge(agg_lang, on='person_id', how='left') \
+                       .merge(agg_course, on='person_id', how='left')
+
+    # Local computer time
+    profile['load_date'] = datetime.now()
+
+    # 4. Stable record_id from person_id, content hash for change detection
+    profile['record_id'] = profile['person_id'].map(stable_record_id)
+    profile['content_hash'] = hash_profile_contents(profile)
+
+    # 5. Precompute the normalized text the matcher reads
+    profile['match_text'] = build_match_texts(profile)
+    profile['match_text_hash'] = profile['match_text'].map(hash_match_text)
+
+    # 6. Reorder columns
+    return profile[JOINED_COLUMNS]
+
+# --- Full rebuilds go through a shadow table that is renamed into place ---
+
+SHADOW_TABLE = 'candidate_profiles_joined_shadow'
+
+def insert_chunk_size():
+    """Rows per multi-row INSERT: every row binds one variable per joined column."""
+    return max(1, min(config.JOIN_INSERT_CHUNK_SIZE, config.SQLITE_MAX_VARIABLES // len(JOINED_COLUMNS)))
+
+def create_shadow_table(conn):
+    """Create an empty shadow table with the live table's columns and key.
+
+    Secondary indexes are left out: they are created under their canonical
+    names once the shadow table has been renamed.
+    """
+    conn.execute(text(f"DROP TABLE IF EXISTS {SHADOW_TABLE}"))  # Leftover of a failed run
+    shadow = Table(SHADOW_TABLE, MetaData(), *[
+        Column(column.name, column.type, primary_key=column.primary_key)
+        for column in CandidateProfilesJoined.__table__.columns
+    ])
+    shadow.create(bind=conn)
+
+def validate_shadow_table(conn, expected_rows):
+    """Refuse to swap in a shadow table that is empty, short or has keyless rows."""
+    count = conn.execute(text(f"SELECT COUNT(*) FROM {SHADOW_TABLE}")).scalar()
+    if not count:
+        raise Exception("Validation failed: candidate_profiles_joined is empty.")
+    if count != expected_rows:
+        raise Exception(f"Validation failed: wrote {count} rows, expected {expected_rows}.")
+    missing_keys = conn.execute(text(
+        f"SELECT COUNT(*) FROM {SHADOW_TABLE} WHERE record_id IS NULL OR person_id IS NULL"
+    )).scalar()
+    if missing_keys:
+        raise Exception(f"Validation failed: {missing_keys} rows without record_id or person_id.")
+
+def swap_in_shadow_table(conn):
+    """Replace the live table with the shadow table inside the caller's transaction.
+
+    The caller opens it with begin_immediate so the DROP and RENAME commit
+    together; readers keep seeing the old table until then.
+    """
+    conn.execute(text("DROP TABLE IF EXISTS candidate_profiles_joined"))
+    conn.execute(text(f"ALTER TABLE {SHADOW_TABLE} RENAME TO candidate_profiles_joined"))
+    create_joined_profile_indexes(conn)
+    create_search_index(conn)  # Recreates the triggers and reindexes the new rows
+    bump_table_version(conn, "candidate_profiles_joined")
+
+def create_joined_profiles(person_ids=None, backend=None):
+    """Rebuild candidate_profiles_joined.
+
+    With person_ids only those persons are re-aggregated and their joined
+    rows replaced; rows of other persons (including candidates added through
+    the API) are left alone. Without them, or while the joined table is
+    still empty, the whole table is rebuilt from the raw tables.
+    backend is "pandas" or "sql" (default: config.JOIN_BACKEND).
+
+    Returns the number of joined rows written (inserted or updated) on every
+    path: all rows for a full rebuild, only the changed ones for an
+    incremental update. Rows deleted for persons who left the feed are not
+    counted.
+    """
+    backend = backend or config.JOIN_BACKEND
+    if backend not in ("pandas", "sql"):
+        raise ValueError(f"Unknown join backend: {backend}")
+
+    if person_ids is not None:
+        engine = get_engine()
+        with engine.connect() as conn:
+            populated = table_exists(conn, 'candidate_profiles_joined') and conn.execute(
+                text("SELECT 1 FROM candidate_profiles_joined LIMIT 1")
+            ).first() is not None
+        if populated:
+            if backend == "sql":
+                return update_joined_profiles_sql(person_ids)
+            return update_joined_profiles(person_ids)
+        print("ℹ️ candidate_profiles_joined is empty, running a full rebuild.")
+
+    if backend == "sql":
+        return create_joined_profiles_sql()
 
-def create_joined_profiles():
     session = get_session()
 
     try:
         # 1. Load normalized tables into DataFrames
-        person_df = pd.read_sql_table('person_raw', session.bind)
-        experience_df = pd.read_sql_table('experience_raw', session.bind)
-        education_df = pd.read_sql_table('education_raw', session.bind)
-        certifications_df = pd.read_sql_table('certifications_raw', session.bind)
-        languages_df = pd.read_sql_table('languages_raw', session.bind)
-        courses_df = pd.read_sql_table('courses_raw', session.bind)
+        raw = load_raw_tables(session.bind)
         log_audit("N/A", "LOAD_NORMALIZED_TABLES", "SUCCESS")
 
-        # 2. Calculate total experience years
-        experience_df['start_date'] = pd.to_datetime(experience_df['start_date'], errors='coerce')
-        experience_df['end_date'] = pd.to_datetime(experience_df['end_date'], errors='coerce')
-        experience_df['end_date'] = experience_df['end_date'].fillna(pd.Timestamp.today())
-
-        experience_df = experience_df.dropna(subset=['start_date', 'end_date'])
-        experience_df['months'] = (experience_df['end_date'] - experience_df['start_date']).dt.days / 30
-        exp_sum = experience_df.groupby('person_id')['months'].sum().reset_index()
-        exp_sum['total_experience_years'] = (exp_sum['months'] / 12).astype(int)
-        exp_sum = exp_sum[['person_id', 'total_experience_years']]
-
-        # 3. Aggregate experience titles, degrees, certifications, languages, courses
-        def aggregate(df, column, alias):
-            return df.groupby('person_id')[column].apply(lambda x: ", ".join(x.dropna())).reset_index(name=alias)
-
-        agg_exp = aggregate(experience_df, 'title', 'experiences')
-        agg_edu = aggregate(education_df, 'degree', 'degrees')
-        agg_cert = aggregate(certifications_df, 'title', 'certifications')
-        agg_lang = aggregate(languages_df, 'title', 'languages')
-        agg_course = aggregate(courses_df, 'title', 'courses')
-
-        # 4. Join all information
-        profile = person_df.merge(exp_sum, on='person_id', how='left') \
-                           .merge(agg_exp, on='person_id', how='left') \
-                           .merge(agg_edu, on='person_id', how='left') \
-                           .merge(agg_cert, on='person_id', how='left') \
-                           .merge(agg_lang, on='person_id', how='left') \
-                           .merge(agg_course, on='person_id', how='left')
-
-        # Local computer time
-        profile['load_date'] = datetime.now()
-
-        # 5. Calculate record_id
-        profile['record_id'] = profile.apply(lambda row: sha256_hash(row.values), axis=1)
-
-        # 6. Reorder columns
-        profile = profile[[
-            'record_id', 'person_id', 'name', 'country_code', 'city', 'url', 'position', 'about',
-            'total_experience_years', 'experiences', 'degrees', 'certifications', 'languages', 'courses',
-            'load_date'
-        ]]
+        # 2. Aggregate and join
+        profile = build_profiles(raw)
 
         log_audit("N/A", "JOIN_TRANSFORM", "SUCCESS")
         print("✅ Profile table joined successfully.")
 
-        # 7. Save to SQLite
+        # 3. Bulk load a shadow table; the live table keeps serving meanwhile
         engine = get_engine()
-        profile.to_sql('candidate_profiles_joined', engine, if_exists='replace', index=False)
-        log_audit("N/A", "SAVE_JOINED_TABLE", "SUCCESS")
-        print("✅ candidate_profiles_joined saved to database.")
+        with engine.begin() as conn:
+            create_shadow_table(conn)
+            profile.to_sql(SHADOW_TABLE, conn, if_exists='append', index=False,
+                           chunksize=insert_chunk_size(), method='multi')
 
-        # 8. Validate table
-        if profile.empty:
-            raise Exception("Validation failed: candidate_profiles_joined is empty.")
-        expected_cols = [
-            'record_id', 'person_id', 'name', 'country_code', 'city', 'url',
-            'position', 'about', 'total_experience_years',
-            'experiences', 'degrees', 'certifications', 'languages', 'courses', 'load_date'
-        ]
-        for col in expected_cols:
-            if col not in profile.columns:
-                raise Exception(f"Validation failed: missing column {col}")
+        # 4. Validate the shadow table, then swap it in
+        with engine.begin() as conn:
+            begin_immediate(conn)
+            validate_shadow_table(conn, expected_rows=len(profile))
+            print("✅ Validation passed: candidate_profiles_joined is valid.")
+            swap_in_shadow_table(conn)
+        # Audited only after the commit: a synchronous audit write from its own
+        # connection would wait on the write lock held above
         log_audit("N/A", "VALIDATION_JOINED_TABLE", "SUCCESS")
-        print("✅ Validation passed: candidate_profiles_joined is valid.")
+        log_audit("N/A", "SAVE_JOINED_TABLE", "SUCCESS")
+        print("✅ candidate_profiles_joined saved to database.")
+        return len(profile)
 
     except Exception as e:
         session.rollback()
@@ -99,5 +269,211 @@ def create_joined_profiles():
     finally:
         session.close()
 
+def update_joined_profiles(person_ids):
+    """Re-aggregate only the given persons and upsert their joined rows.
+
+    Rows are keyed by the stable record_id; a row whose content_hash did not
+    change is left as is (load_date included). Persons no longer in
+    person_raw lose their joined rows. The search index follows through its
+    triggers. Returns the number of rows inserted or updated.
+    """
+    person_ids = list(dict.fromkeys(person_ids))
+    if not person_ids:
+        print("✅ No changed persons, candidate_profiles_joined left as is.")
+        return 0
+
+    engine = get_engine()
+    try:
+        with engine.begin() as conn:
+            # Reads and the upsert share one transaction; taking the write
+            # lock first avoids SQLITE_BUSY_SNAPSHOT when another connection
+            # commits in between
+            begin_immediate(conn)
+            register_sql_functions(conn)
+            profile = build_profiles(load_raw_tables(conn, person_ids))
+            written = 0
+            if not profile.empty:
+                profile['load_date'] = profile['load_date'].dt.strftime('%Y-%m-%d %H:%M:%S.%f')
+                rows = profile.astype(object).where(profile.notna(), None).to_dict('records')
+                written = conn.execute(text(UPSERT_JOINED_SQL), rows).rowcount
+            conn.execute(text(DELETE_GONE_PERSONS_SQL))
+            bump_table_version(conn, "candidate_profiles_joined")
+
+        log_audit("N/A", "JOIN_INCREMENTAL", "SUCCESS")
+        print(f"✅ candidate_profiles_joined updated for {len(person_ids)} persons ({written} rows written).")
+        return written
+
+    except Exception as e:
+        log_audit("N/A", "JOIN_INCREMENTAL", "FAILED", str(e))
+        raise Exception(f"Error during incremental join: {e}")
+
+# --- SQL backend: the same transform as build_profiles, run inside SQLite ---
+
+_MONTHS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+
+def parse_feed_date(value):
+    """parse_feed_dates for one value, as text julianday() reads, or None."""
+    parsed = parse_feed_dates(pd.Series([value], dtype=object)).iloc[0]
+    return None if pd.isna(parsed) else parsed.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+def _feed_date_sql(column):
+    """SQL for parse_feed_dates: "Aug 2024" / "2010" inline, anything else through feed_date()."""
+    months = " ".join(f"WHEN '{name}' THEN '{number:02d}'" for number, name in enumerate(_MONTHS, 1))
+    month_names = ", ".join(f"'{name}'" for name in _MONTHS)
+    return f"""CASE
+        WHEN {column} IS NULL OR {column} = 'Present' THEN NULL
+        WHEN upper({column}) GLOB '[A-Z][A-Z][A-Z] [0-9][0-9][0-9][0-9]'
+             AND upper(substr({column}, 1, 3)) IN ({month_names})
+            THEN substr({column}, 5, 4) || '-' || (CASE upper(substr({column}, 1, 3)) {months} END) || '-01'
+        WHEN {column} GLOB '[0-9][0-9][0-9][0-9]' THEN {column} || '-01-01'
+        ELSE feed_date({column})
+    END"""
+
+def _joined_profiles_sql(target, staged_only=False, upsert=False):
+    """INSERT ... SELECT building candidate_profiles_joined rows into target.
+
+    With upsert the rows are merged into the live table by record_id.
+    """
+    person_filter = "WHERE person_id IN (SELECT person_id FROM join_person_ids)" if staged_only else ""
+    # "WHERE true" keeps SQLite from reading ON CONFLICT as part of a join
+    conflict_sql = "WHERE true " + _upsert_clause() if upsert else ""
+
+    def titles(table, column, alias):
+        # Ordered by id so the comma-joined list follows feed order, like the pandas path
+        return f"""LEFT JOIN (
+            SELECT person_id, COALESCE(GROUP_CONCAT({column}, ', '), '') AS {alias}
+            FROM (SELECT person_id, {column} FROM {table} {person_filter} ORDER BY id)
+            GROUP BY person_id
+        ) {alias} ON {alias}.person_id = p.person_id"""
+
+    match_text_sql = " || ' ' || ".join(f"COALESCE({field}, '')" for field in MATCH_TEXT_FIELDS)
+    return f"""
+    WITH experience AS (
+        SELECT id, person_id, title,
+               julianday(COALESCE({_feed_date_sql('end_date')}, :today))
+                   - julianday({_feed_date_sql('start_date')}) AS span
+        FROM experience_raw {person_filter}
+    ),
+    experience_valid AS (
+        -- Whole days, floored like Timedelta.days; rows without a start date drop out
+        SELECT id, person_id, title,
+               CAST(span AS INTEGER) - (span < CAST(span AS INTEGER)) AS days
+        FROM experience WHERE span IS NOT NULL
+    ),
+    joined AS (
+        SELECT p.person_id, p.name, p.country_code, p.city, p.url, p.position, p.about,
+               years.total_experience_years, experiences.experiences, degrees.degrees,
+               certifications.certifications, languages.languages, courses.courses,
+               :load_date AS load_date
+        FROM (SELECT * FROM person_raw {person_filter}) p
+        LEFT JOIN (
+            -- Summing whole days first avoids float drift right at year boundaries
+            SELECT person_id, CAST(SUM(days) / 30.0 / 12 AS INTEGER) AS total_experience_years
+            FROM experience_valid GROUP BY person_id
+        ) years ON years.person_id = p.person_id
+        {titles('experience_valid', 'title', 'experiences')}
+        {titles('education_raw', 'degree', 'degrees')}
+        {titles('certifications_raw', 'title', 'certifications')}
+        {titles('languages_raw', 'title', 'languages')}
+        {titles('courses_raw', 'title', 'courses')}
+    ),
+    texts AS MATERIALIZED (
+        -- Materialized so clean_text runs once per row, not once per reference
+        SELECT *, clean_text({match_text_sql}) AS match_text FROM joined
+    )
+    INSERT INTO {target} ({', '.join(JOINED_COLUMNS)})
+    SELECT record_id(person_id),
+           person_id, name, country_code, city, url, position, about, total_experience_years,
+           experiences, degrees, certifications, languages, courses, load_date,
+           match_text, sha256(match_text), content_hash({', '.join(PROFILE_CONTENT_FIELDS)})
+    FROM texts
+    {conflict_sql}
+    """
+
+def register_sql_functions(conn):
+    """Expose the Python hashing/cleaning helpers to SQLite on this connection."""
+    dbapi_conn = conn.connection.driver_connection
+    dbapi_conn.create_function("clean_text", 1, clean_text, deterministic=True)
+    dbapi_conn.create_function("feed_date", 1, parse_feed_date, deterministic=True)
+    dbapi_conn.create_function("sha256", 1, hash_match_text, deterministic=True)
+    dbapi_conn.create_function("record_id", 1, stable_record_id, deterministic=True)
+    dbapi_conn.create_function("content_hash", -1, lambda *values: hash_profile_content(values), deterministic=True)
+
+def _sql_params():
+    now = datetime.now()
+    return {
+        "load_date": now.strftime("%Y-%m-%d %H:%M:%S.%f"),
+        "today": now.strftime("%Y-%m-%d %H:%M:%S.%f"),
+    }
+
+def create_joined_profiles_sql():
+    """Full rebuild with the aggregation done by SQLite (GROUP_CONCAT, SUM).
+
+    Nothing is loaded into DataFrames; one INSERT ... SELECT fills the shadow
+    table, which is then validated and swapped in. Returns the rows written.
+    """
+    engine = get_engine()
+    try:
+        with engine.begin() as conn:
+            # Count and build under one write lock, so an ingest committing
+            # in between cannot skew the expected row count
+            begin_immediate(conn)
+            register_sql_functions(conn)
+            count = conn.execute(text("SELECT COUNT(*) FROM person_raw")).scalar()
+            create_shadow_table(conn)
+            conn.execute(text(_joined_profiles_sql(SHADOW_TABLE)), _sql_params())
+            # rowcount is -1 for a statement starting with WITH
+            written = conn.execute(text("SELECT changes()")).scalar()
+
+        with engine.begin() as conn:
+            begin_immediate(conn)
+            validate_shadow_table(conn, expected_rows=count)
+            swap_in_shadow_table(conn)
+
+        log_audit("N/A", "SAVE_JOINED_TABLE", "SUCCESS")
+        print(f"✅ candidate_profiles_joined rebuilt in SQL ({written} rows).")
+        return written
+
+    except Exception as e:
+        log_audit("N/A", "JOIN_PROCESS_FAILED", "FAILED", str(e))
+        raise Exception(f"Error during join process: {e}")
+
+def update_joined_profiles_sql(person_ids):
+    """SQL-backend counterpart of update_joined_profiles; returns the rows written."""
+    person_ids = list(dict.fromkeys(person_ids))
+    if not person_ids:
+        print("✅ No changed persons, candidate_profiles_joined left as is.")
+        return 0
+
+    engine = get_engine()
+    try:
+        with engine.begin() as conn:
+            begin_immediate(conn)  # See update_joined_profiles
+            register_sql_functions(conn)
+            _stage_join_person_ids(conn, person_ids)
+            conn.execute(
+                text(_joined_profiles_sql("candidate_profiles_joined", staged_only=True, upsert=True)), _sql_params()
+            )
+            written = conn.execute(text("SELECT changes()")).scalar()
+            conn.execute(text(DELETE_GONE_PERSONS_SQL))
+            bump_table_version(conn, "candidate_profiles_joined")
+
+        log_audit("N/A", "JOIN_INCREMENTAL", "SUCCESS")
+        print(f"✅ candidate_profiles_joined updated for {len(person_ids)} persons ({written} rows written).")
+        return written
+
+    except Exception as e:
+        log_audit("N/A", "JOIN_INCREMENTAL", "FAILED", str(e))
+        raise Exception(f"Error during incremental join: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Build candidate_profiles_joined from the raw tables")
+    parser.add_argument("person_ids", nargs="*",
+                        help="Only re-aggregate these persons (default: full rebuild)")
+    parser.add_argument("--backend", choices=["pandas", "sql"],
+                        help="Aggregate with pandas or inside SQLite (default: JOIN_BACKEND)")
+    args = parser.parse_args()
+    create_joined_profiles(args.person_ids or None, backend=args.backend)
+
 if __name__ == "__main__":
-    create_joined_profiles()
+    main()
@@ -0,0 +1,48 @@
+# embedding_cache.py
+#
+# SentenceTransformer embeddings keyed by the SHA256 of the text they encode.
+# Joined profiles store that hash as match_text_hash, so a candidate whose
+# match_text has not changed is encoded once per process, not once per job.
+
+import threading
+from collections import OrderedDict
+
+from metrics import EMBEDDING_CACHE_LOOKUPS
+from profile_text import hash_match_text
+
+class EmbeddingCache:
+    """LRU of encode(text) results, at most max_size entries."""
+
+    def __init__(self, encode, max_size=10000):
+        self.encode = encode
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text, text_hash=None):
+        """encode(text), reusing the result stored under text_hash (hash_match_text(text) if not given)."""
+        key = text_hash or hash_match_text(text)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+        if embedding is not None:
+            EMBEDDING_CACHE_LOOKUPS.inc(result="hit")
+            return embedding
+
+        EMBEDDING_CACHE_LOOKUPS.inc(result="miss")
+        # Encoded outside the lock; two threads missing the same key both encode once
+        embedding = self.encode(text)
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return embedding
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,8 +1,6 @@
 from sqlalchemy import text
 from db_connection import get_session
-
-from sqlalchemy import text
-from db_connection import get_session
+from table_versions import bump_table_version
 
 def store_prediction(job_id, candidate_id, data):
     session = get_session()
@@ -16,6 +14,7 @@ def store_prediction(job_id, candidate_id, data):
             "candidate_id": candidate_id,
             "score": data["score"]
         })
+        bump_table_version(session, "recommendation_results")
         session.commit()
     except Exception as e:
         session.rollback()
@@ -24,6 +23,40 @@ def store_prediction(job_id, candidate_id, data):
         session.close()
 
 
+PREDICTION_CHUNK_SIZE = 5000
+
+def store_predictions(job_id, scored_candidates, chunk_size=PREDICTION_CHUNK_SIZE):
+    """Persist a whole run's scores with executemany in a single transaction."""
+    rows = [
+        {
+            "job_id": job_id,
+            "candidate_id": cand.get("id") or cand.get("record_id"),
+            "score": cand["score"]
+        }
+        for cand in scored_candidates
+    ]
+    if not rows:
+        return 0
+
+    session = get_session()
+    try:
+        insert = text("""
+            INSERT OR REPLACE INTO recommendation_results
+            (job_id, candidate_id, score)
+            VALUES (:job_id, :candidate_id, :score)
+        """)
+        for start in range(0, len(rows), chunk_size):
+            session.execute(insert, rows[start:start + chunk_size])
+        bump_table_version(session, "recommendation_results")
+        session.commit()
+        return len(rows)
+    except Exception as e:
+        session.rollback()
+        print(f"❌ Failed to store predictions for job {job_id}: {e}")
+        return 0
+    finally:
+        session.close()
+
 
 def store_hire(job_id, candidate_id):
     session = get_session()
@@ -4,33 +4,27 @@ import re
 import traceback
 from sentence_transformers import SentenceTransformer, util
 import spacy
-import json
-from pathlib import Path
+
+import config
+from matching.embedding_cache import EmbeddingCache
+from matching.tech_patterns import load_tech_patterns
+from metrics import time_inference
 
 DEBUG_LOGGING = True
 bert_model = SentenceTransformer("all-MiniLM-L6-v2")
 
+def _encode(text):
+    with time_inference("sentence_transformer"):
+        return bert_model.encode(text, convert_to_tensor=True)
+
+# The job text repeats for every candidate of a run, and a candidate's
+# match_text only changes when its profile does
+embeddings = EmbeddingCache(_encode, config.EMBEDDING_CACHE_SIZE)
+
 # Load spaCy models
 nlp_en = spacy.load("en_core_web_lg")
 nlp_sv = spacy.load("sv_core_news_md")
 
-def load_tech_patterns():
-    config_path = Path(__file__).parent / "tech_terms.json"
-    with open(config_path, "r", encoding="utf-8") as f:
-        terms = json.load(f)
-    
-    patterns = {"ROLE": [], "TECH": []}
-    
-    for term in terms["roles"]:
-        tokens = [token.strip().lower() for token in term.split()]
-        patterns["ROLE"].append({"label": "ROLE", "pattern": [{"LOWER": t} for t in tokens]})
-    
-    for term in terms["tech"]:
-        tokens = [token.strip().lower() for token in term.split()]
-        patterns["TECH"].append({"label": "TECH", "pattern": [{"LOWER": t} for t in tokens]})
-    
-    return patterns["ROLE"] + patterns["TECH"]
-
 def create_custom_ner(nlp):
     ruler = nlp.add_pipe("entity_ruler", before="ner")
     ruler.add_patterns(load_tech_patterns())
@@ -64,8 +58,12 @@ def extract_entities(text, locations="", total_exp=0):
     lang = "sv" if is_swedish(text) else "en"
     nlp = nlp_sv if lang == "sv" else nlp_en
     
-    doc = nlp(text)  # Process concatenated text
-    loc_doc = nlp(clean_text(locations)) if locations else None
+    with time_inference(f"spacy_{lang}"):
+        doc = nlp(text)  # Process concatenated text
+    loc_doc = None
+    if locations:
+        with time_inference(f"spacy_{lang}"):
+            loc_doc = nlp(clean_text(locations))
     
     entities = {
         "ROLES": set(),
@@ -161,7 +159,8 @@ def match_entities_with_bert(job, candidate):
             str(job.get("job_description", ""))
         ]))
         
-        candidate_text = clean_text(" ".join([
+        # Joined profiles carry a precomputed match_text; build it only when missing
+        candidate_text = candidate.get("match_text") or clean_text(" ".join([
             str(candidate.get("about", "")),
             str(candidate.get("experiences", "")),
             str(candidate.get("degrees", "")),
@@ -243,10 +242,11 @@ def match_entities_with_bert(job, candidate):
         # 6. Semantic similarity with error handling
         print("\n🤖 Calculating BERT Semantic Similarity...")
         try:
-            sem_score = util.cos_sim(
-                bert_model.encode(job_text, convert_to_tensor=True),
-                bert_model.encode(candidate_text, convert_to_tensor=True)
-            ).item()
+            job_embedding = embeddings.get(job_text)
+            # The stored hash only describes the stored match_text
+            text_hash = candidate.get("match_text_hash") if candidate.get("match_text") else None
+            candidate_embedding = embeddings.get(candidate_text, text_hash)
+            sem_score = util.cos_sim(job_embedding, candidate_embedding).item()
             print(f"- Semantic Similarity Score: {sem_score:.4f}")
         except Exception as e:
             print(f"⚠️ BERT encoding error: {str(e)}")
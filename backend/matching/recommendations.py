@@ -3,6 +3,7 @@
 import traceback
 from matching.matcher_pipeline import match_entities_with_bert, clean_text
 from matching.evaluation import evaluate_matches
+from profile_text import build_match_text
 
 # recommendations.py
 
@@ -15,16 +16,18 @@ def recommend_candidates_for_job(job, candidates):
     for candidate in candidates:
         try:
             candidate_id = candidate.get("record_id", "unknown")
+            match_text = candidate.get("match_text")
+            match_text_hash = candidate.get("match_text_hash")
+            if match_text is None:
+                match_text = build_match_text(candidate)
+                match_text_hash = None
             result = match_entities_with_bert(
                 job,
                 {
-                    "about": clean_text(candidate.get("about", "")),
-                    "experiences": clean_text(candidate.get("experiences", "")),
+                    "match_text": match_text,
+                    # Lets the matcher reuse the embedding of an unchanged match_text
+                    "match_text_hash": match_text_hash,
                     "city": clean_text(candidate.get("city", "")),
-                    "degrees": clean_text(candidate.get("degrees", "")),
-                    "certifications": clean_text(candidate.get("certifications", "")),
-                    "languages": clean_text(candidate.get("languages", "")),
-                    "courses": clean_text(candidate.get("courses", "")),
                     "total_experience": candidate.get("total_experience_years", 0)
                 }
             )
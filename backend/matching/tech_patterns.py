@@ -0,0 +1,27 @@
+# matching/tech_patterns.py
+
+import json
+from pathlib import Path
+
+TECH_TERMS_PATH = Path(__file__).parent / "tech_terms.json"
+
+def load_tech_patterns():
+    """entity_ruler patterns for the ROLE and TECH terms in tech_terms.json.
+
+    Kept apart from matcher_pipeline so tools can use the patterns without
+    loading the spaCy and SentenceTransformer models.
+    """
+    with open(TECH_TERMS_PATH, "r", encoding="utf-8") as f:
+        terms = json.load(f)
+    
+    patterns = {"ROLE": [], "TECH": []}
+    
+    for term in terms["roles"]:
+        tokens = [token.strip().lower() for token in term.split()]
+        patterns["ROLE"].append({"label": "ROLE", "pattern": [{"LOWER": t} for t in tokens]})
+    
+    for term in terms["tech"]:
+        tokens = [token.strip().lower() for token in term.split()]
+        patterns["TECH"].append({"label": "TECH", "pattern": [{"LOWER": t} for t in tokens]})
+    
+    return patterns["ROLE"] + patterns["TECH"]
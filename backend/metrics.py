@@ -0,0 +1,204 @@
+# backend/metrics.py
+#
+# Process-local metrics served at /metrics in the Prometheus text format
+# (version 0.0.4). Each worker process reports its own values.
+
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, request
+from sqlalchemy import event
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+INFERENCE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+QUERY_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+_registry = []
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+        _registry.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, key, (), value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for name, key, extra, value in self.samples():
+            lines.append(f"{name}{_format_labels(self.labels, key, extra)} {_format_value(value)}")
+        return lines
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    """A gauge read from callback() at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, callback):
+        super().__init__(name, help_text)
+        self.callback = callback
+
+    def samples(self):
+        yield self.name, (), (), self.callback()
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        with self._lock:
+            items = [(key, (list(counts), total)) for key, (counts, total) in self._values.items()]
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f"{self.name}_bucket", key, [("le", _format_value(bound))], cumulative
+            yield f"{self.name}_sum", key, (), total
+            yield f"{self.name}_count", key, (), cumulative
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Time spent handling HTTP requests.", ["method", "route", "status"]
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "Time spent executing database statements.", ["operation"], QUERY_BUCKETS
+)
+MODEL_INFERENCE_SECONDS = Histogram(
+    "model_inference_duration_seconds", "Time spent in spaCy and SentenceTransformer calls.", ["model"],
+    INFERENCE_BUCKETS
+)
+MODEL_BATCH_SIZE = Histogram(
+    "model_inference_batch_size", "Texts passed to a single model call.", ["model"], BATCH_BUCKETS
+)
+EMBEDDING_CACHE_LOOKUPS = Counter(
+    "model_embedding_cache_lookups_total",
+    "SentenceTransformer embeddings looked up by text hash; result is hit or miss (encoded).", ["result"]
+)
+CONDITIONAL_REQUESTS = Counter(
+    "http_conditional_requests_total",
+    "ETag-checked responses; result is hit (answered 304) or miss (full body).", ["result"]
+)
+
+def gauge(name, help_text, callback):
+    """Register a gauge whose value is callback() at scrape time.
+
+    Registering an existing name swaps its callback, so building the app
+    again (tests, benchmarks) does not duplicate the series.
+    """
+    for metric in _registry:
+        if metric.name == name and isinstance(metric, Gauge):
+            metric.callback = callback
+            return metric
+    return Gauge(name, help_text, callback)
+
+@contextmanager
+def time_inference(model, batch_size=1):
+    """Record the duration and batch size of one model call."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        MODEL_INFERENCE_SECONDS.observe(time.perf_counter() - started, model=model)
+        MODEL_BATCH_SIZE.observe(batch_size, model=model)
+
+def render():
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    DB_QUERY_SECONDS.observe(
+        time.perf_counter() - started,
+        operation=operation if operation in QUERY_OPERATIONS else "OTHER"
+    )
+
+def instrument_engine(engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def _start_timer():
+    g.metrics_started = time.perf_counter()
+
+def _observe_request(response):
+    started = g.pop("metrics_started", None)
+    if started is not None:
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            # The rule, not the path, so ids don't explode the label set
+            route=request.url_rule.rule if request.url_rule else "unmatched",
+            status=response.status_code
+        )
+    return response
+
+def metrics_view():
+    return Response(render(), content_type=CONTENT_TYPE)
+
+def init_metrics(app, engine):
+    """Time every request and query on engine, and serve GET /metrics."""
+    app.before_request(_start_timer)
+    app.after_request(_observe_request)
+    instrument_engine(engine)
+    app.add_url_rule("/metrics", "metrics", metrics_view, methods=["GET"])
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# backend/migrations.py
+
+import argparse
+import time
+
+from sqlalchemy import text
+
+from db_connection import begin_immediate, get_engine
+from models import AuditLogMonthlySummary, Base, FeedIngestState, FeedState, RecommendationTask, TableVersion
+from profile_text import (
+    MATCH_TEXT_FIELDS, PROFILE_CONTENT_FIELDS, build_match_text, hash_match_text, hash_profile_content,
+    ner_source_hash, stable_record_id
+)
+from search_index import FTS_TABLE, create_search_index, rebuild_search_index
+
+# candidate_profiles_joined is rebuilt by join_profiles, which drops its
+# indexes, so they live here and are recreated after every rebuild.
+JOINED_PROFILE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_candidate_profiles_joined_person_id ON candidate_profiles_joined (person_id)",
+    "CREATE INDEX IF NOT EXISTS ix_candidate_profiles_joined_total_experience_years ON candidate_profiles_joined (total_experience_years)",
+    "CREATE INDEX IF NOT EXISTS ix_candidate_profiles_joined_load_date ON candidate_profiles_joined (load_date)",
+    # Keyset pagination: same expressions as pagination.CANDIDATE_SORT_KEYS
+    "CREATE INDEX IF NOT EXISTS ix_candidate_profiles_joined_experience_keyset "
+    "ON candidate_profiles_joined (COALESCE(total_experience_years, -1) DESC, record_id)",
+    "CREATE INDEX IF NOT EXISTS ix_candidate_profiles_joined_name_keyset "
+    "ON candidate_profiles_joined (COALESCE(name, ''), record_id)",
+    "CREATE INDEX IF NOT EXISTS ix_candidate_profiles_joined_city_keyset "
+    "ON candidate_profiles_joined (COALESCE(city, ''), record_id)",
+    "CREATE INDEX IF NOT EXISTS ix_candidate_profiles_joined_load_date_keyset "
+    "ON candidate_profiles_joined (COALESCE(load_date, '') DESC, record_id)",
+]
+
+def table_exists(conn, table_name):
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": table_name}
+    ).first() is not None
+
+def table_columns(conn, table_name):
+    return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table_name})"))}
+
+def create_joined_profile_indexes(conn):
+    """(Re)create the secondary indexes on candidate_profiles_joined."""
+    for statement in JOINED_PROFILE_INDEXES:
+        conn.execute(text(statement))
+
+# --- MIGRATIONS ---
+
+def _baseline_tables(conn):
+    Base.metadata.create_all(bind=conn)
+
+    conn.execute(text("""
+    CREATE TABLE IF NOT EXISTS recommendation_results (
+        job_id TEXT,
+        candidate_id TEXT,
+        score FLOAT,
+        PRIMARY KEY (job_id, candidate_id)
+    )
+    """))
+
+    conn.execute(text("""
+    CREATE TABLE IF NOT EXISTS hires (
+        job_id TEXT,
+        candidate_id TEXT,
+        PRIMARY KEY (job_id, candidate_id)
+    )
+    """))
+
+def _match_text_columns(conn):
+    """Add match_text/match_text_hash to an older joined table and fill them in."""
+    if not table_exists(conn, "candidate_profiles_joined"):
+        return  # join_profiles creates it with the columns
+
+    columns = table_columns(conn, "candidate_profiles_joined")
+    if "match_text" not in columns:
+        conn.execute(text("ALTER TABLE candidate_profiles_joined ADD COLUMN match_text TEXT"))
+    if "match_text_hash" not in columns:
+        conn.execute(text("ALTER TABLE candidate_profiles_joined ADD COLUMN match_text_hash TEXT"))
+
+    rows = conn.execute(text(f"""
+    SELECT record_id, {', '.join(MATCH_TEXT_FIELDS)}
+    FROM candidate_profiles_joined
+    WHERE match_text IS NULL
+    """)).mappings().all()
+    updates = []
+    for row in rows:
+        match_text = build_match_text(row)
+        updates.append({
+            "record_id": row["record_id"],
+            "match_text": match_text,
+            "match_text_hash": hash_match_text(match_text)
+        })
+    if updates:
+        conn.execute(text("""
+        UPDATE candidate_profiles_joined
+        SET match_text = :match_text, match_text_hash = :match_text_hash
+        WHERE record_id = :record_id
+        """), updates)
+        print(f"✅ Backfilled match_text for {len(updates)} candidates")
+
+def _hot_path_indexes(conn):
+    for table in ["experience_raw", "education_raw", "certifications_raw", "languages_raw", "courses_raw"]:
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_person_id ON {table} (person_id)"))
+
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_recommendation_results_job_id_score "
+        "ON recommendation_results (job_id, score DESC)"
+    ))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_job_postings_raw_load_date ON job_postings_raw (load_date)"))
+
+    if table_exists(conn, "candidate_profiles_joined"):
+        create_joined_profile_indexes(conn)
+
+def _candidate_search_index(conn):
+    if table_exists(conn, "candidate_profiles_joined"):
+        create_search_index(conn)
+
+def _keyset_pagination_indexes(conn):
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_job_postings_raw_load_date_keyset "
+        "ON job_postings_raw (COALESCE(load_date, '') DESC, job_id)"
+    ))
+    if table_exists(conn, "candidate_profiles_joined"):
+        create_joined_profile_indexes(conn)
+
+def _table_versions(conn):
+    Base.metadata.create_all(bind=conn, tables=[TableVersion.__table__])
+
+def _audit_log_indexes(conn):
+    for column in ["record_id", "operation", "status"]:
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_candidate_profiles_audit_log_{column}_utc_timestamp "
+            f"ON candidate_profiles_audit_log ({column}, utc_timestamp DESC, audit_id)"
+        ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_candidate_profiles_audit_log_utc_timestamp "
+        "ON candidate_profiles_audit_log (utc_timestamp DESC, audit_id)"
+    ))
+    Base.metadata.create_all(bind=conn, tables=[AuditLogMonthlySummary.__table__])
+
+def _feed_ingest_state(conn):
+    Base.metadata.create_all(bind=conn, tables=[FeedIngestState.__table__])
+
+def _feed_change_detection(conn):
+    if table_exists(conn, "person_raw") and "content_hash" not in table_columns(conn, "person_raw"):
+        # Left NULL: every person counts as changed on the next ingest
+        conn.execute(text("ALTER TABLE person_raw ADD COLUMN content_hash TEXT"))
+    Base.metadata.create_all(bind=conn, tables=[FeedState.__table__])
+
+def _stable_record_ids(conn):
+    """Move feed candidates to record_id = sha256(person_id) and add content_hash.
+
+    Old record_ids hashed the whole row including load_date. Rows coming from
+    the feed get their stable id, and recommendation_results/hires follow
+    them. API-created candidates (uuid record_id) keep theirs. Where older
+    builds left several rows for one person only the newest is kept.
+    """
+    if not table_exists(conn, "candidate_profiles_joined"):
+        return
+
+    if "content_hash" not in table_columns(conn, "candidate_profiles_joined"):
+        conn.execute(text("ALTER TABLE candidate_profiles_joined ADD COLUMN content_hash TEXT"))
+
+    from_feed = "person_id IN (SELECT person_id FROM person_raw)" if table_exists(conn, "person_raw") else "0"
+    # Newest first: when older builds left several rows for one person, the
+    # latest keeps the stable id and the others are dropped
+    rows = conn.execute(text(f"""
+    SELECT rowid, record_id, {', '.join(PROFILE_CONTENT_FIELDS)}, {from_feed} AS from_feed
+    FROM candidate_profiles_joined
+    ORDER BY load_date DESC
+    """)).mappings().all()
+    updates = []
+    dropped = []
+    seen = set()
+    for row in rows:
+        record_id = row["record_id"]
+        if row["from_feed"] and len(record_id or "") == 64:
+            record_id = stable_record_id(row["person_id"])
+        change = {"rowid": row["rowid"], "old_record_id": row["record_id"], "record_id": record_id}
+        if record_id in seen:
+            dropped.append(change)
+            continue
+        seen.add(record_id)
+        change["content_hash"] = hash_profile_content([row[field] for field in PROFILE_CONTENT_FIELDS])
+        updates.append(change)
+
+    # References follow the row that keeps the person; any that would collide
+    # with an existing (job_id, candidate_id) are duplicates and go
+    remapped = [change for change in updates + dropped if change["record_id"] != change["old_record_id"]]
+    for table in ["recommendation_results", "hires"]:
+        if remapped and table_exists(conn, table):
+            conn.execute(text(
+                f"UPDATE OR IGNORE {table} SET candidate_id = :record_id WHERE candidate_id = :old_record_id"
+            ), remapped)
+            conn.execute(text(f"DELETE FROM {table} WHERE candidate_id = :old_record_id"), remapped)
+    if dropped:
+        conn.execute(text("DELETE FROM candidate_profiles_joined WHERE rowid = :rowid"), dropped)
+        print(f"✅ Dropped {len(dropped)} duplicate joined rows from older builds")
+    if updates:
+        conn.execute(text("""
+        UPDATE candidate_profiles_joined
+        SET record_id = :record_id, content_hash = :content_hash
+        WHERE rowid = :rowid
+        """), updates)
+        print(f"✅ Stable record_id/content_hash set for {len(updates)} candidates")
+
+    # Tables written by older pandas builds have no key; upserts need one
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_candidate_profiles_joined_record_id "
+        "ON candidate_profiles_joined (record_id)"
+    ))
+
+def _ner_training_dedup(conn):
+    """Add source_hash to ner_training_data, drop repeated texts, make it unique."""
+    if not table_exists(conn, "ner_training_data"):
+        return
+    if "source_hash" not in table_columns(conn, "ner_training_data"):
+        conn.execute(text("ALTER TABLE ner_training_data ADD COLUMN source_hash TEXT"))
+
+    rows = conn.execute(text(
+        "SELECT id, source, text FROM ner_training_data WHERE source_hash IS NULL"
+    )).mappings().all()
+    if rows:
+        conn.execute(
+            text("UPDATE ner_training_data SET source_hash = :source_hash WHERE id = :id"),
+            [{"id": row["id"], "source_hash": ner_source_hash(row["source"], row["text"])} for row in rows]
+        )
+    removed = conn.execute(text("""
+    DELETE FROM ner_training_data
+    WHERE id NOT IN (SELECT MIN(id) FROM ner_training_data GROUP BY source_hash)
+    """)).rowcount
+    if removed:
+        print(f"✅ Removed {removed} duplicate NER training rows")
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_ner_training_data_source_hash ON ner_training_data (source_hash)"
+    ))
+
+def _recommendation_tasks(conn):
+    Base.metadata.create_all(bind=conn, tables=[RecommendationTask.__table__])
+
+# (version, description, function) — append only, never renumber
+MIGRATIONS = [
+    (1, "baseline tables", _baseline_tables),
+    (2, "match_text columns on candidate_profiles_joined", _match_text_columns),
+    (3, "hot-path secondary indexes", _hot_path_indexes),
+    (4, "FTS5 candidate search index", _candidate_search_index),
+    (5, "keyset pagination indexes", _keyset_pagination_indexes),
+    (6, "table version counters for ETags", _table_versions),
+    (7, "audit log query indexes and monthly summary table", _audit_log_indexes),
+    (8, "resumable streaming ingest progress", _feed_ingest_state),
+    (9, "person content hashes and feed validators", _feed_change_detection),
+    (10, "stable record_id and content_hash on candidate_profiles_joined", _stable_record_ids),
+    (11, "deduplicated NER training corpus", _ner_training_dedup),
+    (12, "recommendation task status shared across workers", _recommendation_tasks),
+]
+
+def current_version(conn):
+    return conn.execute(text("PRAGMA user_version")).scalar()
+
+def upgrade(engine=None):
+    """Apply every pending migration, each in its own transaction."""
+    engine = engine or get_engine()
+    with engine.connect() as conn:
+        version = current_version(conn)
+
+    applied = 0
+    for number, description, migrate in MIGRATIONS:
+        if number <= version:
+            continue
+        with engine.begin() as conn:
+            # pysqlite autocommits DDL; without an explicit BEGIN a migration
+            # failing halfway would keep its first statements but not the version
+            begin_immediate(conn)
+            if current_version(conn) >= number:
+                continue  # Another process applied it while we waited for the lock
+            migrate(conn)
+            conn.execute(text(f"PRAGMA user_version = {number}"))
+        print(f"✅ Applied migration {number}: {description}")
+        applied += 1
+
+    if not applied:
+        print(f"✅ Schema is up to date (version {version})")
+    return applied
+
+# --- MAINTENANCE ---
+
+def run_maintenance(engine=None, vacuum=False):
+    """Refresh planner statistics, checkpoint the WAL and optionally VACUUM."""
+    engine = engine or get_engine()
+    # VACUUM refuses to run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        started = time.perf_counter()
+        conn.execute(text("ANALYZE"))
+        conn.execute(text("PRAGMA optimize"))
+        if vacuum:
+            conn.execute(text("VACUUM"))
+            # VACUUM may renumber the implicit rowids the FTS index points at
+            if table_exists(conn, FTS_TABLE):
+                rebuild_search_index(conn)
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        print(f"🧹 Maintenance done in {time.perf_counter() - started:.2f}s (vacuum={vacuum})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Schema migrations and database maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("upgrade", help="Apply pending migrations")
+    subparsers.add_parser("status", help="Show the current schema version")
+
+    maintain = subparsers.add_parser("maintain", help="Run ANALYZE (and optionally VACUUM)")
+    maintain.add_argument("--vacuum", action="store_true", help="Also VACUUM the database")
+    maintain.add_argument(
+        "--every", type=int, default=0, metavar="SECONDS",
+        help="Keep running, repeating maintenance every SECONDS"
+    )
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        upgrade()
+    elif args.command == "status":
+        with get_engine().connect() as conn:
+            version = current_version(conn)
+        print(f"Schema version {version} (latest {MIGRATIONS[-1][0]})")
+    elif args.command == "maintain":
+        while True:
+            run_maintenance(vacuum=args.vacuum)
+            if not args.every:
+                break
+            time.sleep(args.every)
+
+if __name__ == "__main__":
+    main()
@@ -20,11 +20,12 @@ class PersonRaw(Base):
     position = Column(String)
     current_company_name = Column(String)
     about = Column(String)
+    content_hash = Column(String)  # Hash of the normalized feed record, used to skip unchanged persons
 
 class ExperienceRaw(Base):
     __tablename__ = "experience_raw"
     id = Column(Integer, primary_key=True, autoincrement=True)
-    person_id = Column(String)
+    person_id = Column(String, index=True)
     title = Column(String)
     start_date = Column(String)
     end_date = Column(String)
@@ -32,25 +33,25 @@ class ExperienceRaw(Base):
 class EducationRaw(Base):
     __tablename__ = "education_raw"
     id = Column(Integer, primary_key=True, autoincrement=True)
-    person_id = Column(String)
+    person_id = Column(String, index=True)
     degree = Column(String)
 
 class CertificationsRaw(Base):
     __tablename__ = "certifications_raw"
     id = Column(Integer, primary_key=True, autoincrement=True)
-    person_id = Column(String)
+    person_id = Column(String, index=True)
     title = Column(String)
 
 class LanguagesRaw(Base):
     __tablename__ = "languages_raw"
     id = Column(Integer, primary_key=True, autoincrement=True)
-    person_id = Column(String)
+    person_id = Column(String, index=True)
     title = Column(String)
 
 class CoursesRaw(Base):
     __tablename__ = "courses_raw"
     id = Column(Integer, primary_key=True, autoincrement=True)
-    person_id = Column(String)
+    person_id = Column(String, index=True)
     title = Column(String)
 
 class AuditLog(Base):
@@ -63,24 +64,36 @@ class AuditLog(Base):
     utc_timestamp = Column(TIMESTAMP)
     swedish_timestamp = Column(TIMESTAMP)
 
+class AuditLogMonthlySummary(Base):
+    __tablename__ = "candidate_profiles_audit_summary"
+    month = Column(String, primary_key=True)  # 'YYYY-MM' of utc_timestamp
+    operation = Column(String, primary_key=True)
+    status = Column(String, primary_key=True)
+    entry_count = Column(Integer, nullable=False, default=0)
+    first_utc_timestamp = Column(TIMESTAMP)
+    last_utc_timestamp = Column(TIMESTAMP)
+
 # 🔥 --- ADD THIS MISSING CLASS ---
 class CandidateProfilesJoined(Base):
     __tablename__ = "candidate_profiles_joined"
-    record_id = Column(String, primary_key=True)
-    person_id = Column(String)
+    record_id = Column(String, primary_key=True)  # sha256(person_id) for feed candidates, uuid for API ones
+    person_id = Column(String, index=True)
     name = Column(String)
     country_code = Column(String)
     city = Column(String)
     url = Column(String)
     position = Column(String)
     about = Column(String)
-    total_experience_years = Column(Integer)
+    total_experience_years = Column(Integer, index=True)
     experiences = Column(String)
     degrees = Column(String)
     certifications = Column(String)
     languages = Column(String)
     courses = Column(String)
-    load_date = Column(TIMESTAMP)
+    load_date = Column(TIMESTAMP, index=True)
+    match_text = Column(Text)  # Normalized text the matcher reads
+    match_text_hash = Column(String)
+    content_hash = Column(String)  # Hash of the profile content, unchanged rows are not rewritten
 
 class JobPostingsRaw(Base):
     __tablename__ = "job_postings_raw"
@@ -99,7 +112,7 @@ class JobPostingsRaw(Base):
     responsibilities = Column(Text)
     qualifications = Column(Text)
     job_description = Column(Text)
-    load_date = Column(DateTime, default=datetime.now)
+    load_date = Column(DateTime, default=datetime.now, index=True)
     
 class NerTrainingData(Base):
     __tablename__ = "ner_training_data"
@@ -109,3 +122,37 @@ class NerTrainingData(Base):
     record_id = Column(String)  # To trace back if needed
     text = Column(String)  # The raw text for NER training
     created_at = Column(TIMESTAMP, default=datetime.now)
+    source_hash = Column(String, unique=True, index=True)  # sha256 of source + text, a text is stored once
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)  # Bumped by every write path
+
+class FeedIngestState(Base):
+    __tablename__ = "feed_ingest_state"
+
+    source = Column(String, primary_key=True)  # Feed URL or local file path
+    records_done = Column(Integer, nullable=False, default=0)  # Records committed by the current streaming run
+    updated_at = Column(DateTime, default=datetime.now)
+
+class FeedState(Base):
+    __tablename__ = "feed_state"
+
+    source = Column(String, primary_key=True)  # Feed URL
+    etag = Column(String)  # Validators from the last fully ingested response
+    last_modified = Column(String)
+    updated_at = Column(DateTime, default=datetime.now)
+
+class RecommendationTask(Base):
+    __tablename__ = "recommendation_tasks"
+
+    # Shared by every server process, so any worker can answer a status poll
+    task_id = Column(String, primary_key=True)
+    job_id = Column(String, nullable=False)
+    status = Column(String, nullable=False)  # processing, complete or error
+    result = Column(Text)  # JSON, set when complete
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now)
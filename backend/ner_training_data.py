@@ -1,56 +1,127 @@
-# backend/generate_ner_training_data.py
+# backend/ner_training_data.py
 
-from db_connection import get_session
-from models import CandidateProfilesJoined, JobPostingsRaw, NerTrainingData
+import argparse
 from datetime import datetime
+from pathlib import Path
 
+from sqlalchemy import text
 
-# backend/create_tables.py
+import config
+from db_connection import begin_immediate, get_engine
+from migrations import upgrade
+from profile_text import ner_source_hash
 
-from db_connection import engine
-from models import Base
+# (source label, query returning record_id and text)
+NER_SOURCES = [
+    ("candidate", "SELECT record_id, about FROM candidate_profiles_joined WHERE about IS NOT NULL"),
+    ("job_posting", "SELECT job_id, job_description FROM job_postings_raw WHERE job_description IS NOT NULL"),
+]
 
-def create_all_tables():
-    Base.metadata.create_all(engine)
-    print("✅ All tables created successfully.")
+INSERT_NER_SQL = text("""
+INSERT OR IGNORE INTO ner_training_data (source, record_id, text, created_at, source_hash)
+VALUES (:source, :record_id, :text, :created_at, :source_hash)
+""")
 
-if __name__ == "__main__":
-    create_all_tables()
+def _iter_new_texts(conn, source, query, seen):
+    created_at = datetime.now()
+    for record_id, raw_text in conn.execute(text(query)):
+        stripped = raw_text.strip()
+        if not stripped:
+            continue
+        source_hash = ner_source_hash(source, stripped)
+        if source_hash in seen:
+            continue
+        seen.add(source_hash)
+        yield {
+            "source": source,
+            "record_id": record_id,
+            "text": stripped,
+            "created_at": created_at,
+            "source_hash": source_hash
+        }
+
+def generate_ner_training_data(chunk_size=config.NER_INSERT_CHUNK_SIZE):
+    """Add candidate abouts and job descriptions not already in the corpus.
 
-def generate_ner_training_data():
-    session = get_session()
+    Texts are identified by ner_source_hash; known hashes are skipped before
+    insert and the unique index catches the rest. Returns the rows added.
+    """
+    engine = get_engine()
+    added = 0
 
     try:
-        # Collect from candidate_profiles_joined
-        candidates = session.query(CandidateProfilesJoined).filter(CandidateProfilesJoined.about.isnot(None)).all()
-        for c in candidates:
-            ner_entry = NerTrainingData(
-                source="candidate",
-                record_id=c.record_id,
-                text=c.about.strip(),
-                created_at=datetime.now()
-            )
-            session.add(ner_entry)
-
-        # Collect from job_postings_raw
-        jobs = session.query(JobPostingsRaw).filter(JobPostingsRaw.job_description.isnot(None)).all()
-        for j in jobs:
-            ner_entry = NerTrainingData(
-                source="job_posting",
-                record_id=j.job_id,
-                text=j.job_description.strip(),
-                created_at=datetime.now()
-            )
-            session.add(ner_entry)
-
-        session.commit()
-        print("✅ NER training data generated successfully.")
+        with engine.begin() as conn:
+            # Write lock before reading the known hashes, as in normalize_and_insert
+            begin_immediate(conn)
+            seen = {row[0] for row in conn.execute(text("SELECT source_hash FROM ner_training_data"))}
+            for source, query in NER_SOURCES:
+                batch = []
+                for row in _iter_new_texts(conn, source, query, seen):
+                    batch.append(row)
+                    if len(batch) >= chunk_size:
+                        added += conn.execute(INSERT_NER_SQL, batch).rowcount
+                        batch = []
+                if batch:
+                    added += conn.execute(INSERT_NER_SQL, batch).rowcount
+
+        print(f"✅ NER training data generated successfully: {added} new texts.")
+        return added
 
     except Exception as e:
-        session.rollback()
         print(f"❌ Error generating NER training data: {e}")
-    finally:
-        session.close()
+        return 0
 
-if __name__ == "__main__":
+def export_docbin(out_dir, shard_size=config.NER_DOCBIN_SHARD_SIZE, lang="en"):
+    """Write the corpus as sharded spaCy DocBin files pre-annotated by the entity ruler.
+
+    Uses a blank pipeline plus the ROLE/TECH ruler, so no trained model is
+    loaded. Returns the paths written.
+    """
+    import spacy
+    from spacy.tokens import DocBin
+
+    from matching.tech_patterns import load_tech_patterns
+
+    nlp = spacy.blank(lang)
+    nlp.add_pipe("entity_ruler").add_patterns(load_tech_patterns())
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+
+    def write_shard(doc_bin):
+        path = out_dir / f"ner-{len(paths):05d}.spacy"
+        doc_bin.to_disk(path)
+        paths.append(path)
+
+    engine = get_engine()
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT text FROM ner_training_data ORDER BY id"))
+        texts = (row[0] for row in rows)
+        doc_bin = DocBin(attrs=["ORTH", "ENT_IOB", "ENT_TYPE"])
+        for doc in nlp.pipe(texts, batch_size=256):
+            doc_bin.add(doc)
+            if len(doc_bin) >= shard_size:
+                write_shard(doc_bin)
+                doc_bin = DocBin(attrs=["ORTH", "ENT_IOB", "ENT_TYPE"])
+        if len(doc_bin):
+            write_shard(doc_bin)
+
+    print(f"✅ Wrote {len(paths)} DocBin shard(s) to {out_dir}")
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the NER training corpus")
+    parser.add_argument("--docbin", type=Path,
+                        help="Also write the corpus as spaCy DocBin shards to this directory")
+    parser.add_argument("--shard-size", type=int, default=config.NER_DOCBIN_SHARD_SIZE,
+                        help="Docs per DocBin shard")
+    args = parser.parse_args()
+
+    upgrade()
     generate_ner_training_data()
+    if args.docbin:
+        export_docbin(args.docbin, args.shard_size)
+
+if __name__ == "__main__":
+    main()
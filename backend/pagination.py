@@ -0,0 +1,117 @@
+# backend/pagination.py
+
+import base64
+import json
+from collections import namedtuple
+
+from sqlalchemy import text
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# sort_by -> (sort expression, direction). The expressions coalesce NULLs so
+# rows compare cleanly in the keyset WHERE; migrations index the same
+# expressions together with the tie-breaker.
+CANDIDATE_SORT_KEYS = {
+    "experience": ("COALESCE(total_experience_years, -1)", "DESC"),
+    "name": ("COALESCE(name, '')", "ASC"),
+    "city": ("COALESCE(city, '')", "ASC"),
+    "load_date": ("COALESCE(load_date, '')", "DESC"),
+    "relevance": ("search.search_rank", "ASC"),
+}
+CANDIDATE_TIEBREAKER = "candidate_profiles_joined.record_id"
+
+JOB_POSTING_SORT_KEYS = {
+    "load_date": ("COALESCE(load_date, '')", "DESC"),
+}
+JOB_POSTING_TIEBREAKER = "job_postings_raw.job_id"
+
+AUDIT_LOG_SORT_KEYS = {
+    "utc_timestamp": ("utc_timestamp", "DESC"),
+}
+AUDIT_LOG_TIEBREAKER = "candidate_profiles_audit_log.audit_id"
+
+Page = namedtuple("Page", ["limit", "cursor", "include_total"])
+
+def parse_page_args(args):
+    """Read limit/cursor/include_total from request args.
+
+    Returns None when neither limit nor cursor is given, so callers can keep
+    returning the plain list. Raises ValueError on bad input.
+    """
+    if "limit" not in args and "cursor" not in args:
+        return None
+
+    limit = args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    if limit is None or limit < 1:
+        raise ValueError("limit must be a positive integer")
+    include_total = args.get("include_total", "true").lower() not in ("0", "false", "no")
+    return Page(min(limit, MAX_PAGE_SIZE), args.get("cursor") or None, include_total)
+
+def encode_cursor(sort_by, values):
+    payload = json.dumps({"s": sort_by, "v": list(values)}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor, sort_by):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["v"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if payload.get("s") != sort_by or len(values) != 2:
+        raise ValueError("Cursor does not match sort_by")
+    return values
+
+def order_by_sql(sort_key, tiebreaker):
+    expression, direction = sort_key
+    return f"{expression} {direction}, {tiebreaker} ASC"
+
+def keyset_clause(sort_key, tiebreaker, values):
+    """WHERE fragment selecting rows strictly after values in (sort, tiebreaker) order."""
+    expression, direction = sort_key
+    op = "<" if direction == "DESC" else ">"
+    # The leading bound is index-friendly; the OR settles ties on the tiebreaker
+    clause = (
+        f"{expression} {op}= :cursor_sort AND "
+        f"({expression} {op} :cursor_sort OR {tiebreaker} > :cursor_tiebreaker)"
+    )
+    return clause, {"cursor_sort": values[0], "cursor_tiebreaker": values[1]}
+
+def fetch_page(session, select_sql, from_sql, where_clauses, params, sort_by, sort_key,
+               tiebreaker, page, id_key=None):
+    """Run a keyset-paginated query and return the page envelope.
+
+    id_key is the result key holding the tie-breaker (default: its column name).
+    """
+    page_params = dict(params)
+    page_where = list(where_clauses)
+
+    if page.cursor:
+        clause, cursor_params = keyset_clause(sort_key, tiebreaker, decode_cursor(page.cursor, sort_by))
+        page_where.append(clause)
+        page_params.update(cursor_params)
+
+    query = f"{select_sql}, {sort_key[0]} AS page_sort_value FROM {from_sql}"
+    if page_where:
+        query += " WHERE " + " AND ".join(page_where)
+    query += f" ORDER BY {order_by_sql(sort_key, tiebreaker)} LIMIT :page_limit"
+    page_params["page_limit"] = page.limit + 1
+
+    rows = [dict(row) for row in session.execute(text(query), page_params).mappings().all()]
+    has_more = len(rows) > page.limit
+    rows = rows[:page.limit]
+    sort_values = [row.pop("page_sort_value") for row in rows]
+
+    envelope = {"items": rows, "next_cursor": None}
+    if has_more:
+        id_key = id_key or tiebreaker.split(".")[-1]
+        envelope["next_cursor"] = encode_cursor(sort_by, [sort_values[-1], rows[-1][id_key]])
+
+    if page.include_total:
+        count_query = f"SELECT COUNT(*) FROM {from_sql}"
+        if where_clauses:
+            count_query += " WHERE " + " AND ".join(where_clauses)
+        envelope["total"] = session.execute(text(count_query), params).scalar()
+
+    return envelope
@@ -0,0 +1,84 @@
+# backend/profile_text.py
+
+import hashlib
+import re
+
+# Same fields, same order as the candidate side of match_entities_with_bert
+MATCH_TEXT_FIELDS = [
+    "about",
+    "experiences",
+    "degrees",
+    "certifications",
+    "languages",
+    "courses",
+    "city",
+]
+
+def clean_text(text):
+    return re.sub(r"\s+", " ", str(text or "").strip())
+
+def _field_text(value):
+    # pandas hands missing aggregates over as NaN, which must read as empty
+    if value is None or value != value:
+        return ""
+    return clean_text(value)
+
+def build_match_text(profile):
+    """Build the normalized text the matcher compares against a job."""
+    return clean_text(" ".join(_field_text(profile.get(field)) for field in MATCH_TEXT_FIELDS))
+
+def build_match_texts(frame):
+    """build_match_text for every row of a DataFrame, using column-wise string ops."""
+    fields = [frame[field].astype(object).where(frame[field].notna(), "") for field in MATCH_TEXT_FIELDS]
+    combined = fields[0]
+    for field in fields[1:]:
+        combined = combined + " " + field
+    # Collapsing whitespace once over the joined text equals cleaning each field first
+    return combined.str.replace(r"\s+", " ", regex=True).str.strip().tolist()
+
+def hash_match_text(match_text):
+    """SHA256 of the normalized match text."""
+    return hashlib.sha256((match_text or "").encode("utf-8")).hexdigest()
+
+# Columns whose values define a joined profile's content (not load_date or derived text)
+PROFILE_CONTENT_FIELDS = [
+    "person_id", "name", "country_code", "city", "url", "position", "about",
+    "total_experience_years", "experiences", "degrees", "certifications", "languages", "courses",
+]
+
+def stable_record_id(person_id):
+    """record_id of a feed candidate: derived from person_id only, so it survives rebuilds."""
+    return hashlib.sha256(str(person_id).encode("utf-8")).hexdigest()
+
+def _content_value(value):
+    if value is None or value != value:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))  # 5.0 from pandas and 5 from SQLite hash the same
+    return str(value)
+
+def hash_profile_content(values):
+    """SHA256 over PROFILE_CONTENT_FIELDS values, for change detection."""
+    return hashlib.sha256("||".join(_content_value(value) for value in values).encode("utf-8")).hexdigest()
+
+def _content_column(series):
+    """_content_value for a whole column."""
+    if series.dtype.kind != "f":
+        return series.astype(object).where(series.notna(), "").astype(str)
+    values = series.astype(str)
+    whole = series.notna() & (series % 1 == 0)
+    values[whole] = series[whole].astype("int64").astype(str)
+    values[series.isna()] = ""
+    return values
+
+def hash_profile_contents(frame):
+    """hash_profile_content for every row of a DataFrame; payloads are joined column-wise."""
+    columns = [_content_column(frame[field]) for field in PROFILE_CONTENT_FIELDS]
+    payload = columns[0]
+    for column in columns[1:]:
+        payload = payload + "||" + column
+    return [hashlib.sha256(value.encode("utf-8")).hexdigest() for value in payload.tolist()]
+
+def ner_source_hash(source, text):
+    """Identity of a NER training text: the same text from the same source is stored once."""
+    return hashlib.sha256(f"{source}\x1f{clean_text(text)}".encode("utf-8")).hexdigest()
@@ -0,0 +1,57 @@
+# backend/projection.py
+
+# API field -> SQL column, for ?fields= projection on list endpoints.
+# match_text/match_text_hash are matcher internals and never exposed.
+CANDIDATE_COLUMNS = {
+    field: f"candidate_profiles_joined.{field}"
+    for field in [
+        "record_id", "person_id", "name", "country_code", "city", "url", "position", "about",
+        "total_experience_years", "experiences", "degrees", "certifications", "languages",
+        "courses", "load_date"
+    ]
+}
+# Compact default for list views — no large text columns
+CANDIDATE_LIST_FIELDS = ["record_id", "person_id", "name", "city", "position", "total_experience_years", "load_date"]
+
+JOB_POSTING_COLUMNS = {"id": "job_postings_raw.job_id"}
+JOB_POSTING_COLUMNS.update({
+    field: f"job_postings_raw.{field}"
+    for field in [
+        "title", "department", "locations", "work_type", "required_skills", "preferred_skills",
+        "education_level", "languages_required", "experience_required", "total_experience_years",
+        "responsibilities", "qualifications", "job_description", "load_date"
+    ]
+})
+JOB_POSTING_LIST_FIELDS = [
+    "id", "title", "department", "locations", "work_type", "experience_required",
+    "total_experience_years", "job_description"
+]
+
+def parse_fields(args, columns, default, required):
+    """Resolve ?fields=a,b,c (or fields=all) against columns.
+
+    Falls back to default, always includes required, raises ValueError on
+    unknown names.
+    """
+    raw = args.get("fields")
+    if not raw:
+        fields = list(default)
+    elif raw.strip() == "all":
+        fields = list(columns)
+    else:
+        fields = []
+        for field in raw.split(","):
+            field = field.strip()
+            if not field or field in fields:
+                continue
+            if field not in columns:
+                raise ValueError(f"Unknown field: {field}")
+            fields.append(field)
+
+    for field in reversed(required):
+        if field not in fields:
+            fields.insert(0, field)
+    return fields
+
+def select_sql(columns, fields):
+    return "SELECT " + ", ".join(f"{columns[field]} AS {field}" for field in fields)
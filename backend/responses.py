@@ -0,0 +1,121 @@
+# backend/responses.py
+
+import gzip
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask import has_request_context, request
+from flask.json.provider import JSONProvider
+
+import config
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MSGPACK_MIMETYPE = "application/x-msgpack"
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def negotiated_mimetype():
+    """Mimetype jsonify produces for the current request."""
+    if msgpack is None or not has_request_context():
+        return "application/json"
+    # JSON wins ties, so only an explicit Accept gets MessagePack
+    return request.accept_mimetypes.best_match(["application/json", MSGPACK_MIMETYPE]) or "application/json"
+
+def dumps(obj):
+    """JSON text with the same encoding rules as jsonify."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode("utf-8")
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+class FastJSONProvider(JSONProvider):
+    """jsonify through orjson (datetimes as ISO 8601), or MessagePack when asked for."""
+
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if negotiated_mimetype() == MSGPACK_MIMETYPE:
+            body = msgpack.packb(obj, default=_default, use_bin_type=True)
+            response = self._app.response_class(body, mimetype=MSGPACK_MIMETYPE)
+        elif orjson is not None:
+            body = orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+            response = self._app.response_class(body, mimetype=self.mimetype)
+        else:
+            response = self._app.response_class(self.dumps(obj) + "\n", mimetype=self.mimetype)
+
+        if msgpack is not None:
+            response.vary.add("Accept")
+        return response
+
+def negotiated_encoding():
+    """Content-Encoding compress_response applies to a large enough body, or None."""
+    accept = request.accept_encodings
+    if brotli is not None and accept["br"]:
+        return "br"
+    if accept["gzip"]:
+        return "gzip"
+    return None
+
+def compress_response(response):
+    """after_request hook: brotli/gzip bodies above COMPRESSION_MIN_BYTES."""
+    response.vary.add("Accept-Encoding")
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    body = response.get_data()
+    if len(body) < config.COMPRESSION_MIN_BYTES:
+        return response
+
+    encoding = negotiated_encoding()
+    if encoding == "br":
+        compressed = brotli.compress(body, quality=config.BROTLI_QUALITY)
+    elif encoding == "gzip":
+        compressed = gzip.compress(body, compresslevel=config.GZIP_LEVEL)
+    else:
+        return response
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+def init_response_layer(app):
+    app.json = FastJSONProvider(app)
+    app.after_request(compress_response)
@@ -0,0 +1,88 @@
+# backend/search_index.py
+
+import re
+
+from sqlalchemy import text
+
+FTS_TABLE = "candidate_profiles_fts"
+FTS_COLUMNS = ["name", "city", "position", "experiences", "about"]
+# bm25 weights, same order as FTS_COLUMNS
+FTS_WEIGHTS = [10.0, 2.0, 5.0, 3.0, 1.0]
+
+# Joined onto candidate_profiles_joined by the search endpoints; exposes
+# search_rank (lower is better) for ORDER BY.
+SEARCH_JOIN = f"""
+JOIN (
+    SELECT rowid AS search_rowid, bm25({FTS_TABLE}, {', '.join(str(w) for w in FTS_WEIGHTS)}) AS search_rank
+    FROM {FTS_TABLE}
+    WHERE {FTS_TABLE} MATCH :fts_query
+) AS search ON search.search_rowid = candidate_profiles_joined.rowid"""
+
+_PHRASE_OR_WORD = re.compile(r'"([^"]*)"|(\w+)', re.UNICODE)
+_WORD = re.compile(r'\w', re.UNICODE)
+
+def create_search_index(conn):
+    """Create the FTS5 table and its sync triggers, then rebuild its contents.
+
+    Must run after every rebuild of candidate_profiles_joined: replacing the
+    table drops the triggers and renumbers rowids.
+    """
+    columns = ", ".join(FTS_COLUMNS)
+    new_values = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_values = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+
+    conn.execute(text(f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {columns},
+        content='candidate_profiles_joined',
+        content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """))
+
+    conn.execute(text(f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON candidate_profiles_joined BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.rowid, {new_values});
+    END
+    """))
+    conn.execute(text(f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON candidate_profiles_joined BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+    END
+    """))
+    conn.execute(text(f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON candidate_profiles_joined BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+        INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.rowid, {new_values});
+    END
+    """))
+
+    rebuild_search_index(conn)
+
+def rebuild_search_index(conn):
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+def build_match_query(search_term, field=None):
+    """Turn UI search text into an FTS5 MATCH expression.
+
+    "quoted text" matches as a phrase, bare words match as prefixes, and all
+    parts must match. Returns None when nothing searchable is left, including
+    phrases without a word character (the tokenizer drops them).
+    """
+    parts = []
+    for phrase, word in _PHRASE_OR_WORD.findall(search_term or ""):
+        if _WORD.search(phrase):
+            parts.append('"' + phrase.strip().replace('"', '""') + '"')
+        elif word:
+            parts.append(f'"{word}"*')
+
+    if not parts:
+        return None
+
+    query = " AND ".join(parts)
+    if field:
+        if field not in FTS_COLUMNS:
+            raise ValueError(f"Field {field} is not searchable")
+        query = f"{field} : ({query})"
+    return query
@@ -0,0 +1,25 @@
+# backend/table_versions.py
+
+from sqlalchemy import text
+
+def bump_table_version(conn, table_name):
+    """Increment table_name's version; call inside the write's own transaction.
+
+    conn may be a Session or a Connection.
+    """
+    conn.execute(text("""
+    INSERT INTO table_versions (table_name, version) VALUES (:table_name, 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1
+    """), {"table_name": table_name})
+
+def get_table_versions(conn, table_names):
+    """Return {table_name: version}; tables never written report 0."""
+    params = {f"t{i}": name for i, name in enumerate(table_names)}
+    placeholders = ", ".join(f":{key}" for key in params)
+    rows = conn.execute(
+        text(f"SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})"),
+        params
+    ).fetchall()
+    versions = {name: 0 for name in table_names}
+    versions.update({row[0]: row[1] for row in rows})
+    return versions
@@ -0,0 +1,63 @@
+# backend/task_store.py
+#
+# Status of background recommendation jobs. The job runs in the executor of
+# whichever worker accepted it, but the client may poll any worker, so the
+# outcome is kept in the database rather than in process memory.
+
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+import config
+from db_connection import get_engine
+from responses import dumps
+
+def _purge_expired(conn, now):
+    """Delete tasks whose client stopped polling; returns the number removed."""
+    cutoff = now - timedelta(hours=config.RECOMMENDATION_TASK_TTL_HOURS)
+    return conn.execute(
+        text("DELETE FROM recommendation_tasks WHERE updated_at < :cutoff"), {"cutoff": cutoff}
+    ).rowcount
+
+def create_task(task_id, job_id):
+    now = datetime.now()
+    with get_engine().begin() as conn:
+        # Rows normally go when their outcome is reported; this catches abandoned ones
+        _purge_expired(conn, now)
+        conn.execute(text("""
+        INSERT INTO recommendation_tasks (task_id, job_id, status, created_at, updated_at)
+        VALUES (:task_id, :job_id, 'processing', :now, :now)
+        """), {"task_id": task_id, "job_id": job_id, "now": now})
+
+def _finish_task(task_id, status, result=None, error=None):
+    with get_engine().begin() as conn:
+        conn.execute(text("""
+        UPDATE recommendation_tasks
+        SET status = :status, result = :result, error = :error, updated_at = :now
+        WHERE task_id = :task_id
+        """), {"task_id": task_id, "status": status, "result": result, "error": error, "now": datetime.now()})
+
+def complete_task(task_id, result):
+    _finish_task(task_id, "complete", result=dumps(result))
+
+def fail_task(task_id, error):
+    _finish_task(task_id, "error", error=error)
+
+def get_task(task_id):
+    """{"status", "result", "error"} for task_id (result decoded), or None if unknown."""
+    with get_engine().connect() as conn:
+        row = conn.execute(
+            text("SELECT status, result, error FROM recommendation_tasks WHERE task_id = :task_id"),
+            {"task_id": task_id}
+        ).mappings().first()
+    if row is None:
+        return None
+    task = dict(row)
+    if task["result"] is not None:
+        task["result"] = json.loads(task["result"])
+    return task
+
+def delete_task(task_id):
+    with get_engine().begin() as conn:
+        conn.execute(text("DELETE FROM recommendation_tasks WHERE task_id = :task_id"), {"task_id": task_id})
@@ -0,0 +1,69 @@
+# backend/tests/conftest.py
+#
+# Every test run gets its own SQLite file; DATABASE_URL has to be set before
+# db_connection is first imported.
+
+import os
+import sqlite3
+import tempfile
+
+_scratch = tempfile.TemporaryDirectory(prefix="recruitment-tests-")
+DB_PATH = os.path.join(_scratch.name, "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["AUDIT_LOG_SYNC"] = "1"
+
+import pytest
+from sqlalchemy import text
+
+from benchmarks.synthetic import generate_feed
+
+CLEARED_TABLES = [
+    "person_raw", "experience_raw", "education_raw", "certifications_raw", "languages_raw", "courses_raw",
+    "candidate_profiles_joined", "candidate_profiles_audit_log", "candidate_profiles_audit_summary",
+    "job_postings_raw", "ner_training_data", "recommendation_tasks", "recommendation_results", "hires",
+]
+
+@pytest.fixture
+def db():
+    """Migrated, emptied database; yields the engine."""
+    from db_connection import get_engine
+    from migrations import upgrade
+
+    engine = get_engine()
+    upgrade(engine)
+    with engine.begin() as conn:
+        for table in CLEARED_TABLES:
+            conn.execute(text(f"DELETE FROM {table}"))
+    yield engine
+
+@pytest.fixture
+def feed():
+    return generate_feed(60, seed=7)
+
+@pytest.fixture
+def joined(db, feed):
+    """The feed ingested and joined into candidate_profiles_joined."""
+    from data_fetching import normalize_and_insert
+    from join_profiles import create_joined_profiles
+
+    normalize_and_insert(feed)
+    create_joined_profiles()
+    return feed
+
+@pytest.fixture
+def client(db):
+    from app import create_app
+
+    return create_app(preload=False).test_client()
+
+def commit_audit_row(timeout=5.0):
+    """Commit one audit row from a separate connection, like the audit writer thread."""
+    conn = sqlite3.connect(DB_PATH, timeout=timeout)
+    try:
+        conn.execute(
+            "INSERT INTO candidate_profiles_audit_log (audit_id, record_id, operation, status) "
+            "VALUES (lower(hex(randomblob(16))), 'N/A', 'TEST', 'SUCCESS')"
+        )
+        conn.commit()
+    finally:
+        conn.close()
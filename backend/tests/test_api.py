@@ -0,0 +1,52 @@
+# backend/tests/test_api.py
+
+import pytest
+from sqlalchemy import text
+
+def _record_ids(db, limit):
+    with db.connect() as conn:
+        return conn.execute(
+            text("SELECT record_id FROM candidate_profiles_joined ORDER BY record_id LIMIT :limit"), {"limit": limit}
+        ).scalars().all()
+
+def test_list_candidates_filters_by_ids(client, db, joined):
+    ids = _record_ids(db, 3)
+    response = client.get(f"/api/candidates?ids={','.join(ids)}&fields=record_id,name")
+    assert response.status_code == 200
+    assert sorted(c["record_id"] for c in response.get_json()) == ids
+
+def test_list_candidates_rejects_too_many_ids(client, db):
+    response = client.get("/api/candidates?ids=" + ",".join(str(i) for i in range(501)))
+    assert response.status_code == 400
+
+def test_etag_depends_on_negotiated_encoding(client, joined):
+    plain = client.get("/api/candidates?limit=5")
+    gzipped = client.get("/api/candidates?limit=5", headers={"Accept-Encoding": "gzip"})
+    assert plain.headers["ETag"] != gzipped.headers["ETag"]
+    assert {"Accept", "Accept-Encoding"} <= set(plain.vary)
+
+    cached = client.get("/api/candidates?limit=5", headers={"If-None-Match": plain.headers["ETag"]})
+    assert cached.status_code == 304
+    assert {"Accept", "Accept-Encoding"} <= set(cached.vary)
+    # A client that now accepts gzip must not be told its identity copy is current
+    changed = client.get(
+        "/api/candidates?limit=5", headers={"If-None-Match": plain.headers["ETag"], "Accept-Encoding": "gzip"}
+    )
+    assert changed.status_code == 200
+
+def test_etag_depends_on_negotiated_mimetype(client, joined):
+    pytest.importorskip("msgpack")
+    as_json = client.get("/api/candidates?limit=5")
+    as_msgpack = client.get("/api/candidates?limit=5", headers={"Accept": "application/x-msgpack"})
+    assert as_msgpack.mimetype == "application/x-msgpack"
+    assert as_json.headers["ETag"] != as_msgpack.headers["ETag"]
+
+@pytest.mark.parametrize("path", ["/api/candidates", "/api/candidates/filter"])
+@pytest.mark.parametrize("search", ["++", '"--"', "*"])
+def test_search_without_words_matches_nothing(client, joined, path, search):
+    listed = client.get(path, query_string={"search": search})
+    assert listed.status_code == 200
+    assert listed.get_json() == []
+
+    page = client.get(path, query_string={"search": search, "limit": 10}).get_json()
+    assert page["items"] == [] and page["total"] == 0
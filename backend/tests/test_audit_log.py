@@ -0,0 +1,126 @@
+# backend/tests/test_audit_log.py
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import text
+
+import audit_log
+from audit_log import AuditWriter, TIMESTAMP_FORMAT, compact_audit_log, query_audit_log, write_audit_entries
+from db_connection import get_session
+from pagination import Page
+
+def _entry(when, operation="INSERT", status="SUCCESS", record_id="N/A"):
+    stamp = when.strftime(TIMESTAMP_FORMAT)
+    return {
+        "audit_id": str(uuid4()), "record_id": record_id, "operation": operation, "status": status,
+        "error_message": "", "utc_timestamp": stamp, "swedish_timestamp": stamp,
+    }
+
+def _summary(db):
+    with db.connect() as conn:
+        return {
+            (row.month, row.operation, row.status): row.entry_count
+            for row in conn.execute(text("SELECT * FROM candidate_profiles_audit_summary"))
+        }
+
+def _remaining(db):
+    with db.connect() as conn:
+        return conn.execute(text("SELECT COUNT(*) FROM candidate_profiles_audit_log")).scalar()
+
+def test_compacting_twice_does_not_double_count(db):
+    now = datetime.utcnow()
+    old = datetime(now.year - 1, 3, 10)
+    write_audit_entries([
+        _entry(old), _entry(old + timedelta(days=1)), _entry(old, status="FAILED"),
+        _entry(now - timedelta(days=1)), _entry(now - timedelta(days=2), operation="DELETE"),
+    ])
+
+    assert compact_audit_log(older_than_days=30) == 3
+    month = old.strftime("%Y-%m")
+    assert _summary(db) == {(month, "INSERT", "SUCCESS"): 2, (month, "INSERT", "FAILED"): 1}
+    assert _remaining(db) == 2  # Only the compacted range is deleted
+
+    # Nothing new to compact: the summary must stay as it is
+    assert compact_audit_log(older_than_days=30) == 0
+    assert _summary(db) == {(month, "INSERT", "SUCCESS"): 2, (month, "INSERT", "FAILED"): 1}
+
+    # A late entry for the same month is added to its existing summary row
+    write_audit_entries([_entry(old + timedelta(days=5))])
+    assert compact_audit_log(older_than_days=30) == 1
+    assert _summary(db)[(month, "INSERT", "SUCCESS")] == 3
+    assert _remaining(db) == 2
+
+def test_summary_keeps_first_and_last_timestamps(db):
+    old = datetime(datetime.utcnow().year - 1, 3, 10)
+    write_audit_entries([_entry(old + timedelta(days=3))])
+    compact_audit_log(older_than_days=30)
+    write_audit_entries([_entry(old), _entry(old + timedelta(days=9))])
+    compact_audit_log(older_than_days=30)
+
+    with db.connect() as conn:
+        first, last = conn.execute(text(
+            "SELECT first_utc_timestamp, last_utc_timestamp FROM candidate_profiles_audit_summary"
+        )).one()
+    assert str(first).startswith(old.strftime("%Y-%m-%d"))
+    assert str(last).startswith((old + timedelta(days=9)).strftime("%Y-%m-%d"))
+
+def test_query_filters_and_pages_newest_first(db):
+    now = datetime.utcnow()
+    write_audit_entries([_entry(now - timedelta(minutes=i), record_id=f"r{i}") for i in range(5)])
+    write_audit_entries([_entry(now, operation="DELETE", record_id="r9")])
+
+    session = get_session()
+    try:
+        first = query_audit_log(session, operation="INSERT", page=Page(3, None, True))
+        second = query_audit_log(session, operation="INSERT", page=Page(3, first["next_cursor"], False))
+        deleted = query_audit_log(session, record_id="r9")
+    finally:
+        session.close()
+
+    assert [item["record_id"] for item in first["items"]] == ["r0", "r1", "r2"]
+    assert first["total"] == 5
+    assert [item["record_id"] for item in second["items"]] == ["r3", "r4"]
+    assert second["next_cursor"] is None
+    assert [item["operation"] for item in deleted["items"]] == ["DELETE"]
+
+def _recording_writes(monkeypatch):
+    batches = []
+
+    def write(entries):
+        batches.append(len(entries))
+        write_audit_entries(entries)
+
+    monkeypatch.setattr(audit_log, "write_audit_entries", write)
+    return batches
+
+def test_buffered_writer_batches_until_flushed(db, monkeypatch):
+    batches = _recording_writes(monkeypatch)
+    writer = AuditWriter(batch_size=10, flush_interval=0.05)
+    try:
+        for _ in range(25):
+            writer.submit(_entry(datetime.utcnow()))
+        writer.flush()
+        assert _remaining(db) == 25
+        assert sum(batches) == 25
+        assert len(batches) < 25
+    finally:
+        writer.close()
+    assert writer._thread is None
+
+def test_close_writes_what_is_still_queued(db, monkeypatch):
+    _recording_writes(monkeypatch)
+    writer = AuditWriter(batch_size=1000, flush_interval=60)
+    writer.submit(_entry(datetime.utcnow()))
+    writer.close()
+    assert _remaining(db) == 1
+
+def test_full_queue_writes_inline(db, monkeypatch):
+    batches = _recording_writes(monkeypatch)
+    writer = AuditWriter(max_queue=1)
+    # No consumer thread: the first entry fills the queue
+    monkeypatch.setattr(writer, "_ensure_thread", lambda: None)
+    writer.submit(_entry(datetime.utcnow()))
+    writer.submit(_entry(datetime.utcnow()))
+    assert batches == [1]
+    assert _remaining(db) == 1
@@ -0,0 +1,60 @@
+# backend/tests/test_conditional.py
+
+from matching.evaluation import store_predictions
+from table_versions import bump_table_version, get_table_versions
+
+def _revalidate(client, path, response):
+    return client.get(path, headers={"If-None-Match": response.headers["ETag"]})
+
+def test_table_versions_start_at_zero_and_bump(db):
+    with db.begin() as conn:
+        before = get_table_versions(conn, ["candidate_profiles_joined", "never_written"])
+        bump_table_version(conn, "candidate_profiles_joined")
+        after = get_table_versions(conn, ["candidate_profiles_joined", "never_written"])
+    assert after["candidate_profiles_joined"] == before["candidate_profiles_joined"] + 1
+    assert before["never_written"] == after["never_written"] == 0
+
+def test_unchanged_list_answers_304(client, joined):
+    first = client.get("/api/candidates")
+    assert first.status_code == 200
+    assert first.cache_control.no_cache
+
+    cached = _revalidate(client, "/api/candidates", first)
+    assert cached.status_code == 304
+    assert cached.get_data() == b""
+    assert cached.headers["ETag"] == first.headers["ETag"]
+    # The query string is part of the key
+    assert _revalidate(client, "/api/candidates?sort_by=name", first).status_code == 200
+
+def test_candidate_writes_change_the_etag(client, joined):
+    first = client.get("/api/candidates")
+    created = client.post("/api/candidates", json={"name": "Ada Lovelace", "city": "London"})
+    assert created.status_code == 201
+    second = _revalidate(client, "/api/candidates", first)
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+
+    record_id = created.get_json()["record_id"]
+    client.put(f"/api/candidates/{record_id}", json={"city": "Paris"})
+    assert _revalidate(client, "/api/candidates", second).status_code == 200
+
+def test_etag_only_tracks_the_tables_a_route_reads(client, joined):
+    jobs = client.get("/api/job_postings")
+    client.post("/api/candidates", json={"name": "Ada Lovelace"})
+    assert _revalidate(client, "/api/job_postings", jobs).status_code == 304
+
+    client.post("/job_postings", json={"title": "Data Engineer"})
+    assert _revalidate(client, "/api/job_postings", jobs).status_code == 200
+
+def test_stored_predictions_change_the_etag(client, db):
+    path = "/api/recommendations/details/job-1"
+    first = client.get(path)
+    store_predictions("job-1", [{"record_id": "r-1", "score": 0.5}])
+    second = _revalidate(client, path, first)
+    assert second.status_code == 200
+    assert [row["candidate_id"] for row in second.get_json()] == ["r-1"]
+
+def test_errors_carry_no_etag(client, db):
+    response = client.get("/api/candidates?fields=nope")
+    assert response.status_code == 400
+    assert "ETag" not in response.headers
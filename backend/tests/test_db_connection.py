@@ -0,0 +1,45 @@
+# backend/tests/test_db_connection.py
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool, StaticPool
+
+import config
+from db_connection import create_db_engine
+
+def _pragma(conn, name):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+def test_file_engine_applies_the_sqlite_profile(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/profile.db")
+    try:
+        assert isinstance(engine.pool, QueuePool)
+        assert engine.pool.size() == config.DB_POOL_SIZE
+        with engine.connect() as conn:
+            assert _pragma(conn, "journal_mode").upper() == config.SQLITE_JOURNAL_MODE.upper()
+            assert _pragma(conn, "busy_timeout") == config.SQLITE_BUSY_TIMEOUT_MS
+            assert _pragma(conn, "synchronous") == 1  # NORMAL
+            assert _pragma(conn, "cache_size") == -config.SQLITE_CACHE_SIZE_KB
+            assert _pragma(conn, "temp_store") == 2  # MEMORY
+    finally:
+        engine.dispose()
+
+def test_every_pooled_connection_gets_the_profile(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/pooled.db")
+    try:
+        with engine.connect() as first, engine.connect() as second:
+            assert _pragma(first, "busy_timeout") == config.SQLITE_BUSY_TIMEOUT_MS
+            assert _pragma(second, "busy_timeout") == config.SQLITE_BUSY_TIMEOUT_MS
+    finally:
+        engine.dispose()
+
+def test_memory_engine_shares_one_database():
+    engine = create_db_engine("sqlite://")
+    try:
+        assert isinstance(engine.pool, StaticPool)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT x FROM t")).scalar() == 1
+    finally:
+        engine.dispose()
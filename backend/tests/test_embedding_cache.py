@@ -0,0 +1,46 @@
+# backend/tests/test_embedding_cache.py
+
+from sqlalchemy import text
+
+from matching.embedding_cache import EmbeddingCache
+from profile_text import hash_match_text
+
+def _counting_cache(max_size=10):
+    encoded = []
+
+    def encode(value):
+        encoded.append(value)
+        return f"vector({value})"
+
+    return EmbeddingCache(encode, max_size), encoded
+
+def test_unchanged_match_text_is_encoded_once():
+    cache, encoded = _counting_cache()
+    stored_hash = hash_match_text("python developer")
+
+    assert cache.get("python developer", stored_hash) == "vector(python developer)"
+    assert cache.get("python developer", stored_hash) == "vector(python developer)"
+    assert cache.get("python developer") == "vector(python developer)"  # Hashed here, same key
+    assert cache.get("java developer") == "vector(java developer)"
+    assert encoded == ["python developer", "java developer"]
+
+def test_least_recently_used_entry_is_evicted():
+    cache, encoded = _counting_cache(max_size=2)
+    cache.get("a")
+    cache.get("b")
+    cache.get("a")
+    cache.get("c")  # Evicts "b"
+    cache.get("a")
+    cache.get("b")
+    assert encoded == ["a", "b", "c", "b"]
+    assert len(cache) == 2
+
+def test_stored_match_text_hash_follows_api_updates(client, joined, db):
+    with db.connect() as conn:
+        record_id = conn.execute(text("SELECT record_id FROM candidate_profiles_joined LIMIT 1")).scalar()
+    assert client.put(f"/api/candidates/{record_id}", json={"city": "Kiruna, Norrbotten"}).status_code == 200
+
+    with db.connect() as conn:
+        rows = conn.execute(text("SELECT match_text, match_text_hash FROM candidate_profiles_joined")).fetchall()
+    assert any("Kiruna" in match_text for match_text, _ in rows)
+    assert all(match_text_hash == hash_match_text(match_text) for match_text, match_text_hash in rows)
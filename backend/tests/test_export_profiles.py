@@ -0,0 +1,61 @@
+# backend/tests/test_export_profiles.py
+
+import gzip
+import json
+
+import pytest
+from sqlalchemy import text
+
+from export_profiles import FIELDS_TO_EXPORT, export_profiles, parse_export_fields
+
+FIELDS = ["record_id", "name", "about", "total_experience_years"]
+
+def _db_rows(db):
+    with db.connect() as conn:
+        rows = conn.execute(text(f"SELECT {', '.join(FIELDS)} FROM candidate_profiles_joined")).mappings()
+        return sorted((dict(row) for row in rows), key=lambda row: row["record_id"])
+
+def _as_json(rows):
+    return [{field: "" if value is None else value for field, value in row.items()} for row in rows]
+
+def _sorted(rows):
+    return sorted(rows, key=lambda row: row["record_id"])
+
+def test_parse_export_fields():
+    assert parse_export_fields(None) == ["record_id"] + FIELDS_TO_EXPORT
+    assert parse_export_fields("name, record_id") == ["record_id", "name"]
+    with pytest.raises(ValueError):
+        parse_export_fields("name,skills")
+
+def test_json_formats_match_the_database(db, joined, tmp_path):
+    expected = _as_json(_db_rows(db))
+    assert any(row["about"] == "" for row in expected)  # The feed has profiles without about
+
+    assert export_profiles(tmp_path / "out.json", "json", FIELDS, batch_size=7) == len(expected)
+    assert _sorted(json.loads((tmp_path / "out.json").read_text())) == expected
+
+    assert export_profiles(tmp_path / "out.jsonl", "jsonl", FIELDS, batch_size=7) == len(expected)
+    lines = (tmp_path / "out.jsonl").read_text().splitlines()
+    assert _sorted(json.loads(line) for line in lines) == expected
+
+    assert export_profiles(tmp_path / "out.jsonl.gz", "jsonl.gz", FIELDS, batch_size=7) == len(expected)
+    with gzip.open(tmp_path / "out.jsonl.gz", "rt", encoding="utf-8") as handle:
+        assert _sorted(json.loads(line) for line in handle) == expected
+
+def test_parquet_keeps_nulls_and_types(db, joined, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    expected = _db_rows(db)
+
+    assert export_profiles(tmp_path / "out.parquet", "parquet", FIELDS, batch_size=7) == len(expected)
+    table = pq.read_table(tmp_path / "out.parquet")
+    assert table.column_names == FIELDS
+    assert str(table.schema.field("total_experience_years").type) == "int64"
+    assert _sorted(table.to_pylist()) == expected
+
+def test_empty_table_exports_an_empty_array(db, tmp_path):
+    assert export_profiles(tmp_path / "out.json", "json", FIELDS) == 0
+    assert json.loads((tmp_path / "out.json").read_text()) == []
+
+def test_unknown_format_is_rejected(db, tmp_path):
+    with pytest.raises(ValueError):
+        export_profiles(tmp_path / "out.csv", "csv", FIELDS)
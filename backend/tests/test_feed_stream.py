@@ -0,0 +1,69 @@
+# backend/tests/test_feed_stream.py
+
+import json
+
+import pytest
+from sqlalchemy import text
+
+import data_fetching
+from data_fetching import ingest_stream
+from feed_stream import conditional_headers, iter_json_array, stream_feed
+
+def _one_char_chunks(value):
+    return iter(list(value))
+
+@pytest.mark.parametrize("records", [[], [1, 22, 333], [{"a": "x, ]"}, [1, [2]], "q\"uote", None, 1.5e3, -2.5e-3, 10]])
+def test_iter_json_array_survives_any_chunking(records):
+    raw = " \n" + json.dumps(records, indent=1) + "\n"
+    assert list(iter_json_array(_one_char_chunks(raw))) == records
+    assert list(iter_json_array([raw])) == records
+
+@pytest.mark.parametrize("raw", ["{}", "[1, 2", "[1 2]", "[1,"])
+def test_iter_json_array_rejects_malformed_feeds(raw):
+    with pytest.raises(ValueError):
+        list(iter_json_array(_one_char_chunks(raw)))
+
+def test_stream_feed_decodes_across_byte_chunks(tmp_path):
+    records = [{"name": "Åsa Öberg"}, {"name": "Łukasz"}]
+    path = tmp_path / "feed.json"
+    path.write_bytes(b"\xef\xbb\xbf" + json.dumps(records, ensure_ascii=False).encode("utf-8"))
+    assert list(stream_feed(str(path), read_bytes=3)) == records
+
+def test_conditional_headers():
+    assert conditional_headers(None) == {}
+    assert conditional_headers({"etag": '"v1"', "last_modified": None}) == {"If-None-Match": '"v1"'}
+
+def _progress(db):
+    with db.connect() as conn:
+        return conn.execute(text("SELECT records_done FROM feed_ingest_state")).scalars().all()
+
+def test_interrupted_stream_resumes_where_it_stopped(db, feed, tmp_path, monkeypatch):
+    path = tmp_path / "feed.json"
+    path.write_text(json.dumps(feed))
+
+    def interrupted(source, validators=None):
+        for i, record in enumerate(stream_feed(source, validators=validators)):
+            if i == 25:
+                raise ConnectionError("connection reset")
+            yield record
+
+    monkeypatch.setattr(data_fetching, "stream_feed", interrupted)
+    with pytest.raises(Exception, match="connection reset"):
+        ingest_stream(str(path), chunk_size=10)
+    assert _progress(db) == [20]
+
+    monkeypatch.setattr(data_fetching, "stream_feed", stream_feed)
+    changed = ingest_stream(str(path), chunk_size=10)
+    assert changed == [record["linkedin_num_id"] for record in feed[20:]]
+    assert _progress(db) == []
+    with db.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM person_raw")).scalar() == len(feed)
+
+def test_restart_ignores_saved_progress(db, feed, tmp_path):
+    path = tmp_path / "feed.json"
+    path.write_text(json.dumps(feed))
+    with db.begin() as conn:
+        data_fetching._save_records_done(conn, str(path), 50)
+
+    assert len(ingest_stream(str(path), chunk_size=10, resume=False)) == len(feed)
+    assert _progress(db) == []
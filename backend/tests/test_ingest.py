@@ -0,0 +1,81 @@
+# backend/tests/test_ingest.py
+
+import threading
+
+from sqlalchemy import event, text
+
+from conftest import commit_audit_row
+from data_fetching import normalize_and_insert
+
+def test_commit_between_hash_read_and_upsert(db, feed):
+    """Another connection committing mid-upsert must not fail the ingest."""
+    writer = None
+
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        nonlocal writer
+        if writer is None and "p.content_hash" in statement:
+            writer = threading.Thread(target=commit_audit_row)
+            writer.start()
+            # Give it the chance to commit before the UPSERT, as it would
+            # in a deferred transaction
+            writer.join(timeout=0.5)
+
+    event.listen(db, "after_cursor_execute", after_execute)
+    try:
+        changed = normalize_and_insert(feed)
+    finally:
+        event.remove(db, "after_cursor_execute", after_execute)
+    writer.join()
+
+    assert len(changed) == len(feed)
+    with db.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM person_raw")).scalar() == len(feed)
+        assert conn.execute(text(
+            "SELECT COUNT(*) FROM candidate_profiles_audit_log WHERE operation = 'TEST'"
+        )).scalar() == 1
+
+def test_unchanged_feed_writes_nothing(db, feed):
+    normalize_and_insert(feed)
+    assert normalize_and_insert(feed) == []
+
+def _titles(db, table, person_id):
+    with db.connect() as conn:
+        return conn.execute(
+            text(f"SELECT title FROM {table} WHERE person_id = :person_id ORDER BY title"), {"person_id": person_id}
+        ).scalars().all()
+
+def test_changed_person_gets_its_children_replaced(db, feed):
+    normalize_and_insert(feed)
+    changed = dict(feed[0], languages=[{"title": "Finnish"}], certifications=[])
+    person_id = changed["linkedin_num_id"]
+
+    assert normalize_and_insert([changed] + feed[1:]) == [person_id]
+    assert _titles(db, "languages_raw", person_id) == ["Finnish"]
+    assert _titles(db, "certifications_raw", person_id) == []
+    # Unchanged persons keep their rows
+    other = feed[1]
+    assert _titles(db, "languages_raw", other["linkedin_num_id"]) == sorted(
+        language["title"] for language in other["languages"]
+    )
+
+def test_repeated_person_keeps_its_last_occurrence(db, feed):
+    person = feed[0]
+    renamed = dict(person, name="Renamed")
+    assert normalize_and_insert([person, renamed]) == [person["linkedin_num_id"]]
+    with db.connect() as conn:
+        names = conn.execute(text("SELECT name FROM person_raw")).scalars().all()
+    assert names == ["Renamed"]
+
+def test_records_without_an_id_are_skipped(db, feed):
+    missing = dict(feed[0], linkedin_num_id=None)
+    assert normalize_and_insert([missing, feed[1]]) == [feed[1]["linkedin_num_id"]]
+
+def test_small_chunks_write_the_same_rows(db, feed):
+    assert len(normalize_and_insert(feed, chunk_size=7)) == len(feed)
+    with db.connect() as conn:
+        chunked = conn.execute(text("SELECT COUNT(*) FROM experience_raw")).scalar()
+        conn.execute(text("DELETE FROM person_raw"))
+        conn.commit()
+    normalize_and_insert(feed)
+    with db.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM experience_raw")).scalar() == chunked
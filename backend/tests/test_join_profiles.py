@@ -0,0 +1,175 @@
+# backend/tests/test_join_profiles.py
+
+import threading
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+import join_profiles
+from conftest import commit_audit_row
+from data_fetching import normalize_and_insert
+from join_profiles import create_joined_profiles, update_joined_profiles
+from profile_text import PROFILE_CONTENT_FIELDS, hash_profile_content
+
+def test_incremental_join_survives_concurrent_commit(db, feed, monkeypatch):
+    normalize_and_insert(feed)
+    create_joined_profiles()
+    writers = []
+    build_profiles = join_profiles.build_profiles
+
+    def build_with_commit(raw):
+        # Another connection commits after the raw reads, before the upsert
+        writer = threading.Thread(target=commit_audit_row)
+        writer.start()
+        writer.join(timeout=0.5)
+        writers.append(writer)
+        return build_profiles(raw)
+
+    monkeypatch.setattr(join_profiles, "build_profiles", build_with_commit)
+    feed[0]["about"] = "Changed about text"
+    changed = normalize_and_insert(feed)
+    assert update_joined_profiles(changed) == 1
+    for writer in writers:
+        writer.join()
+
+    with db.connect() as conn:
+        about = conn.execute(
+            text("SELECT about FROM candidate_profiles_joined WHERE person_id = :person_id"),
+            {"person_id": feed[0]["linkedin_num_id"]}
+        ).scalar()
+    assert about == "Changed about text"
+
+def test_full_rebuild_records_validation_audit(db, feed):
+    normalize_and_insert(feed)
+    create_joined_profiles(backend="pandas")
+
+    with db.connect() as conn:
+        statuses = dict(conn.execute(text(
+            "SELECT operation, status FROM candidate_profiles_audit_log "
+            "WHERE operation IN ('VALIDATION_JOINED_TABLE', 'SAVE_JOINED_TABLE')"
+        )).fetchall())
+    assert statuses == {"VALIDATION_JOINED_TABLE": "SUCCESS", "SAVE_JOINED_TABLE": "SUCCESS"}
+
+def test_insert_chunk_size_stays_under_variable_limit(monkeypatch):
+    monkeypatch.setattr(join_profiles.config, "JOIN_INSERT_CHUNK_SIZE", 10_000)
+    monkeypatch.setattr(join_profiles.config, "SQLITE_MAX_VARIABLES", 999)
+    assert join_profiles.insert_chunk_size() * len(join_profiles.JOINED_COLUMNS) <= 999
+
+def test_sql_rebuild_counts_persons_with_the_build(db, feed, monkeypatch):
+    normalize_and_insert(feed[:-1])
+    ingest = threading.Thread(target=normalize_and_insert, args=(feed,))
+    build_sql = join_profiles._joined_profiles_sql
+    begin_immediate = join_profiles.begin_immediate
+
+    def build_then_ingest(*args, **kwargs):
+        ingest.start()  # Waits for the build's write lock
+        return build_sql(*args, **kwargs)
+
+    def begin_after_ingest(conn):
+        # Let the ingest commit before the validation transaction starts
+        if ingest.is_alive():
+            ingest.join()
+        begin_immediate(conn)
+
+    monkeypatch.setattr(join_profiles, "_joined_profiles_sql", build_then_ingest)
+    monkeypatch.setattr(join_profiles, "begin_immediate", begin_after_ingest)
+    assert create_joined_profiles(backend="sql") == len(feed) - 1
+
+def _pre_vectorized_profiles(raw):
+    """The join as it was before aggregate_titles and content_hash were batched."""
+    experience_df = raw['experience_raw']
+    experience_df['start_date'] = join_profiles.parse_feed_dates(experience_df['start_date'])
+    experience_df['end_date'] = join_profiles.parse_feed_dates(experience_df['end_date']).fillna(pd.Timestamp.today())
+    experience_df = experience_df.dropna(subset=['start_date', 'end_date'])
+    experience_df['months'] = (experience_df['end_date'] - experience_df['start_date']).dt.days / 30
+    exp_sum = experience_df.groupby('person_id')['months'].sum().reset_index()
+    exp_sum['total_experience_years'] = (exp_sum['months'] / 12).astype(int)
+
+    def aggregate(df, column, alias):
+        return df.groupby('person_id')[column].apply(lambda x: ", ".join(x.dropna())).reset_index(name=alias)
+
+    profile = raw['person_raw'].merge(exp_sum[['person_id', 'total_experience_years']], on='person_id', how='left')
+    for df, column, alias in [
+        (experience_df, 'title', 'experiences'), (raw['education_raw'], 'degree', 'degrees'),
+        (raw['certifications_raw'], 'title', 'certifications'), (raw['languages_raw'], 'title', 'languages'),
+        (raw['courses_raw'], 'title', 'courses'),
+    ]:
+        profile = profile.merge(aggregate(df, column, alias), on='person_id', how='left')
+    profile['content_hash'] = [
+        hash_profile_content(row) for row in profile[PROFILE_CONTENT_FIELDS].to_numpy(dtype=object)
+    ]
+    return profile
+
+def test_build_profiles_matches_pre_vectorized_join(db, feed):
+    feed[1]['experience'] = []  # No experience: null total_experience_years
+    feed[2]['education'] = [{'degree': None}, {'degree': None}]  # Only null degrees: ''
+    feed[3]['courses'] = [{'title': None}, {'title': 'Statistics'}, {'title': 'Algorithms'}]
+    normalize_and_insert(feed)
+
+    def raw_tables():
+        with db.connect() as conn:
+            return join_profiles.load_raw_tables(conn)
+
+    columns = ['person_id', 'total_experience_years', 'experiences', 'degrees', 'certifications',
+               'languages', 'courses', 'content_hash']
+    expected = _pre_vectorized_profiles(raw_tables())[columns].sort_values('person_id', ignore_index=True)
+    actual = join_profiles.build_profiles(raw_tables())[columns].sort_values('person_id', ignore_index=True)
+
+    assert actual.astype(object).where(actual.notna(), None).to_dict('records') == \
+        expected.astype(object).where(expected.notna(), None).to_dict('records')
+
+def _joined_rows(db):
+    columns = [column for column in join_profiles.JOINED_COLUMNS if column != 'load_date']
+    with db.connect() as conn:
+        return [dict(row) for row in conn.execute(
+            text(f"SELECT {', '.join(columns)} FROM candidate_profiles_joined ORDER BY record_id")
+        ).mappings()]
+
+def test_sql_and_pandas_backends_write_the_same_rows(db, feed):
+    odd_dates = [
+        ("AUG 2019", "Present"), ("aug 2018", "SEP 2020"), ("2017-03-15", "2019-11-30"),
+        ("March 2016", "August 2019"), ("garbage", "2020"), ("Abc 2015", None), ("2014", "Sept 2016"),
+    ]
+    for record, (start_date, end_date) in zip(feed[::5], odd_dates):
+        record["experience"].append({"title": "Odd Dates", "start_date": start_date, "end_date": end_date})
+    normalize_and_insert(feed)
+
+    create_joined_profiles(backend="pandas")
+    pandas_rows = _joined_rows(db)
+    create_joined_profiles(backend="sql")
+    assert _joined_rows(db) == pandas_rows
+
+@pytest.mark.parametrize("backend", ["pandas", "sql"])
+def test_incremental_join_keeps_api_candidates(db, feed, client, monkeypatch, backend):
+    monkeypatch.setattr(join_profiles.config, "JOIN_BACKEND", backend)
+    normalize_and_insert(feed)
+    create_joined_profiles()
+    gone = feed[1]["linkedin_num_id"]
+    created = client.post("/api/candidates", json={"person_id": "api-person", "name": "Added by hand"})
+    shared = client.post("/api/candidates", json={"person_id": gone, "name": "Same person, entered by hand"})
+    assert created.status_code == shared.status_code == 201
+    with db.begin() as conn:
+        for table in join_profiles.RAW_TABLES:
+            conn.execute(text(f"DELETE FROM {table} WHERE person_id = :person_id"), {"person_id": gone})
+
+    create_joined_profiles(["api-person", gone])
+
+    with db.connect() as conn:
+        remaining = set(conn.execute(text(
+            "SELECT record_id FROM candidate_profiles_joined WHERE person_id IN ('api-person', :gone)"
+        ), {"gone": gone}).scalars())
+    # The feed row of the person who left goes; both hand-made rows stay
+    assert remaining == {created.get_json()["record_id"], shared.get_json()["record_id"]}
+
+@pytest.mark.parametrize("backend", ["pandas", "sql"])
+def test_every_join_path_returns_rows_written(db, feed, backend):
+    normalize_and_insert(feed)
+    # Empty joined table: the incremental call falls back to a full rebuild
+    assert create_joined_profiles([feed[0]["linkedin_num_id"]], backend=backend) == len(feed)
+    assert create_joined_profiles(backend=backend) == len(feed)
+    assert create_joined_profiles([], backend=backend) == 0
+    assert create_joined_profiles([feed[0]["linkedin_num_id"]], backend=backend) == 0  # Unchanged
+
+    feed[0]["about"] = "Changed about text"
+    assert create_joined_profiles(normalize_and_insert(feed), backend=backend) == 1
@@ -0,0 +1,47 @@
+# backend/tests/test_match_text.py
+
+import pytest
+from sqlalchemy import text
+
+from data_fetching import normalize_and_insert
+from join_profiles import create_joined_profiles
+from profile_text import MATCH_TEXT_FIELDS, build_match_text, hash_match_text
+
+def test_build_match_text_normalizes_and_skips_missing_fields():
+    profile = {"about": "  Backend\n developer ", "experiences": None, "degrees": float("nan"), "city": "Umeå"}
+    assert build_match_text(profile) == "Backend developer Umeå"
+
+@pytest.mark.parametrize("backend", ["pandas", "sql"])
+def test_joined_rows_store_normalized_match_text(db, feed, backend):
+    feed[0]["about"] = "  Spaced\t\tout   about  "
+    normalize_and_insert(feed)
+    create_joined_profiles(backend=backend)
+
+    with db.connect() as conn:
+        rows = conn.execute(text(
+            f"SELECT {', '.join(MATCH_TEXT_FIELDS)}, match_text, match_text_hash FROM candidate_profiles_joined"
+        )).mappings().all()
+    assert len(rows) == len(feed)
+    for row in rows:
+        assert row["match_text"] == build_match_text(row)
+        assert row["match_text_hash"] == hash_match_text(row["match_text"])
+    assert any(row["match_text"].startswith("Spaced out about ") for row in rows)
+
+def test_api_created_candidate_gets_match_text(client, db):
+    response = client.post("/api/candidates", json={
+        "name": "Hand Made", "about": "Data  engineer", "experiences": "ETL, Spark", "city": "Luleå",
+    })
+    record_id = response.get_json()["record_id"]
+
+    with db.connect() as conn:
+        match_text, match_text_hash = conn.execute(
+            text("SELECT match_text, match_text_hash FROM candidate_profiles_joined WHERE record_id = :record_id"),
+            {"record_id": record_id}
+        ).one()
+    assert match_text == "Data engineer ETL, Spark Luleå"
+    assert match_text_hash == hash_match_text(match_text)
+
+def test_match_text_is_not_exposed_by_the_api(client, joined):
+    item = client.get("/api/candidates?fields=all&limit=1").get_json()["items"][0]
+    assert "match_text" not in item and "match_text_hash" not in item
+    assert client.get("/api/candidates?fields=match_text").status_code == 400
@@ -0,0 +1,75 @@
+# backend/tests/test_metrics.py
+
+import pytest
+
+import metrics
+from metrics import Counter, Histogram, gauge, render, time_inference
+
+@pytest.fixture
+def registered():
+    """Metrics created by a test, dropped from the registry afterwards."""
+    created = []
+    yield created
+    for metric in created:
+        metrics._registry.remove(metric)
+
+def _sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+def test_histogram_buckets_are_cumulative(registered):
+    histogram = Histogram("test_seconds", "Test.", ["kind"], buckets=(0.01, 0.1))
+    registered.append(histogram)
+    for value in (0.003, 0.02, 0.05, 20):
+        histogram.observe(value, kind="a")
+
+    lines = histogram.render()
+    assert lines[:2] == ["# HELP test_seconds Test.", "# TYPE test_seconds histogram"]
+    assert lines[2:5] == [
+        'test_seconds_bucket{kind="a",le="0.01"} 1',
+        'test_seconds_bucket{kind="a",le="0.1"} 3',
+        'test_seconds_bucket{kind="a",le="+Inf"} 4',
+    ]
+    assert lines[5] == f'test_seconds_sum{{kind="a"}} {0.003 + 0.02 + 0.05 + 20!r}'
+    assert lines[6] == 'test_seconds_count{kind="a"} 4'
+
+def test_counter_escapes_label_values(registered):
+    counter = Counter("test_total", "Test.", ["path"])
+    registered.append(counter)
+    counter.inc(path='a"b\\c\nd')
+    counter.inc(2, path='a"b\\c\nd')
+    assert counter.render()[2] == 'test_total{path="a\\"b\\\\c\\nd"} 3'
+
+def test_registering_a_gauge_again_swaps_its_callback(registered):
+    first = gauge("test_gauge", "Test.", lambda: 1)
+    registered.append(first)
+    second = gauge("test_gauge", "Test.", lambda: 2)
+    assert second is first
+    assert [metric.name for metric in metrics._registry].count("test_gauge") == 1
+    assert _sample(render(), "test_gauge") == 2
+
+def test_time_inference_records_duration_and_batch_size():
+    before = _sample(render(), 'model_inference_batch_size_count{model="test-model"}') or 0
+    with time_inference("test-model", batch_size=3):
+        pass
+    text = render()
+    assert _sample(text, 'model_inference_batch_size_count{model="test-model"}') == before + 1
+    assert _sample(text, 'model_inference_duration_seconds_count{model="test-model"}') == before + 1
+
+def test_metrics_endpoint_reports_requests_and_queries(client, joined):
+    before = client.get("/metrics").get_data(as_text=True)
+    route = 'http_request_duration_seconds_count{method="GET",route="/api/candidates/<record_id>",status="404"}'
+    selects = 'db_query_duration_seconds_count{operation="SELECT"}'
+
+    client.get("/api/candidates/missing-1")
+    client.get("/api/candidates/missing-2")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type == metrics.CONTENT_TYPE
+
+    after = response.get_data(as_text=True)
+    # Labelled by the URL rule, not the path
+    assert _sample(after, route) == (_sample(before, route) or 0) + 2
+    assert _sample(after, selects) > (_sample(before, selects) or 0)
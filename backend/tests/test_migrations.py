@@ -0,0 +1,61 @@
+# backend/tests/test_migrations.py
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+import migrations
+
+def _half_done(conn):
+    conn.execute(text("CREATE TABLE half_done (id INTEGER PRIMARY KEY)"))
+    raise RuntimeError("migration failed after its first statement")
+
+def test_failed_migration_rolls_back_its_ddl(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    migrations.upgrade(engine)
+    version = len(migrations.MIGRATIONS)
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + [(version + 1, "broken", _half_done)])
+
+    with pytest.raises(RuntimeError):
+        migrations.upgrade(engine)
+    with engine.connect() as conn:
+        assert migrations.current_version(conn) == version
+    assert "half_done" not in inspect(engine).get_table_names()
+
+    # Fixed and retried: applies cleanly instead of failing on "already exists"
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS[:-1] + [
+        (version + 1, "fixed", lambda conn: conn.execute(text("CREATE TABLE half_done (id INTEGER PRIMARY KEY)")))
+    ])
+    assert migrations.upgrade(engine) == 1
+
+def test_fresh_database_upgrades_once(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    assert migrations.upgrade(engine) == len(migrations.MIGRATIONS)
+    assert migrations.upgrade(engine) == 0
+    with engine.connect() as conn:
+        assert migrations.current_version(conn) == migrations.MIGRATIONS[-1][0]
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("experience_raw")}
+    assert "ix_experience_raw_person_id" in indexes
+    indexes = {index["name"] for index in inspect(engine).get_indexes("recommendation_results")}
+    assert "ix_recommendation_results_job_id_score" in indexes
+
+def test_hot_path_queries_use_their_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    migrations.upgrade(engine)
+    with engine.connect() as conn:
+        plan = " ".join(row[-1] for row in conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM experience_raw WHERE person_id = 'p-1'"
+        )))
+        assert "ix_experience_raw_person_id" in plan
+        plan = " ".join(row[-1] for row in conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM recommendation_results WHERE job_id = 'j-1' ORDER BY score DESC"
+        )))
+        assert "ix_recommendation_results_job_id_score" in plan
+        assert "TEMP B-TREE" not in plan
+
+def test_maintenance_runs_on_an_upgraded_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'maintain.db'}")
+    migrations.upgrade(engine)
+    migrations.run_maintenance(engine, vacuum=True)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA integrity_check")).scalar() == "ok"
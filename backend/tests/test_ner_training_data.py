@@ -0,0 +1,78 @@
+# backend/tests/test_ner_training_data.py
+
+import pytest
+from sqlalchemy import create_engine, text
+
+import migrations
+from ner_training_data import export_docbin, generate_ner_training_data
+from profile_text import ner_source_hash
+
+def _corpus(db):
+    with db.connect() as conn:
+        return conn.execute(text("SELECT source, text FROM ner_training_data ORDER BY id")).fetchall()
+
+def _abouts(db):
+    with db.connect() as conn:
+        return conn.execute(text(
+            "SELECT DISTINCT trim(about) FROM candidate_profiles_joined WHERE trim(about) != ''"
+        )).scalars().all()
+
+def test_second_run_adds_nothing(db, joined):
+    added = generate_ner_training_data()
+    assert added == len(_abouts(db)) > 0
+    assert generate_ner_training_data() == 0
+    assert len(_corpus(db)) == added
+
+def test_repeated_texts_are_stored_once_per_source(db, joined):
+    with db.begin() as conn:
+        conn.execute(text("UPDATE candidate_profiles_joined SET about = ' Shared text. ' WHERE about IS NOT NULL"))
+        conn.execute(text(
+            "INSERT INTO job_postings_raw (job_id, title, job_description) VALUES ('job-1', 'Engineer', 'Shared text.')"
+        ))
+
+    assert generate_ner_training_data(chunk_size=2) == 2
+    assert _corpus(db) == [("candidate", "Shared text."), ("job_posting", "Shared text.")]
+
+def test_new_texts_are_added_incrementally(db, joined):
+    generate_ner_training_data()
+    with db.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO job_postings_raw (job_id, title, job_description) VALUES ('job-1', 'Engineer', 'Build pipelines.')"
+        ))
+    assert generate_ner_training_data() == 1
+
+def test_migration_drops_repeated_texts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ner.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE ner_training_data (id INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT, record_id TEXT, "
+            "text TEXT, created_at TIMESTAMP)"
+        ))
+        conn.execute(text("INSERT INTO ner_training_data (source, record_id, text) VALUES (:s, :r, :t)"), [
+            {"s": "candidate", "r": "a", "t": "Python developer"},
+            {"s": "candidate", "r": "b", "t": "Python developer"},
+            {"s": "job_posting", "r": "j", "t": "Python developer"},
+        ])
+        migrations._ner_training_dedup(conn)
+        rows = conn.execute(text("SELECT record_id, source_hash FROM ner_training_data ORDER BY id")).fetchall()
+
+    assert rows == [
+        ("a", ner_source_hash("candidate", "Python developer")),
+        ("j", ner_source_hash("job_posting", "Python developer")),
+    ]
+
+def test_docbin_shards_hold_the_corpus(db, joined, tmp_path):
+    pytest.importorskip("spacy")
+    from spacy.tokens import DocBin
+    import spacy
+
+    added = generate_ner_training_data()
+    paths = export_docbin(tmp_path / "docbin", shard_size=10)
+    assert [path.name for path in paths][:2] == ["ner-00000.spacy", "ner-00001.spacy"]
+    assert len(paths) == -(-added // 10)
+
+    vocab = spacy.blank("en").vocab
+    docs = [doc for path in paths for doc in DocBin().from_disk(path).get_docs(vocab)]
+    assert [doc.text for doc in docs] == [row.text for row in _corpus(db)]
+    assert {ent.label_ for doc in docs for ent in doc.ents} <= {"ROLE", "TECH"}
+    assert any(doc.ents for doc in docs)
@@ -0,0 +1,36 @@
+# backend/tests/test_predictions.py
+
+from sqlalchemy import text
+
+from matching.evaluation import store_predictions
+from table_versions import get_table_versions
+
+def _scores(db):
+    with db.connect() as conn:
+        return dict(conn.execute(text("SELECT candidate_id, score FROM recommendation_results")).fetchall())
+
+def _version(db):
+    with db.connect() as conn:
+        return get_table_versions(conn, ["recommendation_results"])["recommendation_results"]
+
+def test_predictions_are_stored_across_chunks(db):
+    before = _version(db)
+    scored = [{"id": f"c{i}", "score": float(i)} for i in range(5)]
+    assert store_predictions("job-1", scored, chunk_size=2) == 5
+    assert _scores(db) == {f"c{i}": float(i) for i in range(5)}
+    assert _version(db) == before + 1  # One bump for the whole run
+
+def test_rerun_replaces_scores(db):
+    store_predictions("job-1", [{"id": "c1", "score": 10.0}, {"record_id": "c2", "score": 20.0}])
+    store_predictions("job-1", [{"id": "c1", "score": 15.0}])
+    assert _scores(db) == {"c1": 15.0, "c2": 20.0}
+
+def test_failing_chunk_rolls_back_the_whole_run(db):
+    scored = [{"id": "c1", "score": 1.0}, {"id": "c2", "score": 2.0}, {"id": "c3", "score": ["not", "a", "number"]}]
+    assert store_predictions("job-1", scored, chunk_size=2) == 0
+    assert _scores(db) == {}
+
+def test_empty_run_writes_nothing(db):
+    before = _version(db)
+    assert store_predictions("job-1", []) == 0
+    assert _version(db) == before
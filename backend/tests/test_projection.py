@@ -0,0 +1,44 @@
+# backend/tests/test_projection.py
+
+import pytest
+
+from projection import CANDIDATE_COLUMNS, CANDIDATE_LIST_FIELDS, JOB_POSTING_LIST_FIELDS, parse_fields
+
+def test_parse_fields_keeps_order_and_required_fields():
+    fields = parse_fields({"fields": "city, name,city"}, CANDIDATE_COLUMNS, CANDIDATE_LIST_FIELDS, ["record_id"])
+    assert fields == ["record_id", "city", "name"]
+    assert parse_fields({}, CANDIDATE_COLUMNS, CANDIDATE_LIST_FIELDS, ["record_id"]) == CANDIDATE_LIST_FIELDS
+    assert parse_fields({"fields": "all"}, CANDIDATE_COLUMNS, [], []) == list(CANDIDATE_COLUMNS)
+
+def test_parse_fields_rejects_unknown_and_internal_columns():
+    for field in ["nope", "match_text", "match_text_hash"]:
+        with pytest.raises(ValueError):
+            parse_fields({"fields": field}, CANDIDATE_COLUMNS, CANDIDATE_LIST_FIELDS, ["record_id"])
+
+@pytest.mark.parametrize("path", ["/api/candidates", "/api/candidates/filter"])
+def test_candidate_lists_default_to_the_compact_shape(client, joined, path):
+    candidates = client.get(path).get_json()
+    assert candidates
+    assert all(list(candidate) == CANDIDATE_LIST_FIELDS for candidate in candidates)
+
+    page = client.get(path, query_string={"limit": 5}).get_json()
+    assert all(list(candidate) == CANDIDATE_LIST_FIELDS for candidate in page["items"])
+
+def test_candidate_list_projects_requested_fields(client, joined):
+    candidates = client.get("/api/candidates?fields=name,about").get_json()
+    assert all(list(candidate) == ["record_id", "name", "about"] for candidate in candidates)
+
+    everything = client.get("/api/candidates?fields=all&limit=3").get_json()["items"]
+    assert all(list(candidate) == list(CANDIDATE_COLUMNS) for candidate in everything)
+
+    assert client.get("/api/candidates?fields=match_text").status_code == 400
+
+def test_job_posting_list_projects_requested_fields(client):
+    created = client.post("/job_postings", json={"title": "Data Engineer", "department": "Data"})
+    assert created.status_code == 201
+
+    jobs = client.get("/api/job_postings").get_json()
+    assert [list(job) for job in jobs] == [JOB_POSTING_LIST_FIELDS]
+    jobs = client.get("/api/job_postings?fields=title").get_json()
+    assert jobs == [{"id": jobs[0]["id"], "title": "Data Engineer"}]
+    assert client.get("/api/job_postings?fields=salary").status_code == 400
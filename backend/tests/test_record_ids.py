@@ -0,0 +1,116 @@
+# backend/tests/test_record_ids.py
+
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+
+import migrations
+from data_fetching import normalize_and_insert
+from join_profiles import create_joined_profiles
+from matching.evaluation import store_predictions
+from profile_text import stable_record_id
+
+def _record_ids(engine):
+    with engine.connect() as conn:
+        return dict(conn.execute(text("SELECT person_id, record_id FROM candidate_profiles_joined")).fetchall())
+
+@pytest.mark.parametrize("backend", ["pandas", "sql"])
+def test_record_id_survives_rebuild_and_reingest(db, feed, backend):
+    normalize_and_insert(feed)
+    create_joined_profiles(backend=backend)
+    first = _record_ids(db)
+    assert first == {record["linkedin_num_id"]: stable_record_id(record["linkedin_num_id"]) for record in feed}
+
+    create_joined_profiles(backend=backend)
+    assert _record_ids(db) == first
+
+    feed[0]["about"] = "Rewritten about text"
+    changed = normalize_and_insert(feed)
+    create_joined_profiles(changed, backend=backend)
+    assert _record_ids(db) == first
+    create_joined_profiles(backend=backend)
+    assert _record_ids(db) == first
+
+def _unresolved_predictions(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("""
+        SELECT COUNT(*) FROM recommendation_results r
+        LEFT JOIN candidate_profiles_joined c ON c.record_id = r.candidate_id
+        WHERE c.record_id IS NULL
+        """)).scalar()
+
+def test_predictions_resolve_after_rebuild_and_reingest(db, feed):
+    normalize_and_insert(feed)
+    create_joined_profiles()
+    with db.begin() as conn:
+        conn.execute(text("DELETE FROM recommendation_results"))
+    scored = [{"id": record_id, "score": 50.0} for record_id in _record_ids(db).values()]
+    assert store_predictions("job-1", scored) == len(feed)
+
+    feed[0]["about"] = "Rewritten about text"
+    create_joined_profiles(normalize_and_insert(feed))
+    create_joined_profiles()
+    assert _unresolved_predictions(db) == 0
+
+def _old_record_id(person_id, load_date):
+    # Pre-migration-10 ids hashed the whole row, load_date included
+    return hashlib.sha256(f"{person_id}|{load_date}".encode("utf-8")).hexdigest()
+
+def test_migration_10_moves_rows_and_references_to_stable_ids(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    monkeypatch.setattr(migrations, "MIGRATIONS", [m for m in migrations.MIGRATIONS if m[0] < 10])
+    migrations.upgrade(engine)
+
+    old_build, new_build = datetime(2024, 1, 1), datetime(2024, 2, 1)
+    rows = [
+        # person "1" was left behind by two builds; "2" once; the uuid one came from the API
+        {"record_id": _old_record_id("1", old_build), "person_id": "1", "about": "old", "load_date": old_build},
+        {"record_id": _old_record_id("1", new_build), "person_id": "1", "about": "new", "load_date": new_build},
+        {"record_id": _old_record_id("2", new_build), "person_id": "2", "about": "two", "load_date": new_build},
+        {"record_id": "7a0e4d2c-1b65-4f0e-9c53-2d3f8f0f6d11", "person_id": "3", "about": "api",
+         "load_date": new_build + timedelta(days=1)},
+    ]
+    with engine.begin() as conn:
+        # Older pandas builds wrote the table without a key or content_hash
+        conn.execute(text("DROP TABLE candidate_profiles_joined"))
+        conn.execute(text(
+            "CREATE TABLE candidate_profiles_joined (record_id TEXT, person_id TEXT, name TEXT, country_code TEXT, "
+            "city TEXT, url TEXT, position TEXT, about TEXT, total_experience_years INTEGER, experiences TEXT, "
+            "degrees TEXT, certifications TEXT, languages TEXT, courses TEXT, load_date DATETIME, "
+            "match_text TEXT, match_text_hash TEXT)"
+        ))
+        conn.execute(text(
+            "INSERT INTO candidate_profiles_joined (record_id, person_id, about, load_date) "
+            "VALUES (:record_id, :person_id, :about, :load_date)"
+        ), rows)
+        conn.execute(text("INSERT INTO person_raw (person_id) VALUES ('1'), ('2')"))
+        conn.execute(text(
+            "INSERT INTO recommendation_results (job_id, candidate_id, score) VALUES (:job_id, :candidate_id, :score)"
+        ), [
+            {"job_id": "job-1", "candidate_id": rows[0]["record_id"], "score": 10.0},
+            {"job_id": "job-1", "candidate_id": rows[1]["record_id"], "score": 20.0},
+            {"job_id": "job-2", "candidate_id": rows[0]["record_id"], "score": 30.0},
+            {"job_id": "job-1", "candidate_id": rows[3]["record_id"], "score": 40.0},
+        ])
+        conn.execute(text("INSERT INTO hires (job_id, candidate_id) VALUES ('job-1', :candidate_id)"),
+                     {"candidate_id": rows[2]["record_id"]})
+
+    monkeypatch.undo()
+    migrations.upgrade(engine)
+
+    with engine.connect() as conn:
+        joined = conn.execute(text(
+            "SELECT record_id, person_id, about, content_hash FROM candidate_profiles_joined ORDER BY person_id"
+        )).mappings().all()
+        results = set(conn.execute(text("SELECT job_id, candidate_id FROM recommendation_results")).fetchall())
+        hires = conn.execute(text("SELECT candidate_id FROM hires")).scalars().all()
+    assert [(row["record_id"], row["about"]) for row in joined] == [
+        (stable_record_id("1"), "new"), (stable_record_id("2"), "two"), (rows[3]["record_id"], "api"),
+    ]
+    assert all(row["content_hash"] for row in joined)
+    assert results == {
+        ("job-1", stable_record_id("1")), ("job-2", stable_record_id("1")), ("job-1", rows[3]["record_id"]),
+    }
+    assert hires == [stable_record_id("2")]
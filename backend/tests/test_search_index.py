@@ -0,0 +1,13 @@
+# backend/tests/test_search_index.py
+
+import pytest
+
+from search_index import build_match_query
+
+@pytest.mark.parametrize("search", ["", "++", '"--"', '"  "', "* -"])
+def test_build_match_query_without_words(search):
+    assert build_match_query(search) is None
+
+def test_build_match_query_keeps_words_and_phrases():
+    assert build_match_query('"data engineer" py') == '"data engineer" AND "py"*'
+    assert build_match_query("c++", "about") == 'about : ("c"*)'
@@ -0,0 +1,29 @@
+# backend/tests/test_task_store.py
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from task_store import create_task, fail_task, get_task
+
+def test_creating_a_task_purges_expired_ones(db):
+    create_task("abandoned", "job-1")
+    create_task("recent", "job-1")
+    with db.begin() as conn:
+        conn.execute(
+            text("UPDATE recommendation_tasks SET updated_at = :old WHERE task_id = 'abandoned'"),
+            {"old": datetime.now() - timedelta(days=2)}
+        )
+
+    create_task("new", "job-2")
+    assert get_task("abandoned") is None
+    assert get_task("recent") is not None
+
+def test_error_is_reported_once(client):
+    create_task("failing", "job-1")
+    fail_task("failing", "boom")
+
+    response = client.get("/api/recommendations/status/failing")
+    assert response.status_code == 500
+    assert response.get_json()["error"] == "boom"
+    assert client.get("/api/recommendations/status/failing").status_code == 404
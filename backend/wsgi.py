@@ -0,0 +1,13 @@
+# backend/wsgi.py
+#
+# Production entry point, run from backend/:
+#
+#     python init_db.py
+#     gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Importing this module loads the models (create_app preloads them). With
+# preload_app in gunicorn.conf.py that happens once in the master.
+
+from app import create_app
+
+app = create_app()
@@ -1,13 +1,32 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import "./candidates.css";
 
+const PAGE_SIZE = 50;
+const SEARCH_DEBOUNCE_MS = 250;
+// Only what the cards and the edit modal use
+const CARD_FIELDS = [
+  "record_id",
+  "name",
+  "position",
+  "city",
+  "url",
+  "total_experience_years",
+  "experiences",
+  "about",
+].join(",");
+
 function Candidates() {
   const [candidates, setCandidates] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [totalCandidates, setTotalCandidates] = useState(0);
   const [search, setSearch] = useState("");
+  const [debouncedSearch, setDebouncedSearch] = useState("");
   const [sortOption, setSortOption] = useState("experience");
   const [modalOpen, setModalOpen] = useState(false);
   const [selectedCandidate, setSelectedCandidate] = useState(null);
   const [recommendations, setRecommendations] = useState([]);
+  const [recommendedCandidates, setRecommendedCandidates] = useState([]);
+  const [recommendedFetched, setRecommendedFetched] = useState(0);
   const [flipped, setFlipped] = useState({});
   const [loading, setLoading] = useState(true);
   const [jobModalOpen, setJobModalOpen] = useState(false);
@@ -16,20 +35,56 @@ function Candidates() {
   const [recommendationError, setRecommendationError] = useState(null);
   const [evaluation, setEvaluation] = useState(null);
 
+  // Aborted whenever the list reloads, so a slower response for an older
+  // query, or its "Load more" still in flight, never lands in the new list
+  const listRequest = useRef(null);
+
+  // Query once typing pauses, not on every keystroke
   useEffect(() => {
-    fetchCandidates();
-  }, []);
+    const timer = setTimeout(() => setDebouncedSearch(search), SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [search]);
 
-  const fetchCandidates = async () => {
-    setLoading(true);
+  useEffect(() => {
+    fetchCandidates();
+    return () => listRequest.current?.abort();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [debouncedSearch, sortOption]);
+
+  // Keyset pages: pass the previous page's cursor to append the next one
+  const fetchCandidates = async (cursor = null) => {
+    if (!cursor) {
+      listRequest.current?.abort();
+      listRequest.current = new AbortController();
+      setLoading(true);
+    }
+    const { signal } = listRequest.current;
     try {
-      const res = await fetch("http://localhost:5000/api/candidates");
+      const params = new URLSearchParams({
+        limit: PAGE_SIZE,
+        sort_by: sortOption,
+        fields: CARD_FIELDS,
+      });
+      if (debouncedSearch.trim()) params.set("search", debouncedSearch.trim());
+      if (cursor) {
+        params.set("cursor", cursor);
+        params.set("include_total", "false");
+      }
+
+      const res = await fetch(`http://localhost:5000/api/candidates?${params}`, {
+        signal,
+      });
       const data = await res.json();
-      setCandidates(data);
+      if (signal.aborted) return;
+      setCandidates((prev) => (cursor ? [...prev, ...data.items] : data.items));
+      setNextCursor(data.next_cursor);
+      if (!cursor) setTotalCandidates(data.total);
     } catch (error) {
-      console.error("Failed to fetch candidates:", error);
+      if (error.name !== "AbortError") {
+        console.error("Failed to fetch candidates:", error);
+      }
     } finally {
-      setLoading(false);
+      if (!signal.aborted) setLoading(false);
     }
   };
 
@@ -58,7 +113,9 @@ function Candidates() {
 
   const fetchJobs = async () => {
     try {
-      const res = await fetch("http://localhost:5000/api/job_postings");
+      const res = await fetch(
+        "http://localhost:5000/api/job_postings?fields=id,title"
+      );
       const data = await res.json();
       setJobs(data);
     } catch (error) {
@@ -124,27 +181,42 @@ function Candidates() {
     }
   };
 
-  const filtered = candidates.filter(
-    (c) =>
-      c.name.toLowerCase().includes(search.toLowerCase()) ||
-      c.city.toLowerCase().includes(search.toLowerCase())
-  );
+  // Scores cover every candidate, not just the loaded page: rank them here and
+  // fetch the cards of the top-ranked ones by id, a page at a time
+  const rankByScore = (results) =>
+    [...results].sort((a, b) => (b.score || 0) - (a.score || 0));
 
-  const sorted = [...filtered].sort((a, b) => {
-    const aScore = getScoreDetails(a.record_id)?.score || 0;
-    const bScore = getScoreDetails(b.record_id)?.score || 0;
+  const fetchRecommendedCandidates = async (ranked, offset = 0) => {
+    const ids = ranked
+      .slice(offset, offset + PAGE_SIZE)
+      .map((r) => r.candidate_id || r.id);
+    if (ids.length === 0) return;
+    try {
+      const params = new URLSearchParams({
+        ids: ids.join(","),
+        fields: CARD_FIELDS,
+      });
+      const res = await fetch(`http://localhost:5000/api/candidates?${params}`);
+      if (!res.ok) throw new Error("Failed to fetch recommended candidates");
+      const data = await res.json();
+      setRecommendedCandidates((prev) => (offset ? [...prev, ...data] : data));
+      setRecommendedFetched(offset + ids.length);
+    } catch (error) {
+      console.error("Failed to fetch recommended candidates:", error);
+    }
+  };
 
-    if (recommendations.length > 0) return bScore - aScore;
+  const showingRecommendations = recommendations.length > 0;
+  const rankedRecommendations = rankByScore(recommendations);
 
-    if (sortOption === "experience") {
-      return b.total_experience_years - a.total_experience_years;
-    } else if (sortOption === "name") {
-      return a.name.localeCompare(b.name);
-    } else if (sortOption === "city") {
-      return a.city.localeCompare(b.city);
-    }
-    return 0;
-  });
+  // Search and sort run on the server; the ids filter does not keep score order
+  const sorted = showingRecommendations
+    ? [...recommendedCandidates].sort((a, b) => {
+        const aScore = getScoreDetails(a.record_id)?.score || 0;
+        const bScore = getScoreDetails(b.record_id)?.score || 0;
+        return bScore - aScore;
+      })
+    : candidates;
 
   const openJobModal = async () => {
     await fetchJobs();
@@ -175,8 +247,11 @@ function Candidates() {
         );
       }
 
-      setRecommendations(candidates);
+      setRecommendations(Array.isArray(candidates) ? candidates : []);
       setEvaluation(evaluation);
+      if (Array.isArray(candidates)) {
+        await fetchRecommendedCandidates(rankByScore(candidates));
+      }
     } catch (error) {
       setRecommendationError(error.message);
     } finally {
@@ -338,7 +413,7 @@ function Candidates() {
       <div className="toolbar">
         <input
           type="text"
-          placeholder="Search by name or city."
+          placeholder="Search by name, city, position or skills."
           value={search}
           onChange={(e) => setSearch(e.target.value)}
         />
@@ -356,9 +431,42 @@ function Candidates() {
       {loading ? (
         <p>Loading candidates...</p>
       ) : (
-        <div className="candidate-cards">
-          {sorted.map((c) => renderCandidateCard(c))}
-        </div>
+        <>
+          <div className="candidate-cards">
+            {sorted.map((c) => renderCandidateCard(c))}
+          </div>
+          {showingRecommendations ? (
+            <>
+              <p>
+                Showing {recommendedCandidates.length} of{" "}
+                {recommendations.length} recommended candidates
+              </p>
+              {recommendedFetched < recommendations.length && (
+                <button
+                  onClick={() =>
+                    fetchRecommendedCandidates(
+                      rankedRecommendations,
+                      recommendedFetched
+                    )
+                  }
+                >
+                  Load more
+                </button>
+              )}
+            </>
+          ) : (
+            <>
+              <p>
+                Showing {candidates.length} of {totalCandidates} candidates
+              </p>
+              {nextCursor && (
+                <button onClick={() => fetchCandidates(nextCursor)}>
+                  Load more
+                </button>
+              )}
+            </>
+          )}
+        </>
       )}
 
       {modalOpen && (